@@ -0,0 +1 @@
+# Benchmarks directory - headless timing/memory sweeps over the tools package
@@ -0,0 +1,139 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+import click
+
+from benchmarks.harness import compare_results, load_results, save_results
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# Modules whose cold import time is tracked; each is imported in a fresh interpreter.
+IMPORT_TARGETS = (
+    "numpy",
+    "open3d",
+    "open3d.visualization.gui",
+    "tools.camera_math",
+    "tools.camera_set_io",
+    "tools.ply_io",
+    "tools.pointcloud_octree",
+    "tools.point_generators",
+    "tools.offscreen_render",
+    "ui.scene_view",
+    "ui.main_window",
+)
+# Commands whose wall time (interpreter start to exit) is tracked.
+COMMAND_TARGETS = {
+    "python -c pass": [sys.executable, "-c", "pass"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+}
+
+_CHILD = """
+import importlib, json, sys, time
+t0 = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - t0
+try:
+    import resource
+    # ru_maxrss is in bytes on macOS, KiB elsewhere.
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+except ImportError:  # Windows
+    peak_mb = 0.0
+print(json.dumps({
+    "seconds": seconds,
+    "peak_mb": peak_mb,
+    # Lazy proxies (tools.lazy_import) stay out of sys.modules until first use.
+    "open3d_loaded": "open3d" in sys.modules,
+}))
+"""
+
+
+def _import_once(module: str) -> dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, module],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _command_once(argv: list[str]) -> dict[str, Any]:
+    t0 = time.perf_counter()
+    subprocess.run(argv, cwd=REPO_ROOT, capture_output=True, check=True)
+    return {"seconds": time.perf_counter() - t0, "peak_mb": 0.0}
+
+
+def _best_of(run: Callable[[], dict[str, Any]], repeat: int) -> dict[str, Any]:
+    samples = [run() for _ in range(max(1, repeat))]
+    best = min(samples, key=lambda s: s["seconds"])
+    return {
+        **best,
+        "mean_seconds": sum(s["seconds"] for s in samples) / len(samples),
+        "peak_mb": max(s["peak_mb"] for s in samples),
+    }
+
+
+def run_import_benchmarks(repeat: int = 5, log: Callable[[str], None] = print) -> list[dict[str, Any]]:
+    """Cold import time / peak RSS per module and wall time per command, best of `repeat` fresh interpreters."""
+    cases = [(f"import {m}", lambda m=m: _import_once(m)) for m in IMPORT_TARGETS]
+    cases += [(name, lambda a=argv: _command_once(a)) for name, argv in COMMAND_TARGETS.items()]
+    results = []
+    for name, run in cases:
+        try:
+            stats = _best_of(run, repeat)
+        except subprocess.CalledProcessError as e:
+            detail = (e.stderr or "").strip().splitlines()
+            log(f"{name:<40} failed: {detail[-1] if detail else e}")
+            continue
+        results.append({"name": name, **stats})
+        loaded = stats.get("open3d_loaded")
+        note = "" if loaded is None else ("  open3d" if loaded else "  no open3d")
+        log(f"{name:<40} {stats['seconds'] * 1000:9.1f} ms {stats['peak_mb']:8.1f} MB{note}")
+    return results
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--repeat", default=5, show_default=True, help="Fresh interpreters per case (best time is kept).")
+@click.option(
+    "--out",
+    "out_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Results JSON (default: export/benchmarks/imports_<timestamp>.json).",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Compare against this results JSON; exit 1 on regressions.",
+)
+@click.option("--tolerance", default=0.25, show_default=True, help="Allowed slowdown / memory growth vs baseline.")
+def main(repeat: int, out_path: str | None, baseline_path: str | None, tolerance: float):
+    results = run_import_benchmarks(repeat=repeat, log=click.echo)
+    if out_path is None:
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        out_path = os.path.join("export", "benchmarks", f"imports_{ts}.json")
+    save_results(out_path, results)
+    click.echo(f"[bench] wrote {os.path.abspath(out_path)}")
+
+    if baseline_path is None:
+        return
+    rows = compare_results(results, load_results(baseline_path), tolerance=tolerance)
+    regressions = [r for r in rows if r["regression"]]
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        click.echo(f"{row['name']:<40} time x{row['time_ratio']:5.2f} mem x{row['memory_ratio']:5.2f} {flag}")
+    click.echo(f"[bench] {len(regressions)} regression(s) in {len(rows)} compared case(s)")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
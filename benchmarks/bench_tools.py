@@ -0,0 +1,308 @@
+import functools
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Callable
+
+import click
+import numpy as np
+
+from benchmarks.harness import compare_results, load_results, measure, save_results
+from tools.camera_math import (
+    create_camera_intrinsics_from_sizes,
+    frustum_planes,
+    points_in_frustum,
+    to_o3d_extrinsic_from_c2w,
+    to_o3d_extrinsics_from_c2w,
+)
+from tools.camera_set_io import export_camera_set, load_camera_set_arrays, make_camera_record
+from tools.camera_viz import create_camera_geometry, create_o3d_intrinsic
+from tools.ply_io import load_ply_geometry, load_ply_geometry_legacy
+
+
+QUICK_CAMERA_COUNTS = (10, 100, 1_000, 10_000)
+FULL_CAMERA_COUNTS = QUICK_CAMERA_COUNTS + (100_000,)
+IMAGE_SIZES = ((320, 240), (1280, 720), (1920, 1080))
+IMAGE_ENCODINGS = ("png_fast", "jpeg", "npy")
+QUICK_POINT_COUNTS = (100_000, 1_000_000)
+FULL_POINT_COUNTS = QUICK_POINT_COUNTS + (10_000_000,)
+# Per-camera Python loops get slow past this; the full sweep lifts the cap.
+QUICK_LOOP_CAP = 10_000
+
+
+def random_c2w(count: int, seed: int = 0) -> np.ndarray:
+    """(count,4,4) random rigid camera-to-world matrices."""
+    rng = np.random.default_rng(seed)
+    q = rng.standard_normal((count, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    w, x, y, z = q.T
+    c2w = np.tile(np.eye(4), (count, 1, 1))
+    c2w[:, 0, :3] = np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=1)
+    c2w[:, 1, :3] = np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=1)
+    c2w[:, 2, :3] = np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=1)
+    c2w[:, :3, 3] = rng.uniform(-10, 10, (count, 3))
+    return c2w
+
+
+def make_records(count: int, image_size: tuple[int, int] | None = None) -> dict[int, dict[str, Any]]:
+    width, height = image_size or (640, 480)
+    intrinsic = create_o3d_intrinsic(size=(width, height))
+    c2w = random_c2w(count)
+    extrinsics = to_o3d_extrinsics_from_c2w(c2w)
+    image = None
+    if image_size is not None:
+        image = np.random.default_rng(1).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return {
+        i + 1: make_camera_record(
+            source="bench",
+            width=width,
+            height=height,
+            model_matrix=c2w[i],
+            extrinsic=extrinsics[i],
+            intrinsic=intrinsic,
+            image_array=image,
+        )
+        for i in range(count)
+    }
+
+
+def write_binary_ply(path: str, points: np.ndarray, colors: np.ndarray | None = None):
+    """Minimal binary little-endian PLY writer (float32 xyz, optional uchar rgb)."""
+    fields = [("x", "<f4"), ("y", "<f4"), ("z", "<f4")]
+    props = ["property float x", "property float y", "property float z"]
+    if colors is not None:
+        fields += [("red", "u1"), ("green", "u1"), ("blue", "u1")]
+        props += ["property uchar red", "property uchar green", "property uchar blue"]
+    records = np.empty(len(points), dtype=fields)
+    records["x"], records["y"], records["z"] = points.T
+    if colors is not None:
+        records["red"], records["green"], records["blue"] = colors.T
+    header = "\n".join(["ply", "format binary_little_endian 1.0", f"element vertex {len(points)}", *props, "end_header"])
+    with open(path, "wb") as f:
+        f.write((header + "\n").encode("ascii"))
+        records.tofile(f)
+
+
+# Case inputs are built on first use from a case's (untimed) setup and memoized,
+# so cases skipped by --filter never build their cameras, images or PLY files.
+@functools.lru_cache(maxsize=None)
+def cached_c2w(count: int) -> np.ndarray:
+    return random_c2w(count)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_records(count: int, image_size: tuple[int, int] | None = None) -> dict[int, dict[str, Any]]:
+    return make_records(count, image_size=image_size)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_image(width: int, height: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_intrinsic(width: int, height: int):
+    return create_o3d_intrinsic(size=(width, height))
+
+
+@functools.lru_cache(maxsize=None)
+def cached_ply(work_dir: str, count: int) -> str:
+    path = os.path.join(work_dir, f"cloud_{count}.ply")
+    rng = np.random.default_rng(count)
+    write_binary_ply(path, rng.random((count, 3), dtype=np.float32), rng.integers(0, 256, (count, 3), dtype=np.uint8))
+    return path
+
+
+def clear_case_caches():
+    for cache in (cached_c2w, cached_records, cached_image, cached_intrinsic, cached_ply):
+        cache.cache_clear()
+
+
+def camera_math_cases(counts: tuple[int, ...], full: bool) -> list[dict[str, Any]]:
+    cases = []
+    planes = frustum_planes(np.diag([0.1, 0.1, -0.1, 1.0]))
+    for n in counts:
+        setup = lambda n=n: cached_c2w(n)
+        cases += [
+            {"name": f"camera_math.to_o3d_extrinsics_from_c2w[n={n}]", "setup": setup,
+             "fn": lambda n=n: to_o3d_extrinsics_from_c2w(cached_c2w(n))},
+            {"name": f"camera_math.create_camera_intrinsics_from_sizes[n={n}]",
+             "fn": lambda n=n: create_camera_intrinsics_from_sizes(np.full(n, 1280), np.full(n, 720))},
+            {"name": f"camera_math.points_in_frustum[n={n}]", "setup": setup,
+             "fn": lambda n=n: points_in_frustum(planes, cached_c2w(n)[:, :3, 3])},
+        ]
+        if n <= QUICK_LOOP_CAP or full:
+            cases.append({"name": f"camera_math.to_o3d_extrinsic_from_c2w_loop[n={n}]", "setup": setup,
+                          "fn": lambda n=n: [to_o3d_extrinsic_from_c2w(m) for m in cached_c2w(n)]})
+    return cases
+
+
+def camera_viz_cases(counts: tuple[int, ...], full: bool) -> list[dict[str, Any]]:
+    cases = []
+    for n in counts:
+        if n > QUICK_LOOP_CAP and not full:
+            continue
+        cases.append({
+            "name": f"camera_viz.create_camera_geometry[n={n}]",
+            "setup": lambda n=n: (cached_c2w(n), cached_intrinsic(1280, 720)),
+            "fn": lambda n=n: [
+                create_camera_geometry(cached_intrinsic(1280, 720), x) for x in to_o3d_extrinsics_from_c2w(cached_c2w(n))
+            ],
+            "repeat": 1 if n >= 10_000 else 3,
+        })
+    extrinsic = to_o3d_extrinsics_from_c2w(random_c2w(1))[0]
+    for w, h in IMAGE_SIZES:
+        cases.append({
+            "name": f"camera_viz.create_camera_geometry_image[{w}x{h},n=32]",
+            "setup": lambda w=w, h=h: cached_image(w, h),
+            "fn": lambda w=w, h=h: [
+                create_camera_geometry(create_o3d_intrinsic(size=(w, h)), extrinsic, img=cached_image(w, h)) for _ in range(32)
+            ],
+        })
+    return cases
+
+
+def camera_set_io_cases(counts: tuple[int, ...], work_dir: str) -> list[dict[str, Any]]:
+    cases = []
+    for n in counts:
+        for version in (1, 2):
+            root = os.path.join(work_dir, f"sets_v{version}_{n}")
+
+            def export(r=root, v=version, n=n):
+                records = cached_records(n)
+                return export_camera_set(indices=sorted(records.keys()), camera_records=records, export_root=r, format_version=v)
+
+            def fresh_export_dir(r=root, n=n):
+                cached_records(n)
+                shutil.rmtree(r, ignore_errors=True)
+
+            def ensure_exported(r=root, export=export):
+                # Lets load cases run on their own (e.g. with --filter).
+                if not os.path.isdir(r):
+                    export()
+
+            cases.append({
+                "name": f"camera_set_io.export[v{version},n={n}]",
+                "setup": fresh_export_dir,
+                "fn": export,
+                "repeat": 1 if n >= 10_000 else 3,
+            })
+            cases.append({
+                "name": f"camera_set_io.load_arrays[v{version},n={n}]",
+                "setup": ensure_exported,
+                "fn": lambda r=root: load_camera_set_arrays(_find_cameras_json(r)),
+            })
+    for w, h in IMAGE_SIZES:
+        for encoding in IMAGE_ENCODINGS:
+            root = os.path.join(work_dir, f"images_{w}x{h}_{encoding}")
+
+            def fresh_image_dir(r=root, size=(w, h)):
+                cached_records(16, size)
+                shutil.rmtree(r, ignore_errors=True)
+
+            def export_images(r=root, e=encoding, size=(w, h)):
+                records = cached_records(16, size)
+                return export_camera_set(
+                    indices=sorted(records.keys()), camera_records=records, export_root=r, format_version=2, image_encoding=e
+                )
+
+            cases.append({
+                "name": f"camera_set_io.export_images[{w}x{h},{encoding},n=16]",
+                "setup": fresh_image_dir,
+                "fn": export_images,
+            })
+    return cases
+
+
+def _find_cameras_json(root: str) -> str:
+    # export_camera_set writes into a timestamped subdirectory.
+    sub = sorted(os.listdir(root))[-1]
+    return os.path.join(root, sub, "cameras.json")
+
+
+def ply_io_cases(point_counts: tuple[int, ...], work_dir: str) -> list[dict[str, Any]]:
+    cases = []
+    for n in point_counts:
+        setup = lambda n=n: cached_ply(work_dir, n)
+        repeat = 1 if n >= 10_000_000 else 3
+        cases += [
+            {"name": f"ply_io.load_ply_geometry[n={n}]", "setup": setup,
+             "fn": lambda n=n: load_ply_geometry(cached_ply(work_dir, n)), "repeat": repeat},
+            {"name": f"ply_io.load_ply_geometry_tensor[n={n}]", "setup": setup,
+             "fn": lambda n=n: load_ply_geometry(cached_ply(work_dir, n), tensor=True), "repeat": repeat},
+            {"name": f"ply_io.load_ply_geometry_legacy[n={n}]", "setup": setup,
+             "fn": lambda n=n: load_ply_geometry_legacy(cached_ply(work_dir, n)), "repeat": repeat},
+        ]
+    return cases
+
+
+def run_benchmarks(
+    full: bool = False,
+    name_filter: str | None = None,
+    log: Callable[[str], None] = print,
+) -> list[dict[str, Any]]:
+    counts = FULL_CAMERA_COUNTS if full else QUICK_CAMERA_COUNTS
+    point_counts = FULL_POINT_COUNTS if full else QUICK_POINT_COUNTS
+    results = []
+    with tempfile.TemporaryDirectory(prefix="o3d_bench_") as work_dir:
+        cases = (
+            camera_math_cases(counts, full)
+            + camera_viz_cases(counts, full)
+            + camera_set_io_cases(counts, work_dir)
+            + ply_io_cases(point_counts, work_dir)
+        )
+        try:
+            for case in cases:
+                if name_filter and name_filter not in case["name"]:
+                    continue
+                stats = measure(case["fn"], repeat=case.get("repeat", 3), setup=case.get("setup"))
+                results.append({"name": case["name"], **stats})
+                rss = "n/a" if stats["rss_peak_mb"] is None else f"{stats['rss_peak_mb']:.1f} MB"
+                log(f"{case['name']:<60} {stats['seconds'] * 1000:10.2f} ms {stats['peak_mb']:10.1f} MB {rss:>10} RSS")
+        finally:
+            clear_case_caches()
+    return results
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option("--full", is_flag=True, default=False, help="Sweep up to 100k cameras / 10M points (slow).")
+@click.option("--filter", "name_filter", default=None, help="Only run cases whose name contains this text.")
+@click.option(
+    "--out",
+    "out_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Results JSON (default: export/benchmarks/bench_<timestamp>.json).",
+)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Compare against this results JSON; exit 1 on regressions.",
+)
+@click.option("--tolerance", default=0.25, show_default=True, help="Allowed slowdown / memory growth vs baseline.")
+def main(full: bool, name_filter: str | None, out_path: str | None, baseline_path: str | None, tolerance: float):
+    results = run_benchmarks(full=full, name_filter=name_filter, log=click.echo)
+    if out_path is None:
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        out_path = os.path.join("export", "benchmarks", f"bench_{ts}.json")
+    save_results(out_path, results)
+    click.echo(f"[bench] wrote {os.path.abspath(out_path)}")
+
+    if baseline_path is None:
+        return
+    rows = compare_results(results, load_results(baseline_path), tolerance=tolerance)
+    regressions = [r for r in rows if r["regression"]]
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        click.echo(f"{row['name']:<60} time x{row['time_ratio']:5.2f} mem x{row['memory_ratio']:5.2f} {flag}")
+    click.echo(f"[bench] {len(regressions)} regression(s) in {len(rows)} compared case(s)")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable
+
+import numpy as np
+
+from tools.ply_io import current_rss_bytes
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3, setup: Callable[[], Any] | None = None) -> dict[str, float | None]:
+    """
+    Run `fn` `repeat` times (after an optional `setup` that isn't timed).
+    Returns best/mean wall time and, from the first run, the peak Python/NumPy
+    allocation (tracemalloc) and the peak growth of the process RSS (sampled
+    every 5 ms, so it includes Open3D's C++ buffers) in MB. rss_peak_mb is
+    None where the current RSS can't be read.
+    """
+    times = []
+    peak_mb = 0.0
+    rss_peak_mb = None
+    for k in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        if k == 0:
+            baseline = current_rss_bytes()
+            peak = {"rss": baseline}
+            stop = threading.Event()
+
+            def sample():
+                while not stop.is_set():
+                    peak["rss"] = max(peak["rss"], current_rss_bytes())
+                    stop.wait(0.005)
+
+            sampler = threading.Thread(target=sample, daemon=True)
+            tracemalloc.start()
+            if baseline is not None:
+                sampler.start()
+        t0 = time.perf_counter()
+        try:
+            fn()
+        finally:
+            times.append(time.perf_counter() - t0)
+            if k == 0:
+                stop.set()
+                if sampler.is_alive():
+                    sampler.join()
+                _, traced_peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        if k == 0:
+            peak_mb = traced_peak / (1024 * 1024)
+            if baseline is not None:
+                rss_peak_mb = (max(peak["rss"], current_rss_bytes()) - baseline) / (1024 * 1024)
+    # tracemalloc slows allocation-heavy code; report timings from the untraced runs when there are any.
+    timed = times[1:] if len(times) > 1 else times
+    return {
+        "seconds": float(min(timed)),
+        "mean_seconds": float(np.mean(timed)),
+        "peak_mb": float(peak_mb),
+        "rss_peak_mb": rss_peak_mb,
+    }
+
+
+def environment() -> dict[str, Any]:
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+    try:
+        import open3d as o3d
+
+        info["open3d"] = o3d.__version__
+    except Exception:
+        info["open3d"] = None
+    return info
+
+
+def save_results(path: str, results: list[dict[str, Any]]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path: str) -> list[dict[str, Any]]:
+    with open(path, "r") as f:
+        return json.load(f)["results"]
+
+
+def _memory_ratio(value: float | None, base: float | None) -> float:
+    # Missing on either side (older baseline, no RSS on this platform): not comparable.
+    if value is None or base is None or base <= 0.5:
+        return 1.0
+    return value / base
+
+
+def compare_results(
+    results: list[dict[str, Any]],
+    baseline: list[dict[str, Any]],
+    tolerance: float = 0.25,
+    min_seconds: float = 1e-3,
+) -> list[dict[str, Any]]:
+    """
+    Match cases by name and flag those slower (or using more peak memory)
+    than baseline * (1 + tolerance). Cases faster than `min_seconds` in the
+    baseline are only checked for memory: their timings are mostly noise.
+    Returns one row per case present in both runs.
+    """
+    by_name = {r["name"]: r for r in baseline}
+    rows = []
+    for result in results:
+        base = by_name.get(result["name"])
+        if base is None:
+            continue
+        time_ratio = result["seconds"] / base["seconds"] if base["seconds"] > 0 else 1.0
+        # Judge memory by whichever measure grew more; baselines from before
+        # RSS sampling only have the traced peak.
+        mem_ratio = max(
+            _memory_ratio(result.get(key), base.get(key)) for key in ("peak_mb", "rss_peak_mb")
+        )
+        slower = base["seconds"] >= min_seconds and time_ratio > 1.0 + tolerance
+        bigger = mem_ratio > 1.0 + tolerance
+        rows.append({
+            "name": result["name"],
+            "time_ratio": time_ratio,
+            "memory_ratio": mem_ratio,
+            "regression": slower or bigger,
+        })
+    return rows
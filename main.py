@@ -1,15 +1,95 @@
+import os
+import sys
+from datetime import datetime
+
 import click
-import open3d.visualization.gui as gui
-from ui import MainWindow
 
-@click.command(context_settings={"help_option_names": ["-h", "--help"]})
-@click.option(
-    "--webrtc",
-    is_flag=True,
-    default=False,
-    help="Enable Open3D WebRTC visualizer (stream GUI to browser).",
-)
-def main(webrtc: bool):
+from tools.screenshot import IMAGE_ENCODINGS
+
+
+def echo_progress(tag: str):
+    """progress(done, total) callback that redraws one `[tag] done/total` line."""
+
+    def progress(done: int, total: int):
+        click.echo(f"\r[{tag}] {done}/{total}", nl=done == total)
+
+    return progress
+
+
+def default_camera_set_dir() -> str:
+    ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return os.path.join("export", "camera_sets", ts)
+
+
+def render_camera_set_headless(camera_set: str, geometry_paths: tuple[str, ...], out_dir: str | None, image_encoding: str):
+    """Render a camera set offscreen (no window) against the given PLY geometries."""
+    from tools.camera_set_io import load_camera_set_arrays
+    from tools.offscreen_render import render_camera_set
+    from tools.ply_io import load_ply_geometry
+    from ui.scene_view import SceneWidget
+
+    # Registry-only SceneWidget (no init()): same materials as the GUI would use.
+    scene_view = SceneWidget(window=None)
+    for i, path in enumerate(geometry_paths):
+        try:
+            geom = load_ply_geometry(path, tensor=True)
+        except Exception as e:
+            raise click.ClickException(f"Could not load geometry: {path}: {e}")
+        if geom is None:
+            raise click.ClickException(f"No points or faces in {path}")
+        scene_view.add_geometry(geom, name=f"ply_{i}")
+
+    arrays, _ = load_camera_set_arrays(camera_set)
+    if out_dir is None:
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        out_dir = os.path.join("export", "renders", ts)
+
+    written, skipped = render_camera_set(
+        scene_view.iter_geometry_entries(),
+        arrays,
+        os.path.abspath(out_dir),
+        image_encoding=image_encoding,
+        progress=echo_progress("render"),
+    )
+    click.echo(f"[render] wrote {len(written)} images to {os.path.abspath(out_dir)}")
+    if skipped:
+        click.echo(f"[render] skipped {len(skipped)} cameras (bad size or pose): {skipped}")
+
+
+def report_ply_load(path: str):
+    """Load `path` with the single-pass (legacy and tensor output) and old loaders; print time/peak memory."""
+    import json
+
+    from tools.ply_io import measure_ply_load
+
+    for method in ("auto", "tensor", "legacy"):
+        try:
+            _, stats = measure_ply_load(path, method=method)
+        except Exception as e:
+            raise click.ClickException(f"Could not load {path}: {e}")
+        click.echo(json.dumps(stats))
+
+
+def build_octree_headless(ply_path: str, out_dir: str | None):
+    """Split a large PLY into out-of-core octree chunks (open them from the GUI)."""
+    from tools.pointcloud_octree import build_point_octree
+
+    if out_dir is None:
+        stem = os.path.splitext(os.path.basename(ply_path))[0]
+        out_dir = os.path.join("export", "octrees", stem)
+
+    def progress(stage: str, fraction: float):
+        click.echo(f"\r[octree] {stage} {fraction * 100:5.1f}%", nl=fraction >= 1.0)
+
+    manifest_path = build_point_octree(ply_path, os.path.abspath(out_dir), progress=progress)
+    click.echo(f"[octree] wrote {manifest_path}")
+
+
+def run_gui(webrtc: bool):
+    # GUI-only imports: the batch commands never load the Open3D GUI.
+    import open3d.visualization.gui as gui
+    from ui import MainWindow
+
     if webrtc:
         try:
             import open3d as o3d
@@ -27,5 +107,211 @@ def main(webrtc: bool):
     app.run()
 
 
+webrtc_option = click.option(
+    "--webrtc",
+    is_flag=True,
+    default=False,
+    help="Enable Open3D WebRTC visualizer (stream GUI to browser).",
+)
+format_option = click.option(
+    "--format",
+    "format_version",
+    type=click.Choice(["1", "2"]),
+    default="2",
+    show_default=True,
+    help="Output camera set format: 1 = JSON, 2 = manifest + .npy arrays.",
+)
+workers_option = click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Image worker threads (default: Python's ThreadPoolExecutor default).",
+)
+
+
+@click.group(invoke_without_command=True, context_settings={"help_option_names": ["-h", "--help"]})
+@webrtc_option
+@click.pass_context
+def cli(ctx: click.Context, webrtc: bool):
+    """Open3D app template. Without a command, opens the GUI."""
+    if ctx.invoked_subcommand is None:
+        run_gui(webrtc)
+
+
+@cli.command("gui")
+@webrtc_option
+def gui_command(webrtc: bool):
+    """Open the GUI window."""
+    run_gui(webrtc)
+
+
+@cli.command("render")
+@click.argument("camera_set", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--geometry",
+    "geometry_paths",
+    type=click.Path(exists=True, dir_okay=False),
+    multiple=True,
+    required=True,
+    help="PLY file(s) to render (repeatable).",
+)
+@click.option(
+    "--out",
+    "out_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Output directory (default: export/renders/<timestamp>).",
+)
+@click.option(
+    "--image-encoding",
+    type=click.Choice(tuple(IMAGE_ENCODINGS)),
+    default="png_fast",
+    show_default=True,
+)
+def render_command(camera_set: str, geometry_paths: tuple[str, ...], out_dir: str | None, image_encoding: str):
+    """Render every camera of CAMERA_SET (cameras.json) offscreen, no window."""
+    render_camera_set_headless(camera_set, geometry_paths, out_dir, image_encoding)
+
+
+@cli.command("ply-stats")
+@click.argument("ply_path", type=click.Path(exists=True, dir_okay=False))
+def ply_stats_command(ply_path: str):
+    """Report load time and peak memory of PLY_PATH (single-pass vs legacy loader)."""
+    report_ply_load(ply_path)
+
+
+@cli.command("build-octree")
+@click.argument("ply_path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--out",
+    "out_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Output directory (default: export/octrees/<ply name>).",
+)
+def build_octree_command(ply_path: str, out_dir: str | None):
+    """Split a binary PLY point cloud into out-of-core octree chunks."""
+    build_octree_headless(ply_path, out_dir)
+
+
+@cli.command("convert")
+@click.argument("camera_set", type=click.Path(exists=True, dir_okay=False))
+@format_option
+@click.option(
+    "--out",
+    "out_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Output directory (default: export/camera_sets/<timestamp>).",
+)
+@click.option(
+    "--image-encoding",
+    type=click.Choice(tuple(IMAGE_ENCODINGS)),
+    default=None,
+    help="Re-encode images (default: copy them unchanged).",
+)
+@workers_option
+def convert_command(camera_set: str, format_version: str, out_dir: str | None, image_encoding: str | None, workers: int | None):
+    """Rewrite CAMERA_SET (cameras.json, v1 or v2) in another format, keeping camera ids."""
+    from tools.camera_set_io import convert_camera_set
+
+    json_path = convert_camera_set(
+        camera_set,
+        out_dir or default_camera_set_dir(),
+        format_version=int(format_version),
+        image_encoding=image_encoding,
+        max_workers=workers,
+        progress=echo_progress("convert"),
+    )
+    click.echo(f"[convert] wrote {json_path}")
+
+
+@cli.command("merge")
+@click.argument("camera_sets", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@format_option
+@click.option(
+    "--out",
+    "out_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Output directory (default: export/camera_sets/<timestamp>).",
+)
+@click.option(
+    "--image-encoding",
+    type=click.Choice(tuple(IMAGE_ENCODINGS)),
+    default=None,
+    help="Re-encode images (default: copy them unchanged).",
+)
+@workers_option
+def merge_command(camera_sets: tuple[str, ...], format_version: str, out_dir: str | None, image_encoding: str | None, workers: int | None):
+    """Merge CAMERA_SETS (cameras.json files) into one set; cameras are renumbered 1..N."""
+    from tools.camera_set_io import merge_camera_sets
+
+    json_path = merge_camera_sets(
+        list(camera_sets),
+        out_dir or default_camera_set_dir(),
+        format_version=int(format_version),
+        image_encoding=image_encoding,
+        max_workers=workers,
+        progress=echo_progress("merge"),
+    )
+    click.echo(f"[merge] wrote {json_path}")
+
+
+@cli.command("validate")
+@click.argument("camera_sets", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--tolerance", default=1e-4, show_default=True, help="Tolerance of the rotation / bottom-row / K[2,2] checks.")
+@click.option("--skip-images", is_flag=True, default=False, help="Don't check that image files exist.")
+def validate_command(camera_sets: tuple[str, ...], tolerance: float, skip_images: bool):
+    """Check poses, intrinsics, ids and image files of CAMERA_SETS; exit 1 if any set has issues."""
+    from tools.camera_set_io import load_camera_set_arrays, validate_camera_set_arrays
+
+    failed = 0
+    for path in camera_sets:
+        try:
+            arrays, base_dir = load_camera_set_arrays(path)
+        except Exception as e:
+            click.echo(f"{path}: unreadable ({e})")
+            failed += 1
+            continue
+        issues = validate_camera_set_arrays(arrays, None if skip_images else base_dir, tolerance=tolerance)
+        if not issues:
+            click.echo(f"{path}: ok ({len(arrays['ids'])} cameras)")
+            continue
+        failed += 1
+        for name, ids in issues.items():
+            shown = ", ".join(str(i) for i in ids[:10].tolist()) + (", ..." if len(ids) > 10 else "")
+            click.echo(f"{path}: {name}: {len(ids)} camera(s) [{shown}]")
+    if failed:
+        click.echo(f"[validate] {failed}/{len(camera_sets)} set(s) with issues")
+        sys.exit(1)
+
+
+@cli.command("reencode-images")
+@click.argument("src_dir", type=click.Path(exists=True, file_okay=False))
+@click.argument("dst_dir", type=click.Path(file_okay=False))
+@click.option(
+    "--image-encoding",
+    type=click.Choice(tuple(IMAGE_ENCODINGS)),
+    default="png_fast",
+    show_default=True,
+)
+@click.option("--max-side", type=int, default=None, help="Downscale so the longer side is at most this many pixels.")
+@workers_option
+def reencode_images_command(src_dir: str, dst_dir: str, image_encoding: str, max_side: int | None, workers: int | None):
+    """Re-encode / downscale every image under SRC_DIR into DST_DIR (same folder layout)."""
+    from tools.image_batch import transcode_image_folder
+
+    written = transcode_image_folder(
+        src_dir,
+        dst_dir,
+        encoding=image_encoding,
+        max_side=max_side,
+        max_workers=workers,
+        progress=echo_progress("images"),
+    )
+    click.echo(f"[images] wrote {len(written)} images to {os.path.abspath(dst_dir)}")
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,62 @@
+import numpy as np
+
+from tools.camera_index import CameraIndex
+from tools.camera_math import frustum_planes, invert_rigid_transforms, points_in_frustum
+from tools.recording import look_at_c2w
+
+
+def build_index(count: int = 500, seed: int = 0) -> tuple[CameraIndex, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    ids = rng.permutation(10 * count)[:count]
+    c2w = look_at_c2w(rng.uniform(-20, 20, (count, 3)), np.zeros(3))
+    index = CameraIndex(cameras_per_cell=4)
+    index.upsert_many(ids, c2w)
+    return index, ids, c2w
+
+
+def brute(ids: np.ndarray, mask: np.ndarray) -> set[int]:
+    return set(ids[mask].tolist())
+
+
+def test_queries_match_brute_force():
+    index, ids, c2w = build_index()
+    centers = c2w[:, :3, 3]
+    directions = -c2w[:, :3, 2]
+    point = np.array([3.0, -2.0, 5.0])
+
+    d = np.linalg.norm(centers - point, axis=1)
+    assert set(index.within_radius(point, 6.0).tolist()) == brute(ids, d <= 6.0)
+    np.testing.assert_array_equal(index.nearest(point, k=7), ids[np.argsort(d, kind="stable")[:7]])
+
+    to_target = point - centers
+    cos = np.einsum("nk,nk->n", to_target, directions) / np.linalg.norm(to_target, axis=1)
+    looking = cos >= np.cos(np.deg2rad(20.0))
+    assert set(index.looking_at(point, 20.0).tolist()) == brute(ids, looking)
+    near = np.linalg.norm(to_target, axis=1) <= 10.0
+    assert set(index.looking_at(point, 20.0, radius=10.0).tolist()) == brute(ids, looking & near)
+
+    view = invert_rigid_transforms(look_at_c2w(np.array([[0.0, 0.0, 30.0]]), np.zeros(3))[0])
+    f = 1.0 / np.tan(np.radians(25.0))
+    proj = np.array([[f, 0, 0, 0], [0, f, 0, 0], [0, 0, -101 / 99, -200 / 99], [0, 0, -1, 0]])
+    planes = frustum_planes(proj @ view)
+    assert set(index.in_frustum(planes).tolist()) == brute(ids, points_in_frustum(planes, centers))
+
+
+def test_remove_and_move_keep_queries_exact():
+    index, ids, c2w = build_index(200, seed=1)
+    removed = ids[::3]
+    for cam_id in removed:
+        index.remove(cam_id)
+    moved = ids[1]
+    c2w[1] = look_at_c2w(np.array([[50.0, 50.0, 50.0]]), np.zeros(3))[0]
+    index.upsert(moved, c2w[1])
+
+    alive = ~np.isin(ids, removed)
+    assert len(index) == int(alive.sum())
+    assert set(index.ids().tolist()) == set(ids[alive].tolist())
+    assert int(index.nearest([50.0, 50.0, 50.0], k=1)[0]) == int(moved)
+    d = np.linalg.norm(c2w[:, :3, 3], axis=1)
+    assert set(index.within_radius(np.zeros(3), 15.0).tolist()) == brute(ids, alive & (d <= 15.0))
+
+    index.clear()
+    assert len(index) == 0 and len(index.nearest(np.zeros(3), k=3)) == 0
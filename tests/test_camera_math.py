@@ -0,0 +1,62 @@
+import numpy as np
+
+from tools.camera_math import (
+    aabbs_in_frustum,
+    create_camera_intrinsic_from_size,
+    create_camera_intrinsics_from_sizes,
+    frustum_planes,
+    invert_rigid_transforms,
+    points_in_frustum,
+    to_o3d_extrinsic_from_c2w,
+    to_o3d_extrinsics_from_c2w,
+)
+from tools.recording import look_at_c2w
+
+
+def random_c2w(count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return look_at_c2w(rng.uniform(-5, 5, (count, 3)), rng.uniform(-1, 1, 3))
+
+
+def perspective(fovy_deg: float, aspect: float, near: float, far: float) -> np.ndarray:
+    f = 1.0 / np.tan(np.radians(fovy_deg) / 2)
+    return np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+        [0, 0, -1, 0],
+    ])
+
+
+def test_batched_extrinsics_match_single_versions():
+    c2w = random_c2w(50)
+    np.testing.assert_allclose(invert_rigid_transforms(c2w), np.linalg.inv(c2w), atol=1e-12)
+    np.testing.assert_allclose(invert_rigid_transforms(c2w[0]), np.linalg.inv(c2w[0]), atol=1e-12)
+    expected = np.stack([to_o3d_extrinsic_from_c2w(m) for m in c2w])
+    np.testing.assert_allclose(to_o3d_extrinsics_from_c2w(c2w), expected, atol=1e-12)
+    assert to_o3d_extrinsics_from_c2w(c2w, dtype=np.float32).dtype == np.float32
+
+
+def test_batched_intrinsics_match_single_version():
+    widths = np.array([640, 1024, 1920])
+    heights = np.array([480, 768, 1080])
+    K = create_camera_intrinsics_from_sizes(widths, heights, vfov=45.0)
+    for k, (w, h) in enumerate(zip(widths, heights)):
+        np.testing.assert_allclose(K[k], create_camera_intrinsic_from_size(w, h, vfov=45.0))
+
+
+def test_frustum_culling_matches_clip_space():
+    view = invert_rigid_transforms(random_c2w(1, seed=3)[0])
+    view_proj = perspective(60.0, 4 / 3, 0.1, 20.0) @ view
+    planes = frustum_planes(view_proj)
+    np.testing.assert_allclose(np.linalg.norm(planes[:, :3], axis=1), 1.0)
+
+    points = np.random.default_rng(1).uniform(-10, 10, (5000, 3))
+    clip = np.c_[points, np.ones(len(points))] @ view_proj.T
+    inside = np.all(np.abs(clip[:, :3]) <= clip[:, 3:], axis=1)
+    assert inside.any() and not inside.all()
+    np.testing.assert_array_equal(points_in_frustum(planes, points), inside)
+
+    # Boxes around inside points are never culled (the test is conservative).
+    kept = aabbs_in_frustum(planes, points[inside] - 0.05, points[inside] + 0.05)
+    assert kept.all()
@@ -0,0 +1,49 @@
+import numpy as np
+
+from tools.camera_path import interpolate_camera_path, quaternions_to_rotations, rotations_to_quaternions
+from tools.recording import look_at_c2w
+
+
+def random_rotations(count: int, seed: int = 0) -> np.ndarray:
+    q = np.random.default_rng(seed).standard_normal((count, 4))
+    return quaternions_to_rotations(q)
+
+
+def key_poses() -> np.ndarray:
+    eyes = np.array([[4.0, 1.0, 0.0], [0.0, 2.0, 4.0], [-4.0, 1.0, 0.0], [0.0, 0.5, -4.0]])
+    return look_at_c2w(eyes, np.zeros(3))
+
+
+def test_quaternion_round_trip():
+    R = random_rotations(200)
+    # Include the Shepperd edge cases: identity and half turns about each axis.
+    R = np.concatenate([R, np.eye(3)[None], np.diag([1.0, -1.0, -1.0])[None],
+                        np.diag([-1.0, 1.0, -1.0])[None], np.diag([-1.0, -1.0, 1.0])[None]])
+    q = rotations_to_quaternions(R)
+    np.testing.assert_allclose(np.linalg.norm(q, axis=1), 1.0, atol=1e-12)
+    assert np.all(q[:, 0] >= 0)
+    np.testing.assert_allclose(quaternions_to_rotations(q), R, atol=1e-9)
+
+
+def test_open_path_passes_through_keys():
+    keys = key_poses()
+    steps = 7
+    path = interpolate_camera_path(keys, steps)
+    assert path.shape == ((len(keys) - 1) * steps + 1, 4, 4)
+    np.testing.assert_allclose(path[::steps], keys, atol=1e-9)
+
+
+def test_looped_path_passes_through_keys():
+    keys = key_poses()
+    steps = 5
+    path = interpolate_camera_path(keys, steps, loop=True)
+    assert path.shape == (len(keys) * steps, 4, 4)
+    np.testing.assert_allclose(path[::steps], keys, atol=1e-9)
+
+
+def test_path_rotations_are_orthonormal():
+    path = interpolate_camera_path(key_poses(), 11, loop=True)
+    R = path[:, :3, :3]
+    np.testing.assert_allclose(np.einsum("nji,njk->nik", R, R), np.broadcast_to(np.eye(3), R.shape), atol=1e-9)
+    np.testing.assert_allclose(np.linalg.det(R), 1.0, atol=1e-9)
+    np.testing.assert_allclose(path[:, 3], np.broadcast_to([0.0, 0.0, 0.0, 1.0], (len(path), 4)))
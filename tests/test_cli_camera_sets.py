@@ -0,0 +1,158 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from main import cli
+from tools.camera_set_io import load_camera_set_arrays, write_camera_set
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def make_arrays(count: int, start_id: int = 1) -> dict:
+    angles = np.linspace(0.0, np.pi, count)
+    c2w = np.tile(np.eye(4), (count, 1, 1))
+    c2w[:, 0, 0] = np.cos(angles)
+    c2w[:, 0, 2] = np.sin(angles)
+    c2w[:, 2, 0] = -np.sin(angles)
+    c2w[:, 2, 2] = np.cos(angles)
+    c2w[:, :3, 3] = np.stack([angles, -angles, 2 * angles], axis=1)
+    K = np.tile(np.array([[100.0, 0.0, 32.0], [0.0, 110.0, 24.0], [0.0, 0.0, 1.0]]), (count, 1, 1))
+    return {
+        "ids": np.arange(start_id, start_id + count, dtype=np.int64),
+        "width": np.full(count, 64, dtype=np.int32),
+        "height": np.full(count, 48, dtype=np.int32),
+        "c2w": c2w,
+        "K": K,
+        "source": ["scene"] * count,
+        "image_file": [f"images/cam_{i:03d}.npy" for i in range(start_id, start_id + count)],
+    }
+
+
+def make_camera_set(root, count: int, format_version: int, start_id: int = 1) -> str:
+    arrays = make_arrays(count, start_id)
+    os.makedirs(os.path.join(root, "images"), exist_ok=True)
+    for idx, rel in zip(arrays["ids"], arrays["image_file"]):
+        np.save(os.path.join(root, rel), np.full((48, 64, 3), idx, dtype=np.uint8))
+    return write_camera_set(str(root), arrays, format_version=format_version)
+
+
+def assert_same_cameras(a: dict, b: dict):
+    for name in ("ids", "width", "height", "c2w", "K"):
+        np.testing.assert_allclose(np.asarray(a[name]), np.asarray(b[name]))
+
+
+@pytest.mark.parametrize("src_version,dst_version", [(1, 2), (2, 1), (1, 1), (2, 2)])
+def test_convert_round_trip(tmp_path, src_version, dst_version):
+    src = make_camera_set(tmp_path / "src", 5, src_version)
+    out = tmp_path / "out"
+    result = CliRunner().invoke(cli, ["convert", src, "--format", str(dst_version), "--out", str(out), "--workers", "4"])
+    assert result.exit_code == 0, result.output
+
+    original, _ = load_camera_set_arrays(src)
+    converted, base_dir = load_camera_set_arrays(str(out / "cameras.json"))
+    assert_same_cameras(original, converted)
+    np.testing.assert_allclose(converted["extrinsic"], original["extrinsic"])
+    for idx, rel in zip(converted["ids"], converted["image_file"]):
+        assert np.load(os.path.join(base_dir, rel))[0, 0, 0] == idx
+
+
+def test_merge_renumbers_and_copies_images(tmp_path):
+    a = make_camera_set(tmp_path / "a", 3, 1)
+    b = make_camera_set(tmp_path / "b", 4, 2, start_id=10)
+    out = tmp_path / "merged"
+    result = CliRunner().invoke(cli, ["merge", a, b, "--out", str(out)])
+    assert result.exit_code == 0, result.output
+
+    merged, base_dir = load_camera_set_arrays(str(out / "cameras.json"))
+    np.testing.assert_array_equal(merged["ids"], np.arange(1, 8))
+    parts = [load_camera_set_arrays(a)[0], load_camera_set_arrays(b)[0]]
+    np.testing.assert_allclose(merged["c2w"], np.concatenate([p["c2w"] for p in parts]))
+    # Image pixels still carry the source camera ids, in input order.
+    pixels = [int(np.load(os.path.join(base_dir, rel))[0, 0, 0]) for rel in merged["image_file"]]
+    assert pixels == [1, 2, 3, 10, 11, 12, 13]
+
+
+def test_validate_reports_issues(tmp_path):
+    good = make_camera_set(tmp_path / "good", 4, 2)
+    arrays = make_arrays(4)
+    arrays["c2w"][1, :3, :3] *= 2.0
+    arrays["K"][2, 0, 0] = -1.0
+    arrays["ids"][3] = arrays["ids"][0]
+    bad = write_camera_set(str(tmp_path / "bad"), arrays, format_version=1)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["validate", good])
+    assert result.exit_code == 0, result.output
+    assert "ok (4 cameras)" in result.output
+
+    result = runner.invoke(cli, ["validate", good, bad])
+    assert result.exit_code == 1
+    for issue in ("non_orthonormal", "bad_intrinsics", "duplicate_id", "missing_image"):
+        assert issue in result.output
+    result = runner.invoke(cli, ["validate", "--skip-images", bad])
+    assert "missing_image" not in result.output
+
+
+def test_v1_camera_without_pose_is_reported(tmp_path):
+    path = make_camera_set(tmp_path / "set", 3, 1)
+    with open(path) as f:
+        payload = json.load(f)
+    for key in ("model_matrix", "c2w"):
+        payload["cameras"][1].pop(key, None)
+    with open(path, "w") as f:
+        json.dump(payload, f)
+
+    arrays, _ = load_camera_set_arrays(path)
+    assert arrays["c2w"].shape == (3, 4, 4)
+    assert np.isnan(arrays["c2w"][1]).all()
+    assert np.isfinite(arrays["c2w"][[0, 2]]).all()
+
+    result = CliRunner().invoke(cli, ["validate", "--skip-images", path])
+    assert result.exit_code == 1
+    assert "non_finite" in result.output
+
+
+def make_image_folder(root, count: int = 6):
+    for i in range(count):
+        sub = os.path.join(root, "a" if i % 2 else "b")
+        os.makedirs(sub, exist_ok=True)
+        np.save(os.path.join(sub, f"img_{i}.npy"), np.full((40, 80, 3), i, dtype=np.uint8))
+
+
+def test_reencode_images_npy(tmp_path):
+    make_image_folder(tmp_path / "src")
+    result = CliRunner().invoke(
+        cli,
+        ["reencode-images", str(tmp_path / "src"), str(tmp_path / "dst"), "--image-encoding", "npy", "--max-side", "20", "--workers", "8"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "wrote 6 images" in result.output
+    image = np.load(tmp_path / "dst" / "a" / "img_3.npy")
+    assert image.shape == (10, 20, 3) and image[0, 0, 0] == 3
+
+
+@pytest.mark.parametrize("command", ["reencode-images", "convert"])
+def test_image_encoding_commands_on_cold_interpreter(tmp_path, command):
+    # Worker threads are the first to touch the lazily imported Open3D here.
+    pytest.importorskip("open3d", exc_type=ImportError)
+    if command == "reencode-images":
+        make_image_folder(tmp_path / "src")
+        args = ["reencode-images", str(tmp_path / "src"), str(tmp_path / "dst"), "--image-encoding", "png_fast"]
+    else:
+        src = make_camera_set(tmp_path / "src", 6, 2)
+        args = ["convert", src, "--out", str(tmp_path / "dst"), "--image-encoding", "jpeg"]
+    subprocess.run(
+        [sys.executable, "main.py", *args, "--workers", "8"],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    )
+    ext = ".png" if command == "reencode-images" else ".jpg"
+    written = [f for _, _, files in os.walk(tmp_path / "dst") for f in files if f.endswith(ext)]
+    assert len(written) == 6
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+
+from tools.image_cache import CameraImageCache, make_thumbnail
+
+
+def image(value: int, side: int = 64) -> np.ndarray:
+    return np.full((side, side, 3), value, dtype=np.uint8)
+
+
+def test_make_thumbnail_limits_longer_side():
+    thumb = make_thumbnail(np.zeros((300, 600, 3), dtype=np.uint8), 150)
+    assert thumb.shape == (75, 150, 3)
+
+
+def test_evicted_captures_spill_and_clear_removes_spill_dir():
+    one = image(0).nbytes
+    cache = CameraImageCache(budget_bytes=2 * one, thumbnail_max_side=8)
+    for key in range(5):
+        cache.put(key, image_array=image(key))
+    assert cache.resident_bytes() <= 2 * one + 5 * make_thumbnail(image(0), 8).nbytes
+
+    # Evicted captures come back from the spill dir.
+    np.testing.assert_array_equal(cache.get_full(0), image(0))
+    spill_dir = cache._spill_dir
+    assert spill_dir is not None and os.listdir(spill_dir)
+
+    cache.clear()
+    assert not os.path.exists(spill_dir)
+    assert cache.get_full(0) is None
+
+
+def test_read_full_does_not_touch_lru(tmp_path):
+    one = image(0).nbytes
+    cache = CameraImageCache(budget_bytes=2 * one, thumbnail_max_side=8)
+    for key in range(4):
+        path = str(tmp_path / f"img_{key}.npy")
+        np.save(path, image(key))
+        cache.put(key, image_path=path)
+    cache.get_full(0)
+    cache.get_full(1)
+    resident = list(cache._full)
+
+    for key in range(4):
+        np.testing.assert_array_equal(cache.read_full(key), image(key))
+    assert list(cache._full) == resident
@@ -0,0 +1,43 @@
+import threading
+
+import numpy as np
+import pytest
+
+from tools.screenshot import ImageWriterQueue
+
+
+def test_writes_queued_frames_and_stops_workers(tmp_path):
+    before = threading.active_count()
+    writer = ImageWriterQueue(max_pending=4, workers=3)
+    frames = [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(10)]
+    for i, frame in enumerate(frames):
+        assert writer.submit(str(tmp_path / f"frame_{i}"), frame, "npy", block=True)
+
+    assert writer.close(timeout=5.0)
+    assert threading.active_count() == before
+    assert writer.stats() == {"pending": 0, "written": 10, "dropped": 0, "failed": 0}
+    for i, frame in enumerate(frames):
+        np.testing.assert_array_equal(np.load(tmp_path / f"frame_{i}.npy"), frame)
+    with pytest.raises(RuntimeError):
+        writer.submit(str(tmp_path / "late"), frames[0], "npy")
+
+
+def test_full_queue_drops_without_blocking(tmp_path, monkeypatch):
+    import tools.screenshot
+
+    gate = threading.Event()
+    save = tools.screenshot.save_image_encoded
+
+    def stalled_save(*args):
+        gate.wait(5.0)
+        return save(*args)
+
+    monkeypatch.setattr(tools.screenshot, "save_image_encoded", stalled_save)
+    writer = ImageWriterQueue(max_pending=2, workers=1)
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    # One frame in the stalled worker, two waiting; the rest are dropped.
+    results = [writer.submit(str(tmp_path / f"f{i}"), frame, "npy") for i in range(10)]
+    gate.set()
+    assert writer.close(timeout=5.0)
+    assert results.count(False) == writer.stats()["dropped"] >= 7
+    assert writer.stats()["written"] == results.count(True)
@@ -0,0 +1,37 @@
+import sys
+import threading
+
+from tools.lazy_import import lazy_module
+
+
+def test_concurrent_first_access_loads_once(tmp_path, monkeypatch):
+    # A module that takes a while to import: every thread touches the proxy
+    # before the first import has finished.
+    (tmp_path / "slow_lazy_target.py").write_text("import time\ntime.sleep(0.3)\nloads = []\nloads.append(1)\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "slow_lazy_target", raising=False)
+
+    proxy = lazy_module("slow_lazy_target")
+    assert "slow_lazy_target" not in sys.modules
+
+    results, errors = [], []
+
+    def touch():
+        try:
+            results.append(proxy.VALUE)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=touch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert results == [42] * 8
+    assert sys.modules["slow_lazy_target"].loads == [1]
+
+
+def test_loaded_module_is_returned_directly():
+    assert lazy_module("json") is sys.modules["json"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+
+o3d = pytest.importorskip("open3d", exc_type=ImportError)
+
+from ui.scene_view import LineSetBatch  # noqa: E402
+
+
+def make_lineset(count: int, offset: float) -> "o3d.geometry.LineSet":
+    lineset = o3d.geometry.LineSet()
+    lineset.points = o3d.utility.Vector3dVector(np.arange(count * 3, dtype=np.float64).reshape(count, 3) + offset)
+    lineset.lines = o3d.utility.Vector2iVector([[k, (k + 1) % count] for k in range(count)])
+    lineset.colors = o3d.utility.Vector3dVector(np.full((count, 3), offset / 100.0))
+    return lineset
+
+
+def test_removals_are_compacted_once_and_keep_other_members_intact():
+    batch = LineSetBatch()
+    members = {f"m{k}": make_lineset(3 + k, 10.0 * k) for k in range(6)}
+    for name, lineset in members.items():
+        batch.upsert(name, lineset)
+
+    batch.remove("m1")
+    batch.remove("m4")
+    batch.set_visible("m2", False)
+    members["m3"] = make_lineset(7, 99.0)
+    batch.upsert("m3", members["m3"])
+    merged = batch.to_geometry()
+
+    kept = ["m0", "m2", "m3", "m5"]
+    for name in kept:
+        member = batch.get_member(name)
+        expected = members[name]
+        np.testing.assert_allclose(np.asarray(member.points), np.asarray(expected.points))
+        np.testing.assert_array_equal(np.asarray(member.lines), np.asarray(expected.lines))
+        np.testing.assert_allclose(np.asarray(member.colors), np.asarray(expected.colors))
+    assert len(merged.points) == sum(len(members[n].points) for n in kept)
+    assert len(merged.lines) == sum(len(members[n].lines) for n in kept if n != "m2")
+
+    for name in batch.names():
+        batch.remove(name)
+    assert len(batch.to_geometry().points) == 0
+    assert not batch.has_shown_members()
+
+
+def test_version_changes_only_on_edits():
+    batch = LineSetBatch()
+    batch.upsert("a", make_lineset(4, 0.0))
+    version = batch.version
+    batch.to_geometry()
+    batch.remove("missing")
+    assert batch.version == version
+    batch.set_color("a", [1.0, 0.0, 0.0])
+    assert batch.version != version
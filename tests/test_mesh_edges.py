@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from tools.mesh_edges import mesh_edges
+
+
+def cube() -> tuple[np.ndarray, np.ndarray]:
+    vertices = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64)
+    quads = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    triangles = np.array([t for a, b, c, d in quads for t in ((a, b, c), (a, c, d))])
+    return vertices, triangles
+
+
+def as_set(edges: np.ndarray) -> set[tuple[int, int]]:
+    return {tuple(e) for e in edges.tolist()}
+
+
+def test_cube_edge_counts():
+    vertices, triangles = cube()
+    edges = mesh_edges(triangles)
+    # 12 cube edges + one diagonal per face.
+    assert edges.shape == (18, 2) and edges.dtype == np.int32
+    assert len(as_set(edges)) == 18
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert len(mesh_edges(triangles, "boundary")) == 0
+    # Face diagonals are flat (0 degrees), cube edges are 90 degrees.
+    feature = mesh_edges(triangles, "feature", vertices=vertices)
+    assert len(feature) == 12
+    assert np.all(np.count_nonzero(vertices[feature[:, 0]] != vertices[feature[:, 1]], axis=1) == 1)
+
+
+def test_open_cube_boundary_and_feature_edges():
+    vertices, triangles = cube()
+    # Drop the x = 0 face: its 4 rim edges become boundary edges.
+    open_triangles = triangles[2:]
+    boundary = mesh_edges(open_triangles, "boundary")
+    assert len(boundary) == 4
+    assert np.all(vertices[boundary.ravel(), 0] == 0)
+    feature = as_set(mesh_edges(open_triangles, "feature", vertices=vertices))
+    assert as_set(boundary) <= feature
+    assert len(feature) == 12
+
+
+def test_invalid_arguments():
+    _, triangles = cube()
+    with pytest.raises(ValueError):
+        mesh_edges(triangles, "silhouette")
+    with pytest.raises(ValueError):
+        mesh_edges(triangles, "feature")
+    assert mesh_edges(np.zeros((0, 3), dtype=np.int32)).shape == (0, 2)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from tools.ply_io import read_ply_arrays, read_ply_header
+
+
+VERTEX_DTYPE = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("red", "u1"), ("green", "u1"), ("blue", "u1")])
+
+
+def make_vertices(count: int = 5) -> np.ndarray:
+    vertices = np.zeros(count, dtype=VERTEX_DTYPE)
+    for k, axis in enumerate("xyz"):
+        vertices[axis] = np.arange(count) + 10 * k
+    for k, channel in enumerate(("red", "green", "blue")):
+        vertices[channel] = 50 * k + np.arange(count)
+    return vertices
+
+
+def write_ply(path, vertices: np.ndarray, faces: list[list[int]] | None = None, newline: str = "\n") -> str:
+    lines = ["ply", "format binary_little_endian 1.0", "comment test", f"element vertex {len(vertices)}"]
+    lines += ["property float x", "property float y", "property float z"]
+    lines += ["property uchar red", "property uchar green", "property uchar blue"]
+    if faces is not None:
+        lines += [f"element face {len(faces)}", "property list uchar int vertex_indices"]
+    lines.append("end_header")
+    data = vertices.tobytes()
+    for face in faces or []:
+        data += np.uint8(len(face)).tobytes() + np.asarray(face, dtype="<i4").tobytes()
+    path.write_bytes((newline.join(lines) + newline).encode("ascii") + data)
+    return str(path)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_triangle_mesh_is_mapped(tmp_path, newline):
+    vertices = make_vertices()
+    faces = [[0, 1, 2], [2, 3, 4]]
+    path = write_ply(tmp_path / "mesh.ply", vertices, faces, newline)
+
+    header = read_ply_header(path)
+    assert header["format"] == "binary_little_endian"
+    assert [(e["name"], e["count"]) for e in header["elements"]] == [("vertex", 5), ("face", 2)]
+
+    arrays = read_ply_arrays(path, header)
+    np.testing.assert_array_equal(arrays["points"], np.stack([vertices[a] for a in "xyz"], axis=1))
+    np.testing.assert_array_equal(arrays["colors"], np.stack([vertices[c] for c in ("red", "green", "blue")], axis=1))
+    assert arrays["normals"] is None
+    np.testing.assert_array_equal(arrays["triangles"], faces)
+
+
+def test_point_cloud_has_no_triangles(tmp_path):
+    arrays = read_ply_arrays(write_ply(tmp_path / "points.ply", make_vertices()))
+    assert arrays["triangles"] is None
+    assert arrays["points"].shape == (5, 3)
+
+
+def test_quads_and_ascii_fall_back(tmp_path):
+    assert read_ply_arrays(write_ply(tmp_path / "quads.ply", make_vertices(), [[0, 1, 2, 3], [1, 2, 3, 4]])) is None
+    mixed = write_ply(tmp_path / "mixed.ply", make_vertices(), [[0, 1, 2], [1, 2, 3, 4]])
+    assert read_ply_arrays(mixed) is None
+
+    ascii_path = tmp_path / "ascii.ply"
+    ascii_path.write_text("ply\nformat ascii 1.0\nelement vertex 1\nproperty float x\nend_header\n0\n")
+    assert read_ply_arrays(str(ascii_path)) is None
+
+
+def test_not_a_ply(tmp_path):
+    path = tmp_path / "bad.ply"
+    path.write_bytes(b"obj\n")
+    with pytest.raises(ValueError):
+        read_ply_header(str(path))
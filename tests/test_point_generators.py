@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from tools.point_generators import POINT_DISTRIBUTIONS, generate_point_arrays, iter_point_chunks
+
+
+@pytest.mark.parametrize("distribution", POINT_DISTRIBUTIONS)
+def test_same_seed_same_points(distribution):
+    first = generate_point_arrays(10_000, size=2.0, distribution=distribution, seed=7, chunk_size=3_000)
+    second = generate_point_arrays(10_000, size=2.0, distribution=distribution, seed=7, chunk_size=3_000)
+    for a, b in zip(first, second):
+        assert a.dtype == np.float32 and a.shape == (10_000, 3)
+        np.testing.assert_array_equal(a, b)
+    positions, colors = first
+    assert np.all(np.abs(positions) <= 1.0 + 1e-6)
+    assert np.all((colors >= 0) & (colors <= 1))
+    if distribution != "grid":
+        other, _ = generate_point_arrays(10_000, size=2.0, distribution=distribution, seed=8, chunk_size=3_000)
+        assert not np.array_equal(positions, other)
+
+
+def test_chunks_cover_count_and_report_progress():
+    starts = [(start, len(chunk)) for start, chunk in iter_point_chunks(2_500, chunk_size=1_000)]
+    assert starts == [(0, 1_000), (1_000, 1_000), (2_000, 500)]
+    seen = []
+    generate_point_arrays(2_500, chunk_size=1_000, progress=lambda done, total: seen.append((done, total)))
+    assert seen == [(1_000, 2_500), (2_000, 2_500), (2_500, 2_500)]
+
+
+def test_grid_is_independent_of_chunk_size():
+    a, _ = generate_point_arrays(1_000, distribution="grid", chunk_size=1_000)
+    b, _ = generate_point_arrays(1_000, distribution="grid", chunk_size=137)
+    np.testing.assert_array_equal(a, b)
+    assert len(np.unique(a, axis=0)) == 1_000
+
+
+def test_unknown_distribution():
+    with pytest.raises(ValueError):
+        generate_point_arrays(10, distribution="spiral")
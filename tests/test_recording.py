@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+from tools.recording import FrameRecorder, look_at_c2w, turntable_poses
+
+
+def test_turntable_poses_orbit_and_look_at_center():
+    center = np.array([1.0, 2.0, 3.0])
+    eye = center + [0.0, 1.0, 5.0]
+    poses = turntable_poses(center, eye, 12)
+    R = poses[:, :3, :3]
+    np.testing.assert_allclose(np.einsum("nji,njk->nik", R, R), np.broadcast_to(np.eye(3), R.shape), atol=1e-12)
+    np.testing.assert_allclose(np.linalg.det(R), 1.0)
+    np.testing.assert_allclose(poses[0, :3, 3], eye)
+    # Constant height and radius about the up axis; the camera looks down -Z at the center.
+    offsets = poses[:, :3, 3] - center
+    np.testing.assert_allclose(offsets[:, 1], 1.0)
+    np.testing.assert_allclose(np.linalg.norm(offsets[:, [0, 2]], axis=1), 5.0)
+    forward = -poses[:, :3, 2]
+    np.testing.assert_allclose(np.sum(forward * -offsets, axis=1), np.linalg.norm(offsets, axis=1))
+
+
+def test_look_at_straight_down_is_finite():
+    pose = look_at_c2w([[0.0, 5.0, 0.0]], [0.0, 0.0, 0.0])[0]
+    assert np.isfinite(pose).all()
+    np.testing.assert_allclose(pose[:3, :3].T @ pose[:3, :3], np.eye(3), atol=1e-12)
+
+
+def test_frame_recorder_writes_frames_report_and_stops_threads(tmp_path):
+    before = threading.active_count()
+    poses = turntable_poses([0.0, 0.0, 0.0], [0.0, 0.0, 3.0], 6)
+    recorder = FrameRecorder(str(tmp_path), poses, encoding="npy", target_fps=30.0, workers=2)
+    while not recorder.done():
+        recorder.add_frame(np.full((4, 4, 3), recorder.next_frame, dtype=np.uint8))
+    report = recorder.finish(timeout=5.0)
+
+    assert threading.active_count() == before
+    assert report["captured"] == report["written"] == 6
+    assert report["dropped"] == [] and report["failed"] == 0
+    assert np.load(tmp_path / "frame_000005.npy")[0, 0, 0] == 5
+    saved = json.loads((tmp_path / "recording.json").read_text())
+    np.testing.assert_allclose(saved["poses"], poses)
+
+
+def test_frame_recorder_drops_frames_without_blocking(tmp_path, monkeypatch):
+    import tools.screenshot
+
+    gate = threading.Event()
+    save = tools.screenshot.save_image_encoded
+
+    def stalled_save(*args):
+        gate.wait(5.0)
+        return save(*args)
+
+    monkeypatch.setattr(tools.screenshot, "save_image_encoded", stalled_save)
+    poses = turntable_poses([0.0, 0.0, 0.0], [0.0, 0.0, 3.0], 10)
+    recorder = FrameRecorder(str(tmp_path), poses, encoding="npy", workers=1, max_pending=2)
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    started = time.perf_counter()
+    results = [recorder.add_frame(frame) for _ in range(10)]
+    assert time.perf_counter() - started < 1.0
+    gate.set()
+    report = recorder.finish(timeout=5.0)
+
+    assert report["dropped"] == [i for i, queued in enumerate(results) if not queued]
+    assert len(report["dropped"]) >= 7
+    assert report["written"] == results.count(True)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+
+pytest.importorskip("open3d", exc_type=ImportError)
+
+from ui.scene_view import SceneWidget, TexturedQuadAtlas  # noqa: E402
+
+
+CORNERS = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float64)
+
+
+def make_image(value: int) -> np.ndarray:
+    return np.full((40, 60, 3), value, dtype=np.uint8)
+
+
+def test_texture_is_replaced_only_when_a_tile_changes():
+    atlas = TexturedQuadAtlas(page_size=512, tile_size=(64, 40))
+    atlas.upsert("a", CORNERS, make_image(10))
+    atlas.upsert("b", CORNERS + 2, make_image(20))
+    texture = atlas.texture
+
+    atlas.set_visible("a", False)
+    atlas.set_culled("b", True)
+    assert atlas.texture is texture
+    assert not atlas.has_shown_members()
+
+    atlas.set_culled("b", False)
+    assert atlas.has_shown_members()
+    atlas.upsert("b", CORNERS, make_image(30))
+    assert atlas.texture is not texture
+
+
+def test_flush_keeps_material_until_tiles_change_and_drops_hidden_pages():
+    view = SceneWidget(window=None)
+    view.register_batch("page", TexturedQuadAtlas(page_size=512, tile_size=(64, 40)))
+    view.add_batch_member("page", "a", CORNERS, make_image(10))
+    view.add_batch_member("page", "b", CORNERS + 2, make_image(20))
+    material = view._materials["page"]
+
+    view.set_geometry_visible("a", False)
+    assert view._materials["page"] is material
+
+    view.add_batch_member("page", "b", CORNERS, make_image(30))
+    assert view._materials["page"] is not material
+
+    view.set_geometry_visible("b", False)
+    assert "page" not in view._geometries
+    view.set_geometry_visible("b", True)
+    assert "page" in view._geometries
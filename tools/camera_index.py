@@ -0,0 +1,227 @@
+import numpy as np
+
+from tools.camera_math import aabbs_in_frustum, points_in_frustum
+
+
+class CameraIndex:
+    """
+    Uniform-grid index over camera centers (+ view directions) for spatial queries:
+    nearest cameras, cameras within a radius, cameras looking at a point and
+    cameras inside a view frustum.
+
+    Cameras are kept in packed arrays (delete swaps the last camera into the
+    freed slot). The grid is stored CSR-style (sorted cell keys + slot order)
+    and rebuilt lazily on the first query after an add/delete, so bulk imports
+    pay for one rebuild.
+    """
+
+    def __init__(self, cameras_per_cell: int = 8):
+        self.cameras_per_cell = int(cameras_per_cell)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._centers = np.zeros((0, 3), dtype=np.float64)
+        self._directions = np.zeros((0, 3), dtype=np.float64)
+        self._size = 0
+        self._slot_of: dict[int, int] = {}
+        self._grid: dict | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, cam_id: int) -> bool:
+        return int(cam_id) in self._slot_of
+
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size].copy()
+
+    def centers(self) -> np.ndarray:
+        return self._centers[:self._size]
+
+    def _reserve(self, count: int):
+        if count <= len(self._ids):
+            return
+        capacity = max(count, 2 * len(self._ids), 64)
+        for attr in ("_ids", "_centers", "_directions"):
+            old = getattr(self, attr)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, attr, new)
+
+    def upsert_many(self, cam_ids, c2ws):
+        """
+        Add/move cameras. c2ws: (N,4,4) camera-to-world (model) matrices in the
+        Open3D GUI convention, i.e. the camera looks down its local -Z axis.
+        """
+        cam_ids = np.asarray(cam_ids, dtype=np.int64).reshape(-1)
+        c2ws = np.asarray(c2ws, dtype=np.float64).reshape(-1, 4, 4)
+        centers = c2ws[:, :3, 3]
+        directions = -c2ws[:, :3, 2]
+        directions = directions / np.maximum(np.linalg.norm(directions, axis=1, keepdims=True), 1e-12)
+
+        self._reserve(self._size + len(cam_ids))
+        slots = np.empty(len(cam_ids), dtype=np.int64)
+        for k, cam_id in enumerate(cam_ids.tolist()):
+            slot = self._slot_of.get(cam_id)
+            if slot is None:
+                slot = self._size
+                self._size += 1
+                self._slot_of[cam_id] = slot
+            slots[k] = slot
+        self._ids[slots] = cam_ids
+        self._centers[slots] = centers
+        self._directions[slots] = directions
+        self._grid = None
+
+    def upsert(self, cam_id: int, c2w):
+        self.upsert_many([cam_id], [c2w])
+
+    def remove(self, cam_id: int):
+        slot = self._slot_of.pop(int(cam_id), None)
+        if slot is None:
+            return
+        last = self._size - 1
+        if slot != last:
+            moved = int(self._ids[last])
+            self._ids[slot] = self._ids[last]
+            self._centers[slot] = self._centers[last]
+            self._directions[slot] = self._directions[last]
+            self._slot_of[moved] = slot
+        self._size = last
+        self._grid = None
+
+    def clear(self):
+        self._size = 0
+        self._slot_of.clear()
+        self._grid = None
+
+    # --- grid ---
+    def _build_grid(self) -> dict:
+        centers = self._centers[:self._size]
+        lo = centers.min(axis=0)
+        hi = centers.max(axis=0)
+        extent = np.maximum(hi - lo, 1e-9)
+        # Cell edge so an average occupied cell holds ~cameras_per_cell cameras
+        # if they filled the bounding box (sparser sets just get fewer per cell).
+        cells_wanted = max(1.0, self._size / self.cameras_per_cell)
+        cell = float(np.cbrt(np.prod(extent) / cells_wanted))
+        cell = max(cell, float(extent.max()) / 1024.0)
+        dims = np.floor(extent / cell).astype(np.int64) + 1
+        coords = np.floor((centers - lo) / cell).astype(np.int64)
+        keys = (coords[:, 0] * dims[1] + coords[:, 1]) * dims[2] + coords[:, 2]
+        order = np.argsort(keys, kind="stable")
+        cell_keys, starts = np.unique(keys[order], return_index=True)
+        return {
+            "lo": lo,
+            "cell": cell,
+            "dims": dims,
+            "order": order,
+            "cell_keys": cell_keys,
+            "starts": starts,
+            "ends": np.append(starts[1:], len(order)),
+        }
+
+    def _get_grid(self) -> dict | None:
+        if self._size == 0:
+            return None
+        if self._grid is None:
+            self._grid = self._build_grid()
+        return self._grid
+
+    def _cell_coords(self, grid: dict, keys: np.ndarray) -> np.ndarray:
+        dims = grid["dims"]
+        return np.stack([keys // (dims[1] * dims[2]), (keys // dims[2]) % dims[1], keys % dims[2]], axis=1)
+
+    def _slots_in_cells(self, grid: dict, cell_index: np.ndarray) -> np.ndarray:
+        """Slots of the cameras in the given occupied cells (indices into cell_keys)."""
+        if len(cell_index) == 0:
+            return np.zeros(0, dtype=np.int64)
+        starts = grid["starts"][cell_index]
+        counts = grid["ends"][cell_index] - starts
+        # Concatenate the ranges [start, start + count) without a Python loop.
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return grid["order"][offsets + np.arange(counts.sum())]
+
+    def _slots_in_box(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Slots of cameras in grid cells overlapping the world box [lo, hi]."""
+        grid = self._get_grid()
+        if grid is None:
+            return np.zeros(0, dtype=np.int64)
+        dims = grid["dims"]
+        c0 = np.clip(np.floor((lo - grid["lo"]) / grid["cell"]).astype(np.int64), 0, dims - 1)
+        c1 = np.clip(np.floor((hi - grid["lo"]) / grid["cell"]).astype(np.int64), 0, dims - 1)
+        box_cells = int(np.prod(c1 - c0 + 1))
+        if box_cells <= len(grid["cell_keys"]):
+            # Small box: look its cells up in the sorted key list.
+            axes = [np.arange(c0[a], c1[a] + 1) for a in range(3)]
+            ii, jj, kk = np.meshgrid(*axes, indexing="ij")
+            keys = ((ii * dims[1] + jj) * dims[2] + kk).reshape(-1)
+            pos = np.searchsorted(grid["cell_keys"], keys)
+            pos = np.minimum(pos, len(grid["cell_keys"]) - 1)
+            cell_index = pos[grid["cell_keys"][pos] == keys]
+        else:
+            # Large box: filter the occupied cells instead.
+            coords = self._cell_coords(grid, grid["cell_keys"])
+            cell_index = np.flatnonzero(np.all((coords >= c0) & (coords <= c1), axis=1))
+        return self._slots_in_cells(grid, cell_index)
+
+    # --- queries ---
+    def within_radius(self, point, radius: float) -> np.ndarray:
+        """Ids of cameras whose center is within `radius` of `point`."""
+        point = np.asarray(point, dtype=np.float64).reshape(3)
+        slots = self._slots_in_box(point - radius, point + radius)
+        d2 = np.sum((self._centers[slots] - point) ** 2, axis=1)
+        return self._ids[slots[d2 <= radius * radius]]
+
+    def nearest(self, point, k: int = 1) -> np.ndarray:
+        """Ids of the `k` cameras closest to `point`, nearest first."""
+        grid = self._get_grid()
+        if grid is None or k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        point = np.asarray(point, dtype=np.float64).reshape(3)
+        k = min(int(k), self._size)
+        reach = grid["cell"]
+        full = float(np.linalg.norm(grid["dims"] * grid["cell"])) + float(np.linalg.norm(point - grid["lo"]))
+        while True:
+            slots = self._slots_in_box(point - reach, point + reach)
+            if len(slots) >= k:
+                d = np.linalg.norm(self._centers[slots] - point, axis=1)
+                nearest = np.argsort(d, kind="stable")[:k]
+                # Exact once the k-th hit is closer than anything outside the searched box.
+                if d[nearest[-1]] <= reach or reach >= full:
+                    return self._ids[slots[nearest]]
+            if reach >= full:
+                return self._ids[slots[np.argsort(np.linalg.norm(self._centers[slots] - point, axis=1))[:k]]]
+            reach *= 2.0
+
+    def looking_at(self, target, max_angle_deg: float = 30.0, radius: float | None = None) -> np.ndarray:
+        """
+        Ids of cameras whose view direction is within `max_angle_deg` of the
+        direction to `target` (optionally only those within `radius` of it).
+        """
+        target = np.asarray(target, dtype=np.float64).reshape(3)
+        if radius is None:
+            slots = np.arange(self._size)
+        else:
+            slots = self._slots_in_box(target - radius, target + radius)
+        to_target = target - self._centers[slots]
+        dist = np.linalg.norm(to_target, axis=1)
+        cos = np.einsum("nk,nk->n", to_target, self._directions[slots]) / np.maximum(dist, 1e-12)
+        mask = cos >= np.cos(np.deg2rad(max_angle_deg))
+        if radius is not None:
+            mask &= dist <= radius
+        return self._ids[slots[mask]]
+
+    def in_frustum(self, planes: np.ndarray, margin: float = 0.0) -> np.ndarray:
+        """
+        Ids of cameras whose center lies inside the frustum `planes`
+        (camera_math.frustum_planes), grown by `margin` so cameras whose drawn
+        geometry pokes into the view are kept. Whole grid cells are culled first.
+        """
+        grid = self._get_grid()
+        if grid is None:
+            return np.zeros(0, dtype=np.int64)
+        grown = np.array(planes, dtype=np.float64)
+        grown[:, 3] += margin
+        cell_lo = grid["lo"] + self._cell_coords(grid, grid["cell_keys"]) * grid["cell"]
+        cell_index = np.flatnonzero(aabbs_in_frustum(grown, cell_lo, cell_lo + grid["cell"]))
+        slots = self._slots_in_cells(grid, cell_index)
+        return self._ids[slots[points_in_frustum(grown, self._centers[slots])]]
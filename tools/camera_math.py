@@ -26,3 +26,93 @@ def create_camera_intrinsic_from_size(width=1024, height=768, hfov=60.0, vfov=60
          [0, fy, height / 2.0],
          [0, 0,  1]])
 
+
+
+def invert_rigid_transforms(T: np.ndarray) -> np.ndarray:
+    """
+    Closed-form inverse of rigid transforms [R|t]: [R^T | -R^T t].
+    Accepts (4,4) or (N,4,4); no general matrix inversion involved.
+    """
+    T = np.asarray(T)
+    R = T[..., :3, :3]
+    t = T[..., :3, 3:]
+    Rt = np.swapaxes(R, -1, -2)
+    out = np.zeros_like(T)
+    out[..., :3, :3] = Rt
+    out[..., :3, 3:] = -Rt @ t
+    out[..., 3, 3] = 1
+    return out
+
+
+def to_o3d_extrinsics_from_c2w(c2w: np.ndarray, dtype=np.float64) -> np.ndarray:
+    """
+    Batched `to_o3d_extrinsic_from_c2w` for (N,4,4) camera-to-world stacks.
+    Assumes rigid poses (Open3D GUI model matrices are). Returns (N,4,4) in `dtype`.
+    """
+    c2w = np.asarray(c2w, dtype=np.float64)
+    w2c = invert_rigid_transforms(c2w)
+    # GL2CV only flips the sign of rows 1 and 2; skip the matmul.
+    w2c[..., 1:3, :] *= -1
+    return w2c.astype(dtype, copy=False)
+
+
+def create_camera_intrinsics_from_sizes(width, height, hfov=60.0, vfov=60.0, dtype=np.float64) -> np.ndarray:
+    """
+    Batched `create_camera_intrinsic_from_size`: (N,) width/height/fov arrays
+    (or scalars, broadcast) -> (N,3,3) K stack in `dtype`.
+    """
+    width, height, hfov, vfov = np.broadcast_arrays(
+        np.asarray(width, dtype=np.float64),
+        np.asarray(height, dtype=np.float64),
+        np.asarray(hfov, dtype=np.float64),
+        np.asarray(vfov, dtype=np.float64),
+    )
+    width = np.atleast_1d(width)
+    height = np.atleast_1d(height)
+    # Same convention as the single version: fx is governed by fy (hfov is unused).
+    fy = (height / 2.0) / np.tan(np.radians(np.atleast_1d(vfov)) / 2)
+    K = np.zeros((len(width), 3, 3), dtype=np.float64)
+    K[:, 0, 0] = fy
+    K[:, 1, 1] = fy
+    K[:, 0, 2] = width / 2.0
+    K[:, 1, 2] = height / 2.0
+    K[:, 2, 2] = 1
+    return K.astype(dtype, copy=False)
+
+
+def frustum_planes(view_proj: np.ndarray) -> np.ndarray:
+    """
+    (6,4) normalized planes [a, b, c, d] of an OpenGL-style projection @ view
+    matrix (Gribb/Hartmann). A point p is inside when a*x + b*y + c*z + d >= 0
+    for all planes. Order: left, right, bottom, top, near, far.
+    """
+    m = np.asarray(view_proj, dtype=np.float64)
+    planes = np.stack([
+        m[3] + m[0],
+        m[3] - m[0],
+        m[3] + m[1],
+        m[3] - m[1],
+        m[3] + m[2],
+        m[3] - m[2],
+    ])
+    return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+
+def aabbs_in_frustum(planes: np.ndarray, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """
+    Conservative (N,) mask of axis-aligned boxes that intersect the frustum:
+    a box is culled only if its most-positive corner is behind some plane.
+    """
+    mins = np.asarray(mins, dtype=np.float64).reshape(-1, 3)
+    maxs = np.asarray(maxs, dtype=np.float64).reshape(-1, 3)
+    normals = planes[:, :3]
+    # (N,6,3): per box and plane, the corner furthest along the plane normal.
+    corners = np.where(normals[None, :, :] >= 0, maxs[:, None, :], mins[:, None, :])
+    dist = np.einsum("npk,pk->np", corners, normals) + planes[None, :, 3]
+    return np.all(dist >= 0, axis=1)
+
+
+def points_in_frustum(planes: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """(N,) mask of points inside the frustum."""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return np.all(points @ planes[:, :3].T + planes[:, 3] >= 0, axis=1)
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+def rotations_to_quaternions(R: np.ndarray) -> np.ndarray:
+    """(N,3,3) rotation matrices -> (N,4) unit quaternions (w, x, y, z), w >= 0."""
+    R = np.asarray(R, dtype=np.float64).reshape(-1, 3, 3)
+    # Shepperd's method: build from the largest of the four squared components.
+    trace = np.trace(R, axis1=1, axis2=2)
+    q_sq = np.stack(
+        [
+            1.0 + trace,
+            1.0 + R[:, 0, 0] - R[:, 1, 1] - R[:, 2, 2],
+            1.0 - R[:, 0, 0] + R[:, 1, 1] - R[:, 2, 2],
+            1.0 - R[:, 0, 0] - R[:, 1, 1] + R[:, 2, 2],
+        ],
+        axis=1,
+    )
+    best = np.argmax(q_sq, axis=1)
+    rows = np.arange(len(R))
+    s = 2.0 * np.sqrt(np.maximum(q_sq[rows, best], 1e-300))
+    # Each candidate row: (w, x, y, z) * s for the chosen pivot.
+    candidates = np.stack(
+        [
+            np.stack([s * s / 4, R[:, 2, 1] - R[:, 1, 2], R[:, 0, 2] - R[:, 2, 0], R[:, 1, 0] - R[:, 0, 1]], axis=1),
+            np.stack([R[:, 2, 1] - R[:, 1, 2], s * s / 4, R[:, 0, 1] + R[:, 1, 0], R[:, 0, 2] + R[:, 2, 0]], axis=1),
+            np.stack([R[:, 0, 2] - R[:, 2, 0], R[:, 0, 1] + R[:, 1, 0], s * s / 4, R[:, 1, 2] + R[:, 2, 1]], axis=1),
+            np.stack([R[:, 1, 0] - R[:, 0, 1], R[:, 0, 2] + R[:, 2, 0], R[:, 1, 2] + R[:, 2, 1], s * s / 4], axis=1),
+        ],
+        axis=1,
+    )
+    q = candidates[rows, best] / s[:, None]
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return np.where(q[:, :1] < 0, -q, q)
+
+
+def quaternions_to_rotations(q: np.ndarray) -> np.ndarray:
+    """(N,4) quaternions (w, x, y, z) -> (N,3,3) rotation matrices (normalized first)."""
+    q = np.asarray(q, dtype=np.float64).reshape(-1, 4)
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    w, x, y, z = q.T
+    R = np.empty((len(q), 3, 3), dtype=np.float64)
+    R[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    R[:, 0, 1] = 2 * (x * y - w * z)
+    R[:, 0, 2] = 2 * (x * z + w * y)
+    R[:, 1, 0] = 2 * (x * y + w * z)
+    R[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    R[:, 1, 2] = 2 * (y * z - w * x)
+    R[:, 2, 0] = 2 * (x * z - w * y)
+    R[:, 2, 1] = 2 * (y * z + w * x)
+    R[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+def slerp(q0: np.ndarray, q1: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Row-wise spherical interpolation of (N,4) quaternions at (N,) parameters t in [0, 1] (shortest arc)."""
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[:, None]
+    dot = np.sum(q0 * q1, axis=1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.clip(np.abs(dot), 0.0, 1.0)
+    theta = np.arccos(dot)
+    sin_theta = np.sin(theta)
+    # Nearly identical rotations: fall back to (normalized) linear interpolation.
+    near = sin_theta < 1e-6
+    safe = np.where(near, 1.0, sin_theta)
+    w0 = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / safe)
+    w1 = np.where(near, t, np.sin(t * theta) / safe)
+    q = w0 * q0 + w1 * q1
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def catmull_rom(p0: np.ndarray, p1: np.ndarray, p2: np.ndarray, p3: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Row-wise centripetal Catmull-Rom between p1 and p2 ((N,3) control points, (N,) t in [0, 1])."""
+    t = np.asarray(t, dtype=np.float64)[:, None]
+
+    def knot(a, b):
+        # Centripetal parameterization (alpha = 0.5): no cusps or self-intersections.
+        return np.maximum(np.linalg.norm(b - a, axis=1, keepdims=True) ** 0.5, 1e-9)
+
+    t1 = knot(p0, p1)
+    t2 = t1 + knot(p1, p2)
+    t3 = t2 + knot(p2, p3)
+    u = t1 + t * (t2 - t1)
+    a1 = ((t1 - u) * p0 + u * p1) / t1
+    a2 = ((t2 - u) * p1 + (u - t1) * p2) / (t2 - t1)
+    a3 = ((t3 - u) * p2 + (u - t2) * p3) / (t3 - t2)
+    b1 = ((t2 - u) * a1 + u * a2) / t2
+    b2 = ((t3 - u) * a2 + (u - t1) * a3) / (t3 - t1)
+    return ((t2 - u) * b1 + (u - t1) * b2) / (t2 - t1)
+
+
+def interpolate_camera_path(key_poses: np.ndarray, frames_per_segment: int, loop: bool = False) -> np.ndarray:
+    """
+    Smooth path through (K,4,4) camera-to-world key poses: Catmull-Rom on the
+    positions, SLERP on the rotations, `frames_per_segment` frames per pair of
+    consecutive keys (the whole path is evaluated in one vectorized pass).
+
+    Returns (M,4,4) poses that start at the first key; an open path ends on
+    the last key, a looped one stops one frame short of the first key again.
+    """
+    keys = np.asarray(key_poses, dtype=np.float64).reshape(-1, 4, 4)
+    count = len(keys)
+    steps = max(int(frames_per_segment), 1)
+    if count < 2:
+        return keys.copy()
+
+    segments = count if loop else count - 1
+    frame = np.arange(segments * steps + (0 if loop else 1))
+    seg = np.minimum(frame // steps, segments - 1)
+    t = (frame - seg * steps) / steps
+
+    positions = keys[:, :3, 3]
+    quats = rotations_to_quaternions(keys[:, :3, :3])
+    # Keep neighbouring keys in the same hemisphere so SLERP takes the short way round.
+    for i in range(1, count):
+        if np.dot(quats[i - 1], quats[i]) < 0:
+            quats[i] = -quats[i]
+
+    if loop:
+        idx = np.stack([seg - 1, seg, seg + 1, seg + 2]) % count
+        ctrl = positions[idx]
+    else:
+        # Open ends: mirror the first/last key so the curve starts/ends with a sensible tangent.
+        padded = np.concatenate([2 * positions[:1] - positions[1:2], positions, 2 * positions[-1:] - positions[-2:-1]])
+        ctrl = padded[np.stack([seg, seg + 1, seg + 2, seg + 3])]
+
+    out = np.tile(np.eye(4), (len(frame), 1, 1))
+    out[:, :3, 3] = catmull_rom(ctrl[0], ctrl[1], ctrl[2], ctrl[3], t)
+    nxt = (seg + 1) % count
+    out[:, :3, :3] = quaternions_to_rotations(slerp(quats[seg], quats[nxt], t))
+    return out
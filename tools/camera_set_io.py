@@ -1,12 +1,23 @@
+from __future__ import annotations
+
 import json
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
-import open3d as o3d
 
-from tools.screenshot import save_image
+from tools.camera_math import to_o3d_extrinsics_from_c2w
+from tools.screenshot import IMAGE_ENCODINGS, read_image_array, save_image_encoded
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+# v2 stores per-camera numbers as contiguous .npy arrays next to a small JSON manifest.
+CAMERA_SET_ARRAY_NAMES = ("ids", "width", "height", "c2w", "K")
 
 
 def make_camera_record(
@@ -53,76 +64,181 @@ def make_camera_record(
     }
 
 
+def _write_camera_image(
+    rec: dict[str, Any],
+    path_stem: str,
+    image_encoding: str,
+    image_array: np.ndarray | None = None,
+) -> str | None:
+    image_path = rec.get("image_path")
+    if image_array is None:
+        image_array = rec.get("image_array")
+    if isinstance(image_array, np.ndarray):
+        return save_image_encoded(path_stem, image_array, image_encoding)
+    if isinstance(image_path, str) and os.path.exists(image_path):
+        return save_image_encoded(path_stem, read_image_array(image_path), image_encoding)
+    return None
+
+
 def export_camera_set(
     *,
     indices: list[int],
     camera_records: dict[int, dict[str, Any]],
     export_root: str = "export/camera_sets",
+    format_version: int = 1,
+    image_encoding: str = "png_small",
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    load_image: Callable[[int], np.ndarray | None] | None = None,
 ) -> str:
     """
     Export to:
       export/camera_sets/<timestamp>/
         cameras.json
-        images/cam_###.png
+        images/cam_###.<png|jpg|npy>
+        arrays/*.npy            (format_version=2 only)
+
+    v1 stores every camera as nested JSON lists. v2 keeps cameras.json as a small
+    manifest and writes ids/width/height/c2w/K as contiguous arrays that
+    `load_camera_set_arrays` memory-maps back.
+
+    Images are encoded in a thread pool using `image_encoding` (see
+    tools.screenshot.IMAGE_ENCODINGS). `progress(done, total)` is called from
+    the calling thread after each image, so this can run off the GUI thread.
+    `load_image(idx)` (optional, called from the pool) supplies the full image
+    when records don't carry one, e.g. from tools.image_cache.CameraImageCache.
 
     Returns absolute output directory path.
     """
     if not indices:
         raise ValueError("No camera indices to export")
+    if format_version not in (1, 2):
+        raise ValueError(f"Unsupported camera set format version: {format_version}")
+    if image_encoding not in IMAGE_ENCODINGS:
+        raise ValueError(f"Unknown image encoding: {image_encoding}")
 
     ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     out_dir = os.path.abspath(os.path.join(export_root, ts))
     images_dir = os.path.join(out_dir, "images")
     os.makedirs(images_dir, exist_ok=True)
 
-    cameras_out: list[dict[str, Any]] = []
-    for idx in indices:
-        rec = camera_records.get(idx)
-        if rec is None:
-            continue
-
-        entry: dict[str, Any] = {
-            "id": int(idx),
-            "source": rec.get("source"),
-            "width": rec.get("width"),
-            "height": rec.get("height"),
-            "model_matrix": rec.get("model_matrix"),
-            "c2w": rec.get("c2w"),
-            "extrinsic": rec.get("extrinsic"),
-            "intrinsic": rec.get("intrinsic"),
-        }
+    selected = [(int(idx), camera_records[idx]) for idx in indices if camera_records.get(idx) is not None]
+    total = len(selected)
+    image_files: dict[int, str | None] = {}
+    def write(idx: int, rec: dict[str, Any]) -> str | None:
+        image_array = load_image(idx) if load_image is not None else None
+        return _write_camera_image(rec, os.path.join(images_dir, f"cam_{idx:03d}"), image_encoding, image_array)
 
-        image_rel = None
-        image_path = rec.get("image_path")
-        image_array = rec.get("image_array")
-        out_png = os.path.join(images_dir, f"cam_{idx:03d}.png")
-
-        if isinstance(image_array, np.ndarray):
-            img_o3d = o3d.geometry.Image(image_array)
-            save_image(out_png, img_o3d)
-            image_rel = os.path.relpath(out_png, out_dir)
-        elif isinstance(image_path, str) and os.path.exists(image_path):
-            img_o3d = o3d.io.read_image(image_path)
-            save_image(out_png, img_o3d)
-            image_rel = os.path.relpath(out_png, out_dir)
-
-        if image_rel is not None:
-            entry["image_file"] = image_rel
-
-        cameras_out.append(entry)
-
-    payload = {
-        "version": 1,
-        "created_at": ts,
-        "root_format": "open3d_gui_view_state",
-        "cameras": cameras_out,
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(write, idx, rec): idx for idx, rec in selected}
+        for done, future in enumerate(as_completed(futures), start=1):
+            written = future.result()
+            image_files[futures[future]] = os.path.relpath(written, out_dir) if written else None
+            if progress is not None:
+                progress(done, total)
+
+    arrays = {
+        "ids": np.array([idx for idx, _ in selected], dtype=np.int64),
+        "width": np.array([int(rec.get("width")) for _, rec in selected], dtype=np.int32),
+        "height": np.array([int(rec.get("height")) for _, rec in selected], dtype=np.int32),
+        "c2w": np.array([rec.get("c2w") or rec.get("model_matrix") for _, rec in selected], dtype=np.float64).reshape(-1, 4, 4),
+        "K": np.array([(rec.get("intrinsic") or {}).get("K") for _, rec in selected], dtype=np.float64).reshape(-1, 3, 3),
+        "source": [rec.get("source") for _, rec in selected],
+        "image_file": [image_files.get(idx) for idx, _ in selected],
     }
+    write_camera_set(out_dir, arrays, format_version=format_version, created_at=ts)
+    return out_dir
+
+
+def write_camera_set(
+    out_dir: str,
+    arrays: dict[str, Any],
+    *,
+    format_version: int = 2,
+    created_at: str | None = None,
+) -> str:
+    """
+    Write stacked camera arrays (the `load_camera_set_arrays` layout; only
+    ids/width/height/c2w/K/source/image_file are used, image_file relative to
+    `out_dir`) as `out_dir/cameras.json` (+ `arrays/*.npy` for v2).
+    Returns the cameras.json path.
+    """
+    if format_version not in (1, 2):
+        raise ValueError(f"Unsupported camera set format version: {format_version}")
+    if created_at is None:
+        created_at = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    count = len(arrays["ids"])
+    sources = list(arrays.get("source") or [None] * count)
+    image_files = list(arrays.get("image_file") or [None] * count)
+    os.makedirs(out_dir, exist_ok=True)
+
+    if format_version == 1:
+        c2w = np.asarray(arrays["c2w"], dtype=np.float64).reshape(-1, 4, 4)
+        K = np.asarray(arrays["K"], dtype=np.float64).reshape(-1, 3, 3)
+        extrinsics = to_o3d_extrinsics_from_c2w(c2w)
+        cameras_out: list[dict[str, Any]] = []
+        for i in range(count):
+            width = int(arrays["width"][i])
+            height = int(arrays["height"][i])
+            model_matrix = c2w[i].tolist()
+            entry: dict[str, Any] = {
+                "id": int(arrays["ids"][i]),
+                "source": sources[i],
+                "width": width,
+                "height": height,
+                "model_matrix": model_matrix,
+                "c2w": model_matrix,
+                "extrinsic": extrinsics[i].tolist(),
+                "intrinsic": {
+                    "width": width,
+                    "height": height,
+                    "fx": float(K[i, 0, 0]),
+                    "fy": float(K[i, 1, 1]),
+                    "cx": float(K[i, 0, 2]),
+                    "cy": float(K[i, 1, 2]),
+                    "K": K[i].tolist(),
+                },
+            }
+            if image_files[i] is not None:
+                entry["image_file"] = image_files[i]
+            cameras_out.append(entry)
+
+        payload = {
+            "version": 1,
+            "created_at": created_at,
+            "root_format": "open3d_gui_view_state",
+            "cameras": cameras_out,
+        }
+    else:
+        stored = {
+            "ids": np.asarray(arrays["ids"], dtype=np.int64),
+            "width": np.asarray(arrays["width"], dtype=np.int32),
+            "height": np.asarray(arrays["height"], dtype=np.int32),
+            "c2w": np.asarray(arrays["c2w"], dtype=np.float64).reshape(-1, 4, 4),
+            "K": np.asarray(arrays["K"], dtype=np.float64).reshape(-1, 3, 3),
+        }
+        arrays_dir = os.path.join(out_dir, "arrays")
+        os.makedirs(arrays_dir, exist_ok=True)
+        array_files: dict[str, str] = {}
+        for name in CAMERA_SET_ARRAY_NAMES:
+            npy_path = os.path.join(arrays_dir, f"{name}.npy")
+            np.save(npy_path, np.ascontiguousarray(stored[name]))
+            array_files[name] = os.path.relpath(npy_path, out_dir)
+
+        payload = {
+            "version": 2,
+            "created_at": created_at,
+            "root_format": "open3d_gui_view_state",
+            "count": count,
+            "arrays": array_files,
+            "source": sources,
+            "image_file": image_files,
+        }
 
     json_path = os.path.join(out_dir, "cameras.json")
     with open(json_path, "w") as f:
         json.dump(payload, f, indent=2)
-
-    return out_dir
+    return json_path
 
 
 def load_camera_set(json_path: str) -> tuple[dict[str, Any], str]:
@@ -133,12 +249,223 @@ def load_camera_set(json_path: str) -> tuple[dict[str, Any], str]:
     return payload, os.path.dirname(abs_path)
 
 
+def _v1_camera_c2w(cam: dict[str, Any]) -> np.ndarray:
+    pose = cam.get("model_matrix") or cam.get("c2w")
+    try:
+        return np.asarray(pose, dtype=np.float64).reshape(4, 4)
+    except (TypeError, ValueError):
+        return np.full((4, 4), np.nan)
+
+
+def load_camera_set_arrays(json_path: str, mmap: bool = True) -> tuple[dict[str, Any], str]:
+    """
+    Load a camera set (v1 or v2) as stacked arrays and return (arrays, base_dir).
+
+    arrays keys: ids (N,), width (N,), height (N,), c2w (N,4,4), extrinsic (N,4,4),
+    K (N,3,3), source (list[str | None]), image_file (list[str | None]).
+
+    For v2 the stored arrays are memory-mapped read-only (no copy); `extrinsic`
+    is derived from c2w in one vectorized pass. v1 JSON is converted on load;
+    a v1 camera without a usable 4x4 pose gets an all-NaN c2w, which
+    `validate_camera_set_arrays` reports as non_finite and import/render skip.
+    """
+    payload, base_dir = load_camera_set(json_path)
+    version = int(payload.get("version", 1))
+
+    if version == 2:
+        mmap_mode = "r" if mmap else None
+        arrays: dict[str, Any] = {
+            name: np.load(os.path.join(base_dir, rel), mmap_mode=mmap_mode)
+            for name, rel in payload["arrays"].items()
+        }
+        count = len(arrays["ids"])
+        arrays["source"] = list(payload.get("source") or [None] * count)
+        arrays["image_file"] = list(payload.get("image_file") or [None] * count)
+    elif version == 1:
+        cameras = [cam for cam in payload.get("cameras", []) if isinstance(cam, dict)]
+        count = len(cameras)
+        K = np.zeros((count, 3, 3), dtype=np.float64)
+        for i, cam in enumerate(cameras):
+            intrinsic = cam.get("intrinsic") or {}
+            if intrinsic.get("K") is not None:
+                K[i] = np.asarray(intrinsic["K"], dtype=np.float64)
+            elif None not in (intrinsic.get("fx"), intrinsic.get("fy"), intrinsic.get("cx"), intrinsic.get("cy")):
+                K[i] = [[intrinsic["fx"], 0, intrinsic["cx"]], [0, intrinsic["fy"], intrinsic["cy"]], [0, 0, 1]]
+        arrays = {
+            "ids": np.array([int(cam.get("id", i)) for i, cam in enumerate(cameras)], dtype=np.int64),
+            "width": np.array([int(cam.get("width") or 0) for cam in cameras], dtype=np.int32),
+            "height": np.array([int(cam.get("height") or 0) for cam in cameras], dtype=np.int32),
+            "c2w": np.stack([_v1_camera_c2w(cam) for cam in cameras]) if cameras else np.zeros((0, 4, 4)),
+            "K": K,
+            "source": [cam.get("source") for cam in cameras],
+            "image_file": [cam.get("image_file") for cam in cameras],
+        }
+    else:
+        raise ValueError(f"Unsupported camera set format version: {version}")
+
+    arrays["extrinsic"] = to_o3d_extrinsics_from_c2w(arrays["c2w"])
+    return arrays, base_dir
+
+
 def load_camera_image_array(base_dir: str, image_file: str | None) -> tuple[np.ndarray | None, str | None]:
     if not image_file:
         return None, None
     image_path = os.path.join(base_dir, image_file)
     if not os.path.exists(image_path):
         return None, None
-    img_o3d = o3d.io.read_image(image_path)
-    return np.asarray(img_o3d), image_path
+    return read_image_array(image_path), image_path
+
+
+
+def _transfer_camera_images(
+    jobs: list[tuple[str | None, str]],
+    image_encoding: str | None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> list[str | None]:
+    """
+    For each (source image path or None, destination path stem) copy the file
+    as-is (image_encoding=None, keeps its extension) or decode + re-encode it
+    in a thread pool. Returns the written paths (None where there was no image).
+    """
+    if image_encoding is not None and image_encoding not in IMAGE_ENCODINGS:
+        raise ValueError(f"Unknown image encoding: {image_encoding}")
+
+    def transfer(src: str | None, dst_stem: str) -> str | None:
+        if not src or not os.path.exists(src):
+            return None
+        os.makedirs(os.path.dirname(dst_stem), exist_ok=True)
+        if image_encoding is None:
+            dst = dst_stem + os.path.splitext(src)[1]
+            shutil.copyfile(src, dst)
+            return dst
+        return save_image_encoded(dst_stem, read_image_array(src), image_encoding)
+
+    written: list[str | None] = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(transfer, src, dst): i for i, (src, dst) in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            written[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(jobs))
+    return written
+
+
+def _copy_camera_set(
+    parts: list[tuple[dict[str, Any], str]],
+    out_dir: str,
+    ids: np.ndarray,
+    format_version: int,
+    image_encoding: str | None,
+    max_workers: int | None,
+    progress: Callable[[int, int], None] | None,
+) -> str:
+    out_dir = os.path.abspath(out_dir)
+    sources = [os.path.join(base_dir, f) if f else None for arrays, base_dir in parts for f in arrays["image_file"]]
+    jobs = [(src, os.path.join(out_dir, "images", f"cam_{int(idx):03d}")) for src, idx in zip(sources, ids)]
+    written = _transfer_camera_images(jobs, image_encoding, max_workers, progress)
+    merged = {
+        "ids": ids,
+        "width": np.concatenate([np.asarray(a["width"]) for a, _ in parts]),
+        "height": np.concatenate([np.asarray(a["height"]) for a, _ in parts]),
+        "c2w": np.concatenate([np.asarray(a["c2w"]) for a, _ in parts]),
+        "K": np.concatenate([np.asarray(a["K"]) for a, _ in parts]),
+        "source": [s for a, _ in parts for s in a["source"]],
+        "image_file": [os.path.relpath(w, out_dir) if w else None for w in written],
+    }
+    return write_camera_set(out_dir, merged, format_version=format_version)
+
 
+def convert_camera_set(
+    json_path: str,
+    out_dir: str,
+    *,
+    format_version: int = 2,
+    image_encoding: str | None = None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> str:
+    """
+    Rewrite a camera set (v1 or v2) as `format_version` into `out_dir`, keeping
+    camera ids. Images are copied unchanged, or re-encoded with `image_encoding`.
+    Returns the new cameras.json path.
+    """
+    arrays, base_dir = load_camera_set_arrays(json_path)
+    return _copy_camera_set(
+        [(arrays, base_dir)], out_dir, np.asarray(arrays["ids"], dtype=np.int64),
+        format_version, image_encoding, max_workers, progress,
+    )
+
+
+def merge_camera_sets(
+    json_paths: list[str],
+    out_dir: str,
+    *,
+    format_version: int = 2,
+    image_encoding: str | None = None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> str:
+    """
+    Concatenate camera sets (any mix of v1/v2) into one set in `out_dir`.
+    Cameras are renumbered 1..N in input order so ids and image names stay
+    unique. Returns the merged cameras.json path.
+    """
+    parts = [load_camera_set_arrays(path) for path in json_paths]
+    total = sum(len(arrays["ids"]) for arrays, _ in parts)
+    return _copy_camera_set(
+        parts, out_dir, np.arange(1, total + 1, dtype=np.int64),
+        format_version, image_encoding, max_workers, progress,
+    )
+
+
+def validate_camera_set_arrays(
+    arrays: dict[str, Any],
+    base_dir: str | None = None,
+    tolerance: float = 1e-4,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorized sanity checks of a loaded camera set. Returns {issue: ids of the
+    offending cameras} for the checks that failed (empty dict == valid):
+
+      non_finite        NaN/inf in c2w or K
+      bad_bottom_row    c2w last row is not [0, 0, 0, 1]
+      non_orthonormal   rotation R deviates from R^T R = I by more than `tolerance`
+      reflection        det(R) < 0
+      bad_size          width or height <= 0
+      bad_intrinsics    fx/fy <= 0, K[2,2] != 1 or principal point outside the image
+      duplicate_id      id used by more than one camera
+      missing_image     image_file set but not on disk (needs `base_dir`)
+    """
+    ids = np.asarray(arrays["ids"], dtype=np.int64)
+    c2w = np.asarray(arrays["c2w"], dtype=np.float64).reshape(-1, 4, 4)
+    K = np.asarray(arrays["K"], dtype=np.float64).reshape(-1, 3, 3)
+    width = np.asarray(arrays["width"])
+    height = np.asarray(arrays["height"])
+    R = c2w[:, :3, :3]
+
+    with np.errstate(invalid="ignore"):
+        non_finite = ~(np.isfinite(c2w).all(axis=(1, 2)) & np.isfinite(K).all(axis=(1, 2)))
+        gram = np.einsum("nji,njk->nik", R, R) - np.eye(3)
+        checks = {
+            "non_finite": non_finite,
+            "bad_bottom_row": ~np.all(np.abs(c2w[:, 3, :] - [0.0, 0.0, 0.0, 1.0]) <= tolerance, axis=1),
+            "non_orthonormal": ~(np.abs(gram).max(axis=(1, 2), initial=0.0) <= tolerance),
+            "reflection": np.linalg.det(np.where(non_finite[:, None, None], np.eye(3), R)) < 0,
+            "bad_size": (width <= 0) | (height <= 0),
+            "bad_intrinsics": ~(
+                (K[:, 0, 0] > 0)
+                & (K[:, 1, 1] > 0)
+                & (np.abs(K[:, 2, 2] - 1.0) <= tolerance)
+                & (K[:, 0, 2] >= 0) & (K[:, 0, 2] <= width)
+                & (K[:, 1, 2] >= 0) & (K[:, 1, 2] <= height)
+            ),
+        }
+    unique, counts = np.unique(ids, return_counts=True)
+    checks["duplicate_id"] = np.isin(ids, unique[counts > 1])
+    if base_dir is not None:
+        checks["missing_image"] = np.array(
+            [bool(f) and not os.path.exists(os.path.join(base_dir, f)) for f in arrays["image_file"]],
+            dtype=bool,
+        )
+    return {name: ids[mask] for name, mask in checks.items() if mask.any()}
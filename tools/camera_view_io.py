@@ -1,4 +1,8 @@
+import glob
 import json
+import os
+
+import numpy as np
 
 
 def save_view_state(path, params):
@@ -11,3 +15,14 @@ def load_view_state(path):
         params = json.load(f)
     return params
 
+
+
+def list_view_files(views_dir):
+    """Saved views (camera_view_<timestamp>.json) in `views_dir`, oldest first."""
+    return sorted(glob.glob(os.path.join(views_dir, "camera_view_*.json")))
+
+
+def load_view_poses(paths):
+    """(N,4,4) camera-to-world matrices of the saved views at `paths`."""
+    poses = [load_view_state(path)["model_matrix"] for path in paths]
+    return np.array(poses, dtype=np.float64).reshape(-1, 4, 4)
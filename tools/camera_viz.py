@@ -1,12 +1,19 @@
+from __future__ import annotations
+
 import numpy as np
-import open3d as o3d
 from tools.camera_math import create_camera_intrinsic_from_size
+from tools.tracing import traced
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
 
 def create_o3d_intrinsic(size):
     intrinsic = create_camera_intrinsic_from_size(size[0], size[1])
     return o3d.camera.PinholeCameraIntrinsic(width=size[0], height=size[1], fx=intrinsic[0][0], fy=intrinsic[1][1], cx=intrinsic[0][2], cy=intrinsic[1][2])
 
 
+@traced("camera_viz.create_camera_geometry")
 def create_camera_geometry(intrinsic: o3d.camera.PinholeCameraIntrinsic, extrinsic: np.ndarray, 
             img: np.ndarray = None, cam_color: np.ndarray = None, 
             O3DVisualizer: bool = False, scale: float = 1.0) -> list[o3d.geometry]:
@@ -51,3 +58,4 @@ def create_camera_geometry(intrinsic: o3d.camera.PinholeCameraIntrinsic, extrins
             rectangle.triangle_material_ids = o3d.utility.IntVector(np.array([0, 0, 0, 1, 1, 1], dtype=np.int32))
         geometries.append(rectangle)    
     return geometries
+
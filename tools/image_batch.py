@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from tools.image_cache import make_thumbnail
+from tools.screenshot import IMAGE_ENCODINGS, read_image_array, save_image_encoded
+
+
+IMAGE_FILE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".npy")
+
+
+def list_image_files(root: str) -> list[str]:
+    """Image files under `root` (recursive), as sorted paths relative to `root`."""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(IMAGE_FILE_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    return sorted(found)
+
+
+def transcode_image(src_path: str, dst_stem: str, encoding: str, max_side: int | None = None) -> str:
+    """Re-encode one image as `<dst_stem><ext>`, optionally downscaled to `max_side`; returns the path."""
+    image = read_image_array(src_path)
+    if max_side is not None:
+        image = make_thumbnail(image, max_side)
+    os.makedirs(os.path.dirname(os.path.abspath(dst_stem)), exist_ok=True)
+    return save_image_encoded(dst_stem, image, encoding)
+
+
+def transcode_image_folder(
+    src_dir: str,
+    dst_dir: str,
+    *,
+    encoding: str = "png_fast",
+    max_side: int | None = None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> list[str]:
+    """
+    Re-encode (and optionally downscale) every image under `src_dir` into
+    `dst_dir`, mirroring the folder layout, on a thread pool. `progress(done,
+    total)` is called from the calling thread. Returns the written paths.
+    """
+    if encoding not in IMAGE_ENCODINGS:
+        raise ValueError(f"Unknown image encoding: {encoding}")
+    files = list_image_files(src_dir)
+    written = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(
+                transcode_image,
+                os.path.join(src_dir, rel),
+                os.path.join(dst_dir, os.path.splitext(rel)[0]),
+                encoding,
+                max_side,
+            )
+            for rel in files
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            written.append(future.result())
+            if progress is not None:
+                progress(done, len(files))
+    return sorted(written)
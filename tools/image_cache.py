@@ -0,0 +1,170 @@
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from tools.screenshot import read_image_array
+from tools.tracing import traced
+
+
+@traced("image.thumbnail")
+def make_thumbnail(img: np.ndarray, max_side: int = 256) -> np.ndarray:
+    """Nearest-neighbour downscale so the longer side is at most `max_side`."""
+    img = np.asarray(img)
+    h, w = img.shape[:2]
+    scale = max(h, w) / float(max_side)
+    if scale <= 1.0:
+        return np.ascontiguousarray(img)
+    out_h = max(1, int(round(h / scale)))
+    out_w = max(1, int(round(w / scale)))
+    ys = (np.arange(out_h) * h) // out_h
+    xs = (np.arange(out_w) * w) // out_w
+    return np.ascontiguousarray(img[ys[:, None], xs[None, :]])
+
+
+class CameraImageCache:
+    """
+    Per-camera image storage with a byte budget.
+
+    - Thumbnails are always resident (they back the image planes).
+    - Full-resolution images are loaded on demand (export, inspection) and kept
+      in an LRU; the least recently used ones are evicted past `budget_bytes`.
+    - Images without a source file (scene captures, rerenders) are spilled to a
+      .npy file in a private temp dir before eviction, so they can be reloaded.
+      The dir is removed by `clear()`, or at interpreter exit at the latest.
+
+    All methods are thread-safe (export reads from a worker pool).
+    """
+
+    def __init__(self, budget_bytes: int = 512 * 1024 * 1024, thumbnail_max_side: int = 256):
+        self.budget_bytes = int(budget_bytes)
+        self.thumbnail_max_side = int(thumbnail_max_side)
+        self._lock = threading.Lock()
+        self._thumbnails: dict[object, np.ndarray] = {}
+        self._paths: dict[object, str] = {}
+        self._spilled: dict[object, str] = {}
+        self._full: OrderedDict[object, np.ndarray] = OrderedDict()
+        self._full_bytes = 0
+        self._spill_dir: str | None = None
+        self._spill_cleanup: weakref.finalize | None = None
+
+    # --- public API ---
+    def put(
+        self,
+        key,
+        *,
+        image_array: np.ndarray | None = None,
+        image_path: str | None = None,
+        thumbnail: np.ndarray | None = None,
+    ) -> np.ndarray | None:
+        """
+        Register/replace the image for `key` and return its thumbnail.
+        With only `image_path`, the file is decoded once for the thumbnail (unless
+        one is given) and the full image is left on disk.
+        """
+        if image_array is None and image_path is None:
+            self.remove(key)
+            return None
+        if thumbnail is None:
+            source = image_array if image_array is not None else read_image_array(image_path)
+            thumbnail = make_thumbnail(source, self.thumbnail_max_side)
+        with self._lock:
+            self._drop_locked(key)
+            self._thumbnails[key] = thumbnail
+            if image_path is not None:
+                self._paths[key] = image_path
+            if image_array is not None:
+                self._insert_full_locked(key, image_array)
+        return thumbnail
+
+    def get_thumbnail(self, key) -> np.ndarray | None:
+        with self._lock:
+            return self._thumbnails.get(key)
+
+    def get_full(self, key) -> np.ndarray | None:
+        with self._lock:
+            img = self._full.get(key)
+            if img is not None:
+                self._full.move_to_end(key)
+                return img
+            path = self._paths.get(key) or self._spilled.get(key)
+        if path is None or not os.path.exists(path):
+            return None
+        img = read_image_array(path)
+        with self._lock:
+            if key in self._thumbnails and key not in self._full:
+                self._insert_full_locked(key, img)
+        return img
+
+    def read_full(self, key) -> np.ndarray | None:
+        """Like get_full, but never inserts into or reorders the LRU (bulk reads such as export)."""
+        with self._lock:
+            img = self._full.get(key)
+            if img is not None:
+                return img
+            path = self._paths.get(key) or self._spilled.get(key)
+        if path is None or not os.path.exists(path):
+            return None
+        return read_image_array(path)
+
+    def has_image(self, key) -> bool:
+        with self._lock:
+            return key in self._thumbnails
+
+    def remove(self, key):
+        with self._lock:
+            self._drop_locked(key)
+
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = int(budget_bytes)
+            self._evict_locked()
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            thumbs = sum(t.nbytes for t in self._thumbnails.values())
+            return thumbs + self._full_bytes
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._thumbnails.keys()):
+                self._drop_locked(key)
+            if self._spill_cleanup is not None:
+                self._spill_cleanup()
+                self._spill_cleanup = None
+                self._spill_dir = None
+
+    # --- internals (call with self._lock held) ---
+    def _insert_full_locked(self, key, img: np.ndarray):
+        self._full[key] = img
+        self._full_bytes += img.nbytes
+        self._evict_locked()
+
+    def _evict_locked(self):
+        while self._full and self._full_bytes > self.budget_bytes:
+            key, img = self._full.popitem(last=False)
+            self._full_bytes -= img.nbytes
+            if key not in self._paths and key not in self._spilled:
+                self._spilled[key] = self._spill_locked(key, img)
+
+    def _spill_locked(self, key, img: np.ndarray) -> str:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="open3d_app_images_")
+            self._spill_cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        path = os.path.join(self._spill_dir, f"{key}.npy")
+        np.save(path, img)
+        return path
+
+    def _drop_locked(self, key):
+        self._thumbnails.pop(key, None)
+        self._paths.pop(key, None)
+        img = self._full.pop(key, None)
+        if img is not None:
+            self._full_bytes -= img.nbytes
+        spilled = self._spilled.pop(key, None)
+        if spilled is not None and os.path.exists(spilled):
+            os.remove(spilled)
@@ -0,0 +1,51 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+
+# Serializes the first import behind every lazy proxy (thread pools may touch
+# a proxy from several workers at once).
+_load_lock = threading.Lock()
+
+
+class _LazyModule(ModuleType):
+    """Stand-in for a not-yet-imported module; attribute access imports and forwards to it."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            with _load_lock:
+                module = self.__dict__["_lazy_target"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> ModuleType:
+    """
+    Module object for `name` whose import runs on first attribute access.
+    Lets tools/ modules keep a module-level `o3d = lazy_module("open3d")`
+    while NumPy-only code paths (octree build, PLY parsing, .npy images,
+    --help) never pay for importing Open3D. The first load is guarded by a
+    lock and goes through the regular import system, so concurrent first
+    use from worker threads is safe.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import numpy as np
+
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+EDGE_MODES = ("all", "boundary", "feature")
+
+
+def mesh_edges(
+    triangles: np.ndarray,
+    mode: str = "all",
+    vertices: np.ndarray | None = None,
+    feature_angle_deg: float = 30.0,
+) -> np.ndarray:
+    """
+    Unique undirected edges of a triangle mesh as an (E,2) int32 array.
+
+    mode:
+      "all"      every edge once
+      "boundary" edges used by a single triangle (open borders, holes)
+      "feature"  boundary/non-manifold edges plus edges whose two triangles'
+                 normals differ by more than `feature_angle_deg` (needs `vertices`)
+    """
+    if mode not in EDGE_MODES:
+        raise ValueError(f"Unknown edge mode: {mode}")
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    if len(triangles) == 0:
+        return np.zeros((0, 2), dtype=np.int32)
+
+    # Three half-edges per triangle, in triangle order; sort endpoints so (a,b) == (b,a).
+    half = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    n = int(triangles.max()) + 1
+    keys = half[:, 0] * n + half[:, 1]
+    _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+    edges = half[first]
+    if mode == "all":
+        return edges.astype(np.int32)
+    if mode == "boundary":
+        return edges[counts == 1].astype(np.int32)
+
+    if vertices is None:
+        raise ValueError("Feature edges need the mesh vertices")
+    vertices = np.asarray(vertices, dtype=np.float64)
+    v0, v1, v2 = (vertices[triangles[:, k]] for k in range(3))
+    normals = np.cross(v1 - v0, v2 - v0)
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+
+    # Group half-edges by unique edge; for manifold edges the two entries are the two faces.
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    keep = counts != 2
+    pair = np.flatnonzero(counts == 2)
+    face_a = order[starts[pair]] // 3
+    face_b = order[starts[pair] + 1] // 3
+    cos = np.einsum("nk,nk->n", normals[face_a], normals[face_b])
+    keep[pair] = cos < np.cos(np.deg2rad(feature_angle_deg))
+    return edges[keep].astype(np.int32)
+
+
+def create_edge_lineset(
+    mesh,
+    mode: str = "all",
+    color=(0.0, 0.0, 0.0),
+    feature_angle_deg: float = 30.0,
+):
+    """
+    Edge overlay for `mesh` (see mesh_edges); drop-in for LineSet.create_from_triangle_mesh.
+    A tensor mesh gets a tensor LineSet that shares the mesh's vertex tensor.
+    """
+    if isinstance(mesh, o3d.t.geometry.TriangleMesh):
+        positions = mesh.vertex.positions
+        edges = mesh_edges(
+            mesh.triangle.indices.numpy(),
+            mode=mode,
+            vertices=positions.numpy(),
+            feature_angle_deg=feature_angle_deg,
+        )
+        lineset = o3d.t.geometry.LineSet()
+        lineset.point.positions = positions
+        lineset.line.indices = o3d.core.Tensor.from_numpy(edges)
+        colors = np.empty((len(edges), 3), dtype=np.float32)
+        colors[:] = color
+        lineset.line.colors = o3d.core.Tensor.from_numpy(colors)
+        return lineset
+
+    vertices = np.asarray(mesh.vertices)
+    edges = mesh_edges(np.asarray(mesh.triangles), mode=mode, vertices=vertices, feature_angle_deg=feature_angle_deg)
+    lineset = o3d.geometry.LineSet()
+    lineset.points = o3d.utility.Vector3dVector(vertices)
+    lineset.lines = o3d.utility.Vector2iVector(edges)
+    lineset.paint_uniform_color(list(color))
+    return lineset
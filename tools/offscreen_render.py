@@ -0,0 +1,71 @@
+import os
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import open3d.visualization.rendering as rendering
+
+from tools.camera_math import create_camera_intrinsic_from_size
+from tools.screenshot import save_image_encoded
+
+
+def render_camera_set(
+    geometry_entries: Iterable[tuple[str, Any, Any, bool]],
+    arrays: dict[str, Any],
+    out_dir: str,
+    *,
+    image_encoding: str = "png_fast",
+    background: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0),
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[dict[int, str], list[int]]:
+    """
+    Render every camera of a camera set with `rendering.OffscreenRenderer`,
+    independent of any window or GUI frame loop.
+
+    geometry_entries: (name, geometry, material, is_visible) tuples, i.e.
+        `SceneWidget.iter_geometry_entries()`. Hidden entries are skipped.
+    arrays: camera set arrays from `tools.camera_set_io.load_camera_set_arrays`;
+        each camera is rendered at its own width/height with its own K and extrinsic.
+
+    One renderer is built per distinct resolution (cameras are grouped by size),
+    so the scene is uploaded once per resolution rather than once per camera.
+    Cameras with a non-positive size or a non-finite pose are skipped up front;
+    `progress(done, total)` counts the cameras that render.
+    Returns ({camera id: written image path}, [skipped camera ids]).
+    """
+    entries = [(name, geom, mat) for name, geom, mat, visible in geometry_entries if visible and mat is not None]
+    os.makedirs(out_dir, exist_ok=True)
+
+    sizes = np.stack([np.asarray(arrays["width"]), np.asarray(arrays["height"])], axis=1)
+    extrinsics = np.asarray(arrays["extrinsic"], dtype=np.float64).reshape(-1, 4, 4)
+    renderable = (sizes > 0).all(axis=1) & np.isfinite(extrinsics).all(axis=(1, 2))
+    skipped = [int(i) for i in np.asarray(arrays["ids"])[~renderable]]
+    total = int(renderable.sum())
+    written: dict[int, str] = {}
+    done = 0
+
+    for w, h in np.unique(sizes[renderable], axis=0):
+        w, h = int(w), int(h)
+        renderer = rendering.OffscreenRenderer(w, h)
+        scene = renderer.scene
+        scene.set_background(list(background))
+        scene.set_lighting(scene.LightingProfile.NO_SHADOWS, (0, 0, 0))
+        for name, geometry, material in entries:
+            scene.add_geometry(name, geometry, material)
+
+        for i in np.flatnonzero(renderable & (sizes[:, 0] == w) & (sizes[:, 1] == h)):
+            cam_id = int(arrays["ids"][i])
+            K = np.asarray(arrays["K"][i], dtype=np.float64)
+            if K[2, 2] == 0:
+                K = create_camera_intrinsic_from_size(w, h)
+            renderer.setup_camera(K, extrinsics[i], w, h)
+            image = renderer.render_to_image()
+            written[cam_id] = save_image_encoded(os.path.join(out_dir, f"cam_{cam_id:03d}"), image, image_encoding)
+            done += 1
+            if progress is not None:
+                progress(done, total)
+
+        # Free GPU resources before moving to the next resolution.
+        del scene
+        del renderer
+
+    return written, skipped
@@ -1,15 +1,336 @@
-import open3d as o3d
+from __future__ import annotations
 
+import os
+import threading
+import time
+import tracemalloc
+from typing import Callable
 
-def load_ply_geometry(path: str) -> o3d.geometry.Geometry | None:
+import numpy as np
+
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+# Rows copied out of the memmap per step when loading with progress/cancel.
+LOAD_CHUNK_ROWS = 1 << 20
+
+
+class PlyLoadCancelled(Exception):
+    """Raised by load_ply_geometry when its `cancel` event gets set."""
+
+
+PLY_TYPES = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2",
+    "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4",
+    "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4",
+    "double": "f8", "float64": "f8",
+}
+
+
+def read_ply_header(path: str) -> dict:
+    """
+    Parse only the PLY header.
+
+    Returns {"format", "header_size", "elements": [{"name", "count", "properties"}]}
+    where each property is (name, type) or (name, ("list", count_type, item_type)).
+    """
+    elements: list[dict] = []
+    fmt = None
+    with open(path, "rb") as f:
+        if f.readline().strip() != b"ply":
+            raise ValueError(f"Not a PLY file: {path}")
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"Unterminated PLY header: {path}")
+            tokens = line.decode("ascii", errors="replace").split()
+            if not tokens or tokens[0] in ("comment", "obj_info"):
+                continue
+            if tokens[0] == "end_header":
+                break
+            if tokens[0] == "format":
+                fmt = tokens[1]
+            elif tokens[0] == "element":
+                elements.append({"name": tokens[1], "count": int(tokens[2]), "properties": []})
+            elif tokens[0] == "property" and elements:
+                if tokens[1] == "list":
+                    elements[-1]["properties"].append((tokens[4], ("list", tokens[2], tokens[3])))
+                else:
+                    elements[-1]["properties"].append((tokens[2], tokens[1]))
+        header_size = f.tell()
+    return {"format": fmt, "header_size": header_size, "elements": elements}
+
+
+def _element(header: dict, name: str) -> dict | None:
+    for element in header["elements"]:
+        if element["name"] == name:
+            return element
+    return None
+
+
+def _vector_view(records: np.ndarray, names: tuple[str, ...]) -> np.ndarray | None:
+    """
+    Zero-copy (N, len(names)) view over consecutive same-typed fields of a
+    structured (memmapped) array, or None if the fields aren't laid out that way.
+    """
+    fields = records.dtype.fields
+    if not all(n in fields for n in names):
+        return None
+    dtypes = {fields[n][0] for n in names}
+    if len(dtypes) != 1:
+        return None
+    item = dtypes.pop()
+    offsets = [fields[n][1] for n in names]
+    if offsets != [offsets[0] + k * item.itemsize for k in range(len(names))]:
+        return None
+    return np.ndarray(
+        shape=(len(records), len(names)),
+        dtype=item,
+        buffer=records,
+        offset=offsets[0],
+        strides=(records.dtype.itemsize, item.itemsize),
+    )
+
+
+def read_ply_arrays(path: str, header: dict | None = None) -> dict | None:
+    """
+    Memory-map a binary little-endian PLY into NumPy views (no copies):
+      points (N,3), optional colors (N,3), normals (N,3), triangles (M,3).
+
+    Returns None when the file can't be mapped directly (ASCII/big-endian,
+    non-vertex elements before the data, or non-triangle faces); callers then
+    fall back to Open3D's reader.
+    """
+    if header is None:
+        header = read_ply_header(path)
+    if header["format"] != "binary_little_endian":
+        return None
+
+    offset = header["header_size"]
+    vertex_records = None
+    face_records = None
+    for element in header["elements"]:
+        props = element["properties"]
+        if element["name"] == "vertex":
+            if any(isinstance(t, tuple) for _, t in props):
+                return None
+            dtype = np.dtype([(n, "<" + PLY_TYPES[t]) for n, t in props])
+            vertex_records = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(element["count"],))
+            offset += dtype.itemsize * element["count"]
+        elif element["name"] == "face" and element["count"] > 0:
+            if len(props) != 1 or not isinstance(props[0][1], tuple):
+                return None
+            _, count_type, item_type = props[0][1]
+            # Fixed-size records only when every face is a triangle (checked below).
+            dtype = np.dtype([("n", "<" + PLY_TYPES[count_type]), ("v", "<" + PLY_TYPES[item_type], (3,))])
+            if offset + dtype.itemsize * element["count"] > os.path.getsize(path):
+                return None
+            face_records = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(element["count"],))
+            if not np.all(face_records["n"] == 3):
+                return None
+            offset += dtype.itemsize * element["count"]
+        elif element["count"] > 0:
+            # Unknown element before/among the data blocks: size can't be trusted.
+            return None
+
+    if vertex_records is None:
+        return None
+    points = _vector_view(vertex_records, ("x", "y", "z"))
+    if points is None:
+        return None
+    return {
+        "points": points,
+        "colors": _vector_view(vertex_records, ("red", "green", "blue")),
+        "normals": _vector_view(vertex_records, ("nx", "ny", "nz")),
+        "triangles": face_records["v"] if face_records is not None else None,
+    }
+
+
+def _colors_to_float(colors: np.ndarray, dtype=np.float64) -> np.ndarray:
+    if colors.dtype.kind == "f":
+        return np.ascontiguousarray(colors, dtype=dtype)
+    out = colors.astype(dtype)
+    out *= dtype(1.0 / np.iinfo(colors.dtype).max)
+    return out
+
+
+def _geometry_from_arrays(arrays: dict) -> o3d.geometry.Geometry:
+    # Legacy Vector3dVector needs float64; this astype is the only NumPy-side copy.
+    points = np.asarray(arrays["points"], dtype=np.float64)
+    if arrays["triangles"] is not None:
+        mesh = o3d.geometry.TriangleMesh()
+        mesh.vertices = o3d.utility.Vector3dVector(points)
+        mesh.triangles = o3d.utility.Vector3iVector(np.asarray(arrays["triangles"], dtype=np.int32))
+        if arrays["colors"] is not None:
+            mesh.vertex_colors = o3d.utility.Vector3dVector(_colors_to_float(arrays["colors"]))
+        if arrays["normals"] is not None:
+            mesh.vertex_normals = o3d.utility.Vector3dVector(np.asarray(arrays["normals"], dtype=np.float64))
+        return mesh
+    pcd = o3d.geometry.PointCloud()
+    pcd.points = o3d.utility.Vector3dVector(points)
+    if arrays["colors"] is not None:
+        pcd.colors = o3d.utility.Vector3dVector(_colors_to_float(arrays["colors"]))
+    if arrays["normals"] is not None:
+        pcd.normals = o3d.utility.Vector3dVector(np.asarray(arrays["normals"], dtype=np.float64))
+    return pcd
+
+
+def _read_rows(
+    src: np.ndarray,
+    dtype,
+    convert=None,
+    step: Callable[[int], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> np.ndarray:
+    """
+    Contiguous `dtype` copy of a memmapped (N,k) view, LOAD_CHUNK_ROWS rows at
+    a time so a multi-GB read can report progress and be cancelled in between.
+    `convert(chunk, dtype)` overrides the plain cast (e.g. color scaling).
+    """
+    out = np.empty(src.shape, dtype=dtype)
+    for start in range(0, len(src), LOAD_CHUNK_ROWS):
+        if cancel is not None and cancel.is_set():
+            raise PlyLoadCancelled()
+        end = min(start + LOAD_CHUNK_ROWS, len(src))
+        out[start:end] = src[start:end] if convert is None else convert(src[start:end], dtype)
+        if step is not None:
+            step(end - start)
+    return out
+
+
+def _tensor_geometry_from_arrays(
+    arrays: dict,
+    progress: Callable[[float], None] | None = None,
+    cancel: threading.Event | None = None,
+):
+    """
+    Tensor geometry from mapped arrays, kept in float32. Each attribute is
+    read out of the memmap once into a contiguous array and wrapped with
+    Tensor.from_numpy (no further copies, no float64).
+    `progress(fraction)` follows the rows read over all attributes.
+    """
+    sources = [arrays[k] for k in ("points", "triangles", "colors", "normals") if arrays[k] is not None]
+    total = max(1, sum(len(a) for a in sources))
+    read = {"rows": 0}
+
+    def step(rows: int):
+        read["rows"] += rows
+        if progress is not None:
+            progress(read["rows"] / total)
+
+    def rows(src, dtype, convert=None):
+        return o3d.core.Tensor.from_numpy(_read_rows(src, dtype, convert, step, cancel))
+
+    points = rows(arrays["points"], np.float32)
+    if arrays["triangles"] is not None:
+        geom = o3d.t.geometry.TriangleMesh()
+        attrs = geom.vertex
+        attrs.positions = points
+        geom.triangle.indices = rows(arrays["triangles"], np.int32)
+    else:
+        geom = o3d.t.geometry.PointCloud(points)
+        attrs = geom.point
+    if arrays["colors"] is not None:
+        attrs.colors = rows(arrays["colors"], np.float32, _colors_to_float)
+    if arrays["normals"] is not None:
+        attrs.normals = rows(arrays["normals"], np.float32)
+    return geom
+
+
+def _finish_geometry(geom) -> o3d.geometry.Geometry | None:
+    if isinstance(geom, o3d.t.geometry.TriangleMesh):
+        if geom.triangle.indices.shape[0] == 0:
+            return None
+        if not geom.vertex.contains("normals"):
+            geom.compute_vertex_normals()
+        return geom
+    if isinstance(geom, o3d.t.geometry.PointCloud):
+        if geom.point.positions.shape[0] == 0:
+            return None
+        if not geom.point.contains("colors"):
+            geom.paint_uniform_color([0.8, 0.8, 0.8])
+        return geom
+    if isinstance(geom, o3d.geometry.TriangleMesh):
+        if not geom.has_triangles():
+            return None
+        if not geom.has_vertex_normals():
+            geom.compute_vertex_normals()
+        return geom
+    if isinstance(geom, o3d.geometry.PointCloud):
+        if not geom.has_points():
+            return None
+        # Ensure it's visible even if the file has no colors.
+        if not geom.has_colors():
+            geom.paint_uniform_color([0.8, 0.8, 0.8])
+        return geom
+    return None
+
+
+def load_ply_geometry(
+    path: str,
+    tensor: bool = False,
+    progress: Callable[[str, float], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> o3d.geometry.Geometry | None:
     """
     Load a .ply file as either a PointCloud or TriangleMesh.
 
+    The header is read once to decide mesh vs point cloud, so the file is
+    parsed a single time. Binary little-endian files are memory-mapped
+    straight into NumPy (see read_ply_arrays); other encodings use Open3D's reader.
+
+    With tensor=True the result is an o3d.t.geometry PointCloud/TriangleMesh
+    with float32 attributes (see _tensor_geometry_from_arrays).
+
+    `progress(stage, fraction)` reports "reading" (rows copied out of the
+    memmap on the tensor path; Open3D's reader only reports start/end) and
+    "finishing" (e.g. vertex normals). Setting `cancel` makes the tensor path
+    raise PlyLoadCancelled between chunks.
+
+    Read errors (missing file, bad header, truncated data) propagate so
+    callers can show them.
+
     Returns:
-        o3d.geometry.PointCloud | o3d.geometry.TriangleMesh | None
+        o3d.geometry.PointCloud | o3d.geometry.TriangleMesh
+        | o3d.t.geometry.PointCloud | o3d.t.geometry.TriangleMesh
+        | None (the file holds no points / faces)
     """
-    # PLY can be either a point cloud or a triangle mesh.
-    # Prefer mesh when faces/triangles exist, otherwise fall back to point cloud.
+    header = read_ply_header(path)
+
+    face = _element(header, "face")
+    is_mesh = face is not None and face["count"] > 0
+
+    def report(stage: str, fraction: float):
+        if progress is not None:
+            progress(stage, fraction)
+
+    report("reading", 0.0)
+    arrays = read_ply_arrays(path, header)
+    if arrays is not None:
+        if tensor:
+            geom = _tensor_geometry_from_arrays(arrays, lambda f: report("reading", f), cancel)
+        else:
+            geom = _geometry_from_arrays(arrays)
+    else:
+        io = o3d.t.io if tensor else o3d.io
+        geom = io.read_triangle_mesh(path) if is_mesh else io.read_point_cloud(path)
+    report("reading", 1.0)
+    if cancel is not None and cancel.is_set():
+        raise PlyLoadCancelled()
+    report("finishing", 0.0)
+    geom = _finish_geometry(geom)
+    report("finishing", 1.0)
+    return geom
+
+
+def load_ply_geometry_legacy(path: str) -> o3d.geometry.Geometry | None:
+    """Previous two-pass loader (mesh attempt, then point cloud). Kept for comparison."""
     try:
         mesh = o3d.io.read_triangle_mesh(path)
         if mesh is not None and mesh.has_triangles():
@@ -22,7 +343,6 @@ def load_ply_geometry(path: str) -> o3d.geometry.Geometry | None:
     try:
         pcd = o3d.io.read_point_cloud(path)
         if pcd is not None and pcd.has_points():
-            # Ensure it's visible even if the file has no colors.
             if not pcd.has_colors():
                 pcd.paint_uniform_color([0.8, 0.8, 0.8])
             return pcd
@@ -31,3 +351,94 @@ def load_ply_geometry(path: str) -> o3d.geometry.Geometry | None:
 
     return None
 
+
+def current_rss_bytes() -> int | None:
+    """Resident set size of this process in bytes, or None where it can't be read (non-Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        # ru_maxrss is no substitute: it is a lifetime peak, so differences of it
+        # mostly read as zero growth.
+        return None
+
+
+def geometry_counts(geom) -> tuple[int, int]:
+    """(points/vertices, triangles) of a legacy or tensor PointCloud/TriangleMesh."""
+    if isinstance(geom, o3d.geometry.TriangleMesh):
+        return len(geom.vertices), len(geom.triangles)
+    if isinstance(geom, o3d.geometry.PointCloud):
+        return len(geom.points), 0
+    if isinstance(geom, o3d.t.geometry.TriangleMesh):
+        return geom.vertex.positions.shape[0], geom.triangle.indices.shape[0]
+    if isinstance(geom, o3d.t.geometry.PointCloud):
+        return geom.point.positions.shape[0], 0
+    return 0, 0
+
+
+def measure_ply_load(
+    path: str, method: str = "auto", numpy_peak: bool = True
+) -> tuple[o3d.geometry.Geometry | None, dict]:
+    """
+    Load `path` with `method` ("auto" = load_ply_geometry, "tensor" =
+    load_ply_geometry(tensor=True), "legacy" = load_ply_geometry_legacy)
+    and report wall time and peak memory.
+
+    The timed load runs with tracemalloc off. peak_rss_mb is sampled from the
+    process RSS every 5 ms during it (includes Open3D's C++ allocations and
+    page-cache-backed memmaps; None where the current RSS can't be read).
+    numpy_peak_mb (Python/NumPy allocations only) comes from a second,
+    traced load; pass numpy_peak=False to skip it (then None).
+    """
+    loader = {
+        "auto": load_ply_geometry,
+        "tensor": lambda p: load_ply_geometry(p, tensor=True),
+        "legacy": load_ply_geometry_legacy,
+    }[method]
+
+    baseline = current_rss_bytes()
+    peak = {"rss": baseline}
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            peak["rss"] = max(peak["rss"], current_rss_bytes())
+            stop.wait(0.005)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    if baseline is not None:
+        sampler.start()
+    t0 = time.perf_counter()
+    try:
+        geom = loader(path)
+    finally:
+        seconds = time.perf_counter() - t0
+        stop.set()
+        if sampler.is_alive():
+            sampler.join()
+    peak_rss_mb = None
+    if baseline is not None:
+        peak_rss_mb = (max(peak["rss"], current_rss_bytes()) - baseline) / (1024 * 1024)
+
+    numpy_peak_mb = None
+    if numpy_peak:
+        tracemalloc.start()
+        try:
+            loader(path)
+        finally:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        numpy_peak_mb = traced_peak / (1024 * 1024)
+
+    points, triangles = geometry_counts(geom)
+    stats = {
+        "path": os.path.abspath(path),
+        "method": method,
+        "seconds": seconds,
+        "peak_rss_mb": peak_rss_mb,
+        "numpy_peak_mb": numpy_peak_mb,
+        "type": type(geom).__name__ if geom is not None else None,
+        "points": points,
+        "triangles": triangles,
+    }
+    return geom, stats
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import Callable, Iterator
+
+import numpy as np
+
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+POINT_DISTRIBUTIONS = ("uniform", "sphere", "blobs", "grid")
+BLOB_COUNT = 8
+
+
+def _chunk_points(
+    distribution: str,
+    start: int,
+    n: int,
+    count: int,
+    size: float,
+    seed: int,
+    chunk_index: int,
+) -> np.ndarray:
+    half = np.float32(size / 2)
+    # One generator per chunk: output depends only on (seed, chunk), not on chunk order.
+    rng = np.random.default_rng([seed, chunk_index])
+    if distribution == "uniform":
+        points = rng.random((n, 3), dtype=np.float32)
+        points *= np.float32(size)
+        points -= half
+        return points
+    if distribution == "sphere":
+        points = rng.standard_normal((n, 3), dtype=np.float32)
+        points /= np.maximum(np.linalg.norm(points, axis=1, keepdims=True), np.float32(1e-12))
+        points *= half
+        return points
+    if distribution == "blobs":
+        # Blob layout comes from the seed alone so every chunk agrees on it.
+        layout = np.random.default_rng(seed)
+        centers = layout.uniform(-0.35 * size, 0.35 * size, (BLOB_COUNT, 3)).astype(np.float32)
+        sigmas = layout.uniform(0.02 * size, 0.08 * size, BLOB_COUNT).astype(np.float32)
+        which = rng.integers(0, BLOB_COUNT, n)
+        points = rng.standard_normal((n, 3), dtype=np.float32)
+        points *= sigmas[which, None]
+        points += centers[which]
+        np.clip(points, -half, half, out=points)
+        return points
+    if distribution == "grid":
+        # Regular lattice filled in x-major order; `count` fixes the lattice side.
+        side = int(np.ceil(np.cbrt(count)))
+        step = np.float32(size / max(side - 1, 1))
+        i = np.arange(start, start + n, dtype=np.int64)
+        ijk = np.stack([i // (side * side), (i // side) % side, i % side], axis=1).astype(np.float32)
+        return ijk * step - half
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def iter_point_chunks(
+    count: int,
+    size: float = 1.0,
+    distribution: str = "uniform",
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield (start, float32 (n,3) points) chunks covering `count` points inside a cube of edge `size`."""
+    for chunk_index, start in enumerate(range(0, int(count), int(chunk_size))):
+        n = min(int(chunk_size), int(count) - start)
+        yield start, _chunk_points(distribution, start, n, int(count), float(size), int(seed), chunk_index)
+
+
+def generate_point_arrays(
+    count: int,
+    size: float = 1.0,
+    distribution: str = "uniform",
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    float32 (count,3) positions and colors, filled chunk by chunk into
+    preallocated arrays (peak extra memory is one chunk, not a full copy).
+    Colors map position to RGB over the fixed cube bounds, so no second pass is needed.
+    """
+    count = int(count)
+    positions = np.empty((count, 3), dtype=np.float32)
+    colors = np.empty((count, 3), dtype=np.float32)
+    half = np.float32(size / 2)
+    scale = np.float32(1.0 / max(size, 1e-8))
+    for start, chunk in iter_point_chunks(count, size, distribution, seed, chunk_size):
+        end = start + len(chunk)
+        positions[start:end] = chunk
+        out = colors[start:end]
+        np.add(chunk, half, out=out)
+        out *= scale
+        np.clip(out, 0.0, 1.0, out=out)
+        if progress is not None:
+            progress(end, count)
+    return positions, colors
+
+
+def generate_point_cloud(
+    count: int,
+    size: float = 1.0,
+    distribution: str = "uniform",
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+    progress: Callable[[int, int], None] | None = None,
+) -> o3d.t.geometry.PointCloud:
+    """
+    Tensor point cloud of `count` generated points. The NumPy buffers are
+    wrapped with Tensor.from_numpy (zero copy), so the only full-size arrays
+    are the ones the generator fills.
+    """
+    positions, colors = generate_point_arrays(count, size, distribution, seed, chunk_size, progress)
+    pcd = o3d.t.geometry.PointCloud(o3d.core.Tensor.from_numpy(positions))
+    pcd.point.colors = o3d.core.Tensor.from_numpy(colors)
+    return pcd
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+def point_count(pcd) -> int:
+    """Number of points of a legacy or tensor PointCloud."""
+    if isinstance(pcd, o3d.t.geometry.PointCloud):
+        return pcd.point.positions.shape[0]
+    return len(pcd.points)
+
+
+def bounds_center_extent(geometry) -> tuple[np.ndarray, np.ndarray]:
+    """(center, extent) of a legacy or tensor geometry's axis-aligned bounds, as NumPy."""
+    bbox = geometry.get_axis_aligned_bounding_box()
+    if isinstance(bbox, o3d.t.geometry.AxisAlignedBoundingBox):
+        bbox = bbox.to_legacy()
+    return np.asarray(bbox.get_center()), np.asarray(bbox.get_extent())
+
+
+def build_lod_pyramid(
+    pcd,
+    min_points: int = 100_000,
+    max_levels: int = 8,
+) -> list:
+    """
+    Voxel-downsampled levels of detail, finest first: [pcd, coarser, ..., coarsest].
+    Each level is downsampled from the previous one and roughly quarters the
+    point count; stops at `min_points`.
+    Works on legacy and tensor point clouds (levels keep the input's type).
+    """
+    levels = [pcd]
+    count = point_count(pcd)
+    if count <= min_points:
+        return levels
+    extent = float(np.max(bounds_center_extent(pcd)[1]))
+    if extent <= 0:
+        return levels
+    # Start at roughly the mean point spacing of a uniformly filled bbox.
+    voxel = extent / np.cbrt(count)
+    while count > min_points and len(levels) < max_levels:
+        voxel *= 1.6
+        # Downsample the previous level, not the full cloud: each pass (and each
+        # retry) only touches the points that are left.
+        down = levels[-1].voxel_down_sample(voxel)
+        down_count = point_count(down)
+        if down_count > 0.5 * count:
+            # Too little reduction at this voxel size (clustered data); grow further.
+            continue
+        levels.append(down)
+        count = down_count
+    return levels
+
+
+def select_lod_level(
+    level_counts: list[int],
+    camera_distance: float,
+    extent: float,
+    point_budget: int,
+    moving: bool,
+    moving_budget_scale: float = 0.25,
+) -> int:
+    """
+    Pick the finest level whose point count fits the budget.
+
+    The budget scales with (extent / distance)^2: far away the cloud covers
+    few pixels and a coarse level looks the same; close up only part of it is
+    on screen so more points are affordable. While the camera moves the budget
+    is cut to `moving_budget_scale` to keep interaction smooth.
+    """
+    budget = float(point_budget)
+    if camera_distance > 0 and extent > 0:
+        budget *= float(np.clip((extent / camera_distance) ** 2, 0.1, 4.0))
+    if moving:
+        budget *= moving_budget_scale
+    for level, count in enumerate(level_counts):
+        if count <= budget:
+            return level
+    return len(level_counts) - 1
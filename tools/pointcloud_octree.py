@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable
+
+import numpy as np
+
+from tools.camera_math import aabbs_in_frustum
+from tools.ply_io import read_ply_arrays
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+OCTREE_MANIFEST = "octree.json"
+# Resident chunks are tensor clouds with float32 xyz + rgb: 24 bytes/point in RAM (GPU copy not counted).
+BYTES_PER_POINT = 24
+
+
+def _choose_depth(point_count: int, chunk_points: int, max_depth: int) -> int:
+    depth = 0
+    while depth < max_depth and point_count / (8 ** depth) > chunk_points:
+        depth += 1
+    return depth
+
+
+def build_point_octree(
+    ply_path: str,
+    out_dir: str,
+    *,
+    chunk_points: int = 1_000_000,
+    max_depth: int = 6,
+    slice_points: int = 4_000_000,
+    progress: Callable[[str, float], None] | None = None,
+) -> str:
+    """
+    Split a binary little-endian PLY point cloud into the leaf cells of an
+    octree and write each non-empty cell as its own chunk:
+
+      out_dir/
+        octree.json                 manifest: bounds, depth, per-chunk count + tight AABB
+        chunks/<x>_<y>_<z>.npy      float32 (n,3) positions
+        chunks/<x>_<y>_<z>_rgb.npy  uint8 (n,3) colors (when the PLY has colors)
+
+    The input is memory-mapped and processed `slice_points` at a time, so the
+    cloud never has to fit in RAM. Depth is picked so an average leaf holds
+    about `chunk_points` points. Returns the manifest path.
+    """
+    arrays = read_ply_arrays(ply_path)
+    if arrays is None or arrays["triangles"] is not None:
+        raise ValueError("Out-of-core preprocessing needs a binary little-endian PLY point cloud")
+    points = arrays["points"]
+    colors = arrays["colors"]
+    total = len(points)
+    if total == 0:
+        raise ValueError(f"No points in {ply_path}")
+
+    def report(stage: str, fraction: float):
+        if progress is not None:
+            progress(stage, fraction)
+
+    slices = [(s, min(s + slice_points, total)) for s in range(0, total, slice_points)]
+
+    # Pass 1: bounds.
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    for k, (s, e) in enumerate(slices):
+        block = np.asarray(points[s:e], dtype=np.float64)
+        lo = np.minimum(lo, block.min(axis=0))
+        hi = np.maximum(hi, block.max(axis=0))
+        report("bounds", (k + 1) / len(slices))
+
+    depth = _choose_depth(total, chunk_points, max_depth)
+    res = 1 << depth
+    size = np.maximum(hi - lo, 1e-9)
+
+    def cell_ids(block: np.ndarray) -> np.ndarray:
+        ijk = np.clip(((block - lo) / size * res).astype(np.int64), 0, res - 1)
+        return (ijk[:, 0] * res + ijk[:, 1]) * res + ijk[:, 2]
+
+    # Pass 2: per-cell counts.
+    counts = np.zeros(res ** 3, dtype=np.int64)
+    for k, (s, e) in enumerate(slices):
+        counts += np.bincount(cell_ids(np.asarray(points[s:e], dtype=np.float64)), minlength=res ** 3)
+        report("count", (k + 1) / len(slices))
+
+    chunks_dir = os.path.join(out_dir, "chunks")
+    os.makedirs(chunks_dir, exist_ok=True)
+    occupied = np.flatnonzero(counts)
+    # cell -> (path stem, rgb data offset, xyz data offset, rows written so far)
+    chunk_files: dict[int, tuple[str, int | None, int, int]] = {}
+    for cell in occupied:
+        x, y, z = cell // (res * res), (cell // res) % res, cell % res
+        stem = os.path.join(chunks_dir, f"{x}_{y}_{z}")
+        # Pre-size each chunk file; later slices write into it by offset.
+        mm = np.lib.format.open_memmap(stem + ".npy", mode="w+", dtype=np.float32, shape=(int(counts[cell]), 3))
+        xyz_offset = mm.offset
+        del mm
+        rgb_offset = None
+        if colors is not None:
+            mm = np.lib.format.open_memmap(stem + "_rgb.npy", mode="w+", dtype=np.uint8, shape=(int(counts[cell]), 3))
+            rgb_offset = mm.offset
+            del mm
+        chunk_files[int(cell)] = (stem, rgb_offset, xyz_offset, 0)
+
+    # Pass 3: scatter each slice into its cells (sorted so every cell gets one contiguous write).
+    cell_min = np.full((res ** 3, 3), np.inf)
+    cell_max = np.full((res ** 3, 3), -np.inf)
+    for k, (s, e) in enumerate(slices):
+        block = np.asarray(points[s:e], dtype=np.float64)
+        ids = cell_ids(block)
+        order = np.argsort(ids, kind="stable")
+        ids_sorted = ids[order]
+        block = block[order]
+        block_rgb = None
+        if colors is not None:
+            block_rgb = np.asarray(colors[s:e])[order]
+            if block_rgb.dtype != np.uint8:
+                scale = 255.0 if block_rgb.dtype.kind == "f" else 255.0 / np.iinfo(block_rgb.dtype).max
+                block_rgb = np.clip(block_rgb * scale, 0, 255).astype(np.uint8)
+        cells, starts = np.unique(ids_sorted, return_index=True)
+        ends = np.append(starts[1:], len(ids_sorted))
+        np.minimum.at(cell_min, cells, np.minimum.reduceat(block, starts, axis=0))
+        np.maximum.at(cell_max, cells, np.maximum.reduceat(block, starts, axis=0))
+        for cell, a, b in zip(cells, starts, ends):
+            stem, rgb_offset, xyz_offset, cursor = chunk_files[int(cell)]
+            with open(stem + ".npy", "r+b") as f:
+                f.seek(xyz_offset + cursor * 12)
+                f.write(block[a:b].astype(np.float32).tobytes())
+            if block_rgb is not None:
+                with open(stem + "_rgb.npy", "r+b") as f:
+                    f.seek(rgb_offset + cursor * 3)
+                    f.write(block_rgb[a:b].tobytes())
+            chunk_files[int(cell)] = (stem, rgb_offset, xyz_offset, cursor + (b - a))
+        report("write", (k + 1) / len(slices))
+
+    chunks = []
+    for cell in occupied:
+        stem = chunk_files[int(cell)][0]
+        chunks.append({
+            "id": os.path.basename(stem),
+            "file": os.path.relpath(stem + ".npy", out_dir),
+            "colors_file": os.path.relpath(stem + "_rgb.npy", out_dir) if colors is not None else None,
+            "count": int(counts[cell]),
+            "min": cell_min[cell].tolist(),
+            "max": cell_max[cell].tolist(),
+        })
+
+    manifest = {
+        "version": 1,
+        "source": os.path.abspath(ply_path),
+        "point_count": int(total),
+        "depth": depth,
+        "bounds_min": lo.tolist(),
+        "bounds_max": hi.tolist(),
+        "chunks": chunks,
+    }
+    manifest_path = os.path.join(out_dir, OCTREE_MANIFEST)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+def load_point_octree(manifest_path: str) -> dict[str, Any]:
+    """Read an octree manifest; adds base_dir and stacked chunk AABBs/counts for culling."""
+    abs_path = os.path.abspath(manifest_path)
+    with open(abs_path, "r") as f:
+        manifest = json.load(f)
+    chunks = manifest["chunks"]
+    manifest["base_dir"] = os.path.dirname(abs_path)
+    manifest["chunk_mins"] = np.array([c["min"] for c in chunks], dtype=np.float64).reshape(-1, 3)
+    manifest["chunk_maxs"] = np.array([c["max"] for c in chunks], dtype=np.float64).reshape(-1, 3)
+    manifest["chunk_counts"] = np.array([c["count"] for c in chunks], dtype=np.int64)
+    return manifest
+
+
+def load_chunk_point_cloud(manifest: dict[str, Any], chunk_index: int) -> o3d.t.geometry.PointCloud:
+    """Tensor cloud of one chunk; the float32 positions are wrapped as loaded (no copy)."""
+    chunk = manifest["chunks"][chunk_index]
+    base_dir = manifest["base_dir"]
+    points = np.load(os.path.join(base_dir, chunk["file"]))
+    pcd = o3d.t.geometry.PointCloud(o3d.core.Tensor.from_numpy(points))
+    if chunk.get("colors_file"):
+        rgb = np.load(os.path.join(base_dir, chunk["colors_file"]))
+        colors = rgb.astype(np.float32)
+        colors *= np.float32(1.0 / 255.0)
+        pcd.point.colors = o3d.core.Tensor.from_numpy(colors)
+    else:
+        pcd.paint_uniform_color([0.8, 0.8, 0.8])
+    return pcd
+
+
+def select_chunks(
+    manifest: dict[str, Any],
+    planes: np.ndarray,
+    camera_position: np.ndarray,
+    budget_points: int,
+) -> list[int]:
+    """
+    Chunk indices to keep resident: those intersecting the frustum `planes`,
+    nearest first, until `budget_points` is used up.
+    """
+    mins = manifest["chunk_mins"]
+    maxs = manifest["chunk_maxs"]
+    visible = np.flatnonzero(aabbs_in_frustum(planes, mins, maxs))
+    if len(visible) == 0:
+        return []
+    # Distance from the camera to each box (0 when inside).
+    closest = np.clip(camera_position[None, :], mins[visible], maxs[visible])
+    order = visible[np.argsort(np.linalg.norm(closest - camera_position[None, :], axis=1))]
+    within = np.cumsum(manifest["chunk_counts"][order]) <= budget_points
+    # Always keep the nearest chunk, even if it alone exceeds the budget.
+    within[0] = True
+    return order[within].tolist()
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+from typing import Any
+
+import numpy as np
+
+from tools.screenshot import ImageWriterQueue
+
+
+def look_at_c2w(eyes, targets, up=(0.0, 1.0, 0.0)) -> np.ndarray:
+    """
+    (N,4,4) camera-to-world matrices in the Open3D GUI convention (camera looks
+    down its local -Z, +Y up) for cameras at `eyes` looking at `targets`.
+    """
+    eyes = np.asarray(eyes, dtype=np.float64).reshape(-1, 3)
+    targets = np.broadcast_to(np.asarray(targets, dtype=np.float64), eyes.shape)
+    up = np.asarray(up, dtype=np.float64)
+    z = eyes - targets
+    z /= np.maximum(np.linalg.norm(z, axis=1, keepdims=True), 1e-12)
+    x = np.cross(up, z)
+    # Looking straight along `up`: any horizontal axis will do.
+    degenerate = np.linalg.norm(x, axis=1) < 1e-9
+    x[degenerate] = np.cross([1.0, 0.0, 0.0] if abs(up[0]) < 0.9 else [0.0, 0.0, 1.0], up)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    y = np.cross(z, x)
+    c2w = np.tile(np.eye(4), (len(eyes), 1, 1))
+    c2w[:, :3, 0] = x
+    c2w[:, :3, 1] = y
+    c2w[:, :3, 2] = z
+    c2w[:, :3, 3] = eyes
+    return c2w
+
+
+def turntable_poses(center, eye, frames: int, up=(0.0, 1.0, 0.0), turns: float = 1.0) -> np.ndarray:
+    """
+    (frames,4,4) poses orbiting `center` about the `up` axis, starting at `eye`
+    and always looking at `center` (the last frame stops one step short of
+    the start so the sequence loops cleanly).
+    """
+    center = np.asarray(center, dtype=np.float64)
+    up = np.asarray(up, dtype=np.float64)
+    up = up / np.linalg.norm(up)
+    offset = np.asarray(eye, dtype=np.float64) - center
+    along = np.dot(offset, up) * up
+    radial = offset - along
+    side = np.cross(up, radial)
+    theta = 2.0 * np.pi * float(turns) * np.arange(int(frames)) / max(int(frames), 1)
+    eyes = center + along + np.cos(theta)[:, None] * radial + np.sin(theta)[:, None] * side
+    return look_at_c2w(eyes, center, up)
+
+
+class FrameRecorder:
+    """
+    Bookkeeping for a frame-sequence recording: hands frames to an
+    ImageWriterQueue and tracks dropped and late frames.
+
+    `add_frame` never blocks by default: a frame that doesn't fit in the
+    writer queue is dropped and counted, so capture from the GUI thread never
+    stalls. Headless callers can pass `max_wait` > 0 to wait that many seconds
+    for room first. A frame is late when it arrives more than `late_factor`
+    frame intervals (at `target_fps`) after the previous one.
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        poses: np.ndarray,
+        *,
+        encoding: str = "png_fast",
+        target_fps: float = 30.0,
+        workers: int | None = None,
+        max_pending: int = 32,
+        max_wait: float = 0.0,
+        late_factor: float = 1.5,
+    ):
+        self.out_dir = os.path.abspath(out_dir)
+        self.poses = np.asarray(poses, dtype=np.float64).reshape(-1, 4, 4)
+        self.encoding = encoding
+        self.target_fps = float(target_fps)
+        self.max_wait = float(max_wait)
+        self.late_factor = float(late_factor)
+        self.writer = ImageWriterQueue(max_pending=max_pending, workers=workers or min(8, os.cpu_count() or 1))
+        self.next_frame = 0
+        self.dropped: list[int] = []
+        self.late: list[int] = []
+        self._last_frame_time: float | None = None
+        self._start_time: float | None = None
+        self._end_time: float | None = None
+
+    def __len__(self) -> int:
+        return len(self.poses)
+
+    def done(self) -> bool:
+        return self.next_frame >= len(self.poses)
+
+    def next_pose(self) -> np.ndarray:
+        return self.poses[self.next_frame]
+
+    def add_frame(self, image) -> bool:
+        """Queue the image of the current pose and advance; False if the frame was dropped."""
+        now = time.perf_counter()
+        index = self.next_frame
+        if self._start_time is None:
+            self._start_time = now
+        elif now - self._last_frame_time > self.late_factor / self.target_fps:
+            self.late.append(index)
+        self._last_frame_time = now
+        self.next_frame += 1
+        stem = os.path.join(self.out_dir, f"frame_{index:06d}")
+        queued = self.writer.submit(stem, image, self.encoding, block=self.max_wait > 0, timeout=self.max_wait or None)
+        if not queued:
+            self.dropped.append(index)
+        if self.done():
+            self._end_time = time.perf_counter()
+        return queued
+
+    def capture_fps(self) -> float:
+        captured = self.next_frame
+        if self._start_time is None or captured < 2:
+            return 0.0
+        end = self._end_time if self._end_time is not None else self._last_frame_time
+        return (captured - 1) / max(end - self._start_time, 1e-9)
+
+    def status(self) -> str:
+        stats = self.writer.stats()
+        return (
+            f"Frame {self.next_frame}/{len(self.poses)}  {self.capture_fps():.1f} fps  "
+            f"{stats['pending']} pending  {len(self.dropped)} dropped  {len(self.late)} late"
+        )
+
+    def finish(self, timeout: float | None = None) -> dict[str, Any]:
+        """
+        Write the queued frames and stop the writer threads, then write
+        `recording.json` next to the frames and return its report.
+        """
+        self.writer.close(timeout)
+        stats = self.writer.stats()
+        report = {
+            "frames": len(self.poses),
+            "captured": self.next_frame,
+            "written": stats["written"],
+            "failed": stats["failed"],
+            "dropped": self.dropped,
+            "late": self.late,
+            "target_fps": self.target_fps,
+            "capture_fps": self.capture_fps(),
+            "encoding": self.encoding,
+            "poses": self.poses[:self.next_frame].tolist(),
+        }
+        os.makedirs(self.out_dir, exist_ok=True)
+        with open(os.path.join(self.out_dir, "recording.json"), "w") as f:
+            json.dump(report, f, indent=2)
+        return report
@@ -1,6 +1,142 @@
-import open3d as o3d
+from __future__ import annotations
 
+import os
+import queue
+import threading
+import time
 
-def save_image(path, image):
-    quality = 9 if path.endswith(".png") else 100
+import numpy as np
+
+from tools.tracing import traced
+from tools.lazy_import import lazy_module
+
+o3d = lazy_module("open3d")
+
+
+# name -> (file extension, write_image quality). For PNG the quality is the zlib
+# level (1 = fast, 9 = smallest); for JPEG it is 0-100. "npy" skips encoding.
+IMAGE_ENCODINGS = {
+    "png_small": (".png", 9),
+    "png_fast": (".png", 1),
+    "jpeg": (".jpg", 90),
+    "npy": (".npy", None),
+}
+
+
+def image_extension(encoding: str) -> str:
+    return IMAGE_ENCODINGS[encoding][0]
+
+
+@traced("image.encode")
+def save_image(path, image, quality=None):
+    if path.endswith(".npy"):
+        np.save(path, np.asarray(image))
+        return
+    if isinstance(image, np.ndarray):
+        image = o3d.geometry.Image(np.ascontiguousarray(image))
+    if quality is None:
+        quality = 9 if path.endswith(".png") else 100
     o3d.io.write_image(path, image, quality)
+
+
+def save_image_encoded(path_stem: str, image, encoding: str = "png_small") -> str:
+    """Save `image` as `<path_stem><ext>` using a named encoding; returns the path."""
+    ext, quality = IMAGE_ENCODINGS[encoding]
+    path = path_stem + ext
+    save_image(path, image, quality)
+    return path
+
+
+@traced("image.decode")
+def read_image_array(path: str) -> np.ndarray:
+    if path.endswith(".npy"):
+        return np.load(path)
+    return np.asarray(o3d.io.read_image(path))
+
+
+class ImageWriterQueue:
+    """
+    Bounded background image writer. `submit` copies the frame and returns
+    right away; worker threads encode and write it with save_image_encoded.
+    When `max_pending` frames are already waiting, submit either drops the
+    new frame (block=False, counted in `dropped`) or waits for room.
+    `close` writes what is queued and stops the worker threads.
+    """
+
+    def __init__(self, max_pending: int = 16, workers: int = 2):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._lock = threading.Lock()
+        self._counts = {"written": 0, "dropped": 0, "failed": 0}
+        self.last_path: str | None = None
+        self.last_error: str | None = None
+        self._closed = False
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(max(1, int(workers)))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path_stem: str, image, encoding: str = "png_fast", block: bool = False, timeout: float | None = None) -> bool:
+        """Queue `image` for `<path_stem><ext>`; False if it was dropped because the queue is full."""
+        if encoding not in IMAGE_ENCODINGS:
+            raise ValueError(f"Unknown image encoding: {encoding}")
+        if self._closed:
+            raise RuntimeError("ImageWriterQueue is closed")
+        # Copy: render_to_image buffers are only valid inside the callback.
+        item = (path_stem, np.array(image, copy=True), encoding)
+        try:
+            self._queue.put(item, block=block, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._counts["dropped"] += 1
+            return False
+        return True
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"pending": self.pending(), **self._counts}
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued frame is written; False if `timeout` ran out first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting frames, let the workers finish the queue, then stop them
+        (one sentinel per worker). False if `timeout` ran out before they exited.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                # Blocks while the queue is full; the workers keep draining it.
+                self._queue.put(None)
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            path_stem, image, encoding = item
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path_stem)), exist_ok=True)
+                path = save_image_encoded(path_stem, image, encoding)
+                with self._lock:
+                    self._counts["written"] += 1
+                    self.last_path = path
+            except Exception as e:
+                with self._lock:
+                    self._counts["failed"] += 1
+                    self.last_error = str(e)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,155 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable
+
+import numpy as np
+
+
+class Tracer:
+    """
+    Opt-in span recorder. While disabled, span()/traced() cost one attribute
+    check. While enabled, every finished span is kept in a bounded event list
+    (for Chrome-trace export) and in a per-name window of recent durations
+    (for rolling stats). Safe to use from worker threads.
+    """
+
+    def __init__(self, max_events: int = 200_000, window: int = 256):
+        self.enabled = False
+        self.window = int(window)
+        self._lock = threading.Lock()
+        self._events: deque = deque(maxlen=int(max_events))
+        self._recent: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+        self._totals: dict[str, float] = {}
+        # perf_counter origin of exported timestamps.
+        self._t0 = time.perf_counter()
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = bool(enabled)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._recent.clear()
+            self._counts.clear()
+            self._totals.clear()
+            self._t0 = time.perf_counter()
+
+    def record(self, name: str, start: float, end: float | None = None, **args):
+        """Record a finished span from perf_counter() timestamps."""
+        if not self.enabled:
+            return
+        if end is None:
+            end = time.perf_counter()
+        duration = end - start
+        with self._lock:
+            self._events.append((name, start, duration, threading.get_ident(), args or None))
+            recent = self._recent.get(name)
+            if recent is None:
+                recent = self._recent[name] = deque(maxlen=self.window)
+            recent.append(duration)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            self._totals[name] = self._totals.get(name, 0.0) + duration
+
+    @contextmanager
+    def span(self, name: str, **args):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, **args)
+
+    def traced(self, name: str | None = None) -> Callable:
+        """Decorator form of span(); defaults to the function's qualified name."""
+
+        def decorate(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*a, **kw):
+                if not self.enabled:
+                    return fn(*a, **kw)
+                start = time.perf_counter()
+                try:
+                    return fn(*a, **kw)
+                finally:
+                    self.record(span_name, start)
+
+            return wrapper
+
+        return decorate
+
+    def stats(self) -> list[dict[str, Any]]:
+        """
+        Per span name: total count/time since the last clear() plus mean/p95/max
+        over the last `window` spans, slowest total first.
+        """
+        with self._lock:
+            snapshot = [
+                (name, np.fromiter(recent, dtype=np.float64), self._counts[name], self._totals[name])
+                for name, recent in self._recent.items()
+            ]
+        rows = []
+        for name, recent, count, total in snapshot:
+            rows.append({
+                "name": name,
+                "count": count,
+                "total_ms": total * 1000.0,
+                "mean_ms": float(recent.mean()) * 1000.0,
+                "p95_ms": float(np.percentile(recent, 95)) * 1000.0,
+                "max_ms": float(recent.max()) * 1000.0,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def format_stats(self, limit: int = 12) -> str:
+        rows = self.stats()[:limit]
+        if not rows:
+            return "No spans recorded"
+        return "\n".join(
+            f"{r['name']}: {r['count']}x  mean {r['mean_ms']:.2f} ms  p95 {r['p95_ms']:.2f} ms  max {r['max_ms']:.2f} ms"
+            for r in rows
+        )
+
+    def export_chrome_trace(self, path: str) -> str:
+        """
+        Write recorded spans as Chrome trace-event JSON ("X" complete events,
+        microsecond timestamps); open in chrome://tracing or ui.perfetto.dev.
+        """
+        with self._lock:
+            events = list(self._events)
+            t0 = self._t0
+        pid = os.getpid()
+        trace_events = []
+        for name, start, duration, tid, args in events:
+            event = {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - t0) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = {k: v if isinstance(v, (int, float, str, bool)) else str(v) for k, v in args.items()}
+            trace_events.append(event)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+# Process-wide tracer used by the instrumented tools/ and ui/ code.
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+record = tracer.record
@@ -1,3 +1,11 @@
-from .main_window import MainWindow
-
+# MainWindow is resolved on first access so headless code importing
+# ui.scene_view doesn't also build the panels / camera controller modules.
 __all__ = ['MainWindow']
+
+
+def __getattr__(name):
+    if name == 'MainWindow':
+        from .main_window import MainWindow
+
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
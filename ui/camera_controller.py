@@ -1,12 +1,28 @@
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import open3d as o3d
 import open3d.visualization.gui as gui
 
+from tools.camera_index import CameraIndex
 from tools.camera_viz import create_camera_geometry, create_o3d_intrinsic
 from tools.camera_math import to_o3d_extrinsic_from_c2w
-from tools.camera_set_io import export_camera_set, load_camera_set, load_camera_image_array, make_camera_record
+from tools.camera_set_io import export_camera_set, load_camera_set_arrays, load_camera_image_array, make_camera_record
 from tools.camera_view_io import load_view_state
+from tools.image_cache import CameraImageCache, make_thumbnail
+from tools import tracing
+from ui.scene_view import TexturedQuadAtlas
+
+
+CAMERA_FRUSTUM_BATCH = "camera_frustums"
+# Atlas pages are named f"{CAMERA_IMAGE_ATLAS_PREFIX}{k}" (see SceneWidget TexturedQuadAtlas).
+CAMERA_IMAGE_ATLAS_PREFIX = "camera_images_atlas_"
+# Max cameras handed to the GUI thread per post_to_main_thread during import.
+IMPORT_BATCH_SIZE = 64
 
 
 class CameraController:
@@ -22,8 +38,31 @@ class CameraController:
         self._register_geometry_toggle = register_geometry_toggle
 
         self.camera_scale = 1.0
+        # Batched mode packs every frustum into one LineSet (see SceneWidget.add_line_batch_member).
+        self.batch_frustums = bool(self.settings_panel.batch_frustums_checkbox.checked)
+        # Atlas mode draws downscaled image planes from shared texture pages.
+        self.atlas_images = bool(self.settings_panel.atlas_images_checkbox.checked)
         self._camera_instance_counter = 0
         self._camera_records: dict[int, dict] = {}
+        # Spatial index over camera centers/directions, kept in sync with _camera_records.
+        self._camera_index = CameraIndex()
+        # View culling of camera geometry, evaluated from the scene tick.
+        self.cull_cameras = bool(self.settings_panel.cull_cameras_checkbox.checked)
+        self._cull_planes: np.ndarray | None = None
+        self._cull_visible_ids: set[int] | None = None
+        # Every camera id is in exactly one of these while culling is on; each view
+        # change only moves the ids that entered or left the frustum.
+        self._cull_shown_ids: set[int] = set()
+        self._culled_ids: set[int] = set()
+        self.scene_view.add_tick_handler(self._cull_camera_geometries)
+        # Full-resolution camera images live here (LRU under a byte budget);
+        # image planes only ever get the thumbnails.
+        self._image_cache = CameraImageCache(
+            budget_bytes=self.settings_panel.image_cache_mb_slider.int_value * 1024 * 1024
+        )
+
+        # Cancel flag of the running background import (None when idle).
+        self._task_cancel: threading.Event | None = None
 
         self.selected_view_path: str | None = None
         self.selected_image_path: str | None = None
@@ -36,17 +75,160 @@ class CameraController:
         self.selected_image_path = path
 
     # --- callbacks ---
+    def get_camera_poses(self) -> tuple[list[int], np.ndarray]:
+        """Camera ids (ascending) and their (N,4,4) camera-to-world matrices."""
+        ids = sorted(idx for idx, rec in self._camera_records.items() if rec.get("model_matrix") is not None)
+        poses = np.array([self._camera_records[idx]["model_matrix"] for idx in ids], dtype=np.float64).reshape(-1, 4, 4)
+        return ids, poses
+
     def on_camera_scale_changed(self, value: float):
         self.camera_scale = self.settings_panel.camera_scale_slider.double_value
 
+    def on_image_cache_budget_changed(self, value):
+        self._image_cache.set_budget(self.settings_panel.image_cache_mb_slider.int_value * 1024 * 1024)
+
+    def close(self):
+        """Window is closing: drop cached images and the spill dir."""
+        self._image_cache.clear()
+
+    @tracing.traced("camera.toggle_batch_frustums")
+    def on_batch_frustums_checked(self, is_checked: bool):
+        self.batch_frustums = bool(is_checked)
+        # Move existing frustums into/out of the batch, keeping their visibility.
+        for idx in sorted(self._camera_records.keys()):
+            frustum_name = f"camera_frustum_{idx}"
+            geometry = self.scene_view.get_geometry(frustum_name)
+            if geometry is None:
+                continue
+            was_visible = self.scene_view.is_geometry_visible(frustum_name)
+            self.scene_view.remove_geometry(frustum_name, flush=False)
+            self._show_frustum(frustum_name, geometry, flush=False)
+            self.scene_view.set_geometry_visible(frustum_name, was_visible, flush=False)
+        self.scene_view.flush_dirty_batches()
+
+    @tracing.traced("camera.toggle_atlas_images")
+    def on_atlas_images_checked(self, is_checked: bool):
+        self.atlas_images = bool(is_checked)
+        # Move existing image planes into/out of atlas pages, keeping their visibility.
+        # Leaving the atlas keeps the downscaled tile as the plane texture.
+        for idx in sorted(self._camera_records.keys()):
+            image_name = f"camera_image_{idx}"
+            geometry = self.scene_view.get_geometry(image_name)
+            if geometry is None:
+                continue
+            was_visible = self.scene_view.is_geometry_visible(image_name)
+            self.scene_view.remove_geometry(image_name, flush=False)
+            self._show_image_plane(image_name, geometry, flush=False)
+            self.scene_view.set_geometry_visible(image_name, was_visible, flush=False)
+        self.scene_view.flush_dirty_batches()
+
+    def on_cull_cameras_checked(self, is_checked: bool):
+        self.cull_cameras = bool(is_checked)
+        self._cull_planes = None
+        self._cull_visible_ids = None
+        if not self.cull_cameras:
+            self.scene_view.update_culled(unculled=self._camera_geometry_names(self._culled_ids))
+            self.window.post_redraw()
+        self._cull_shown_ids = set(self._camera_records.keys())
+        self._culled_ids = set()
+
+    @staticmethod
+    def _camera_geometry_names(ids) -> list[str]:
+        return [name for idx in ids for name in (f"camera_frustum_{idx}", f"camera_image_{idx}")]
+
+    @tracing.traced("camera.cull")
+    def _cull_camera_geometries(self) -> bool:
+        """Tick handler: hide frustums/image planes of cameras outside the view."""
+        if not self.cull_cameras:
+            return False
+        planes = self.scene_view.get_view_frustum_planes()
+        if planes is None:
+            return False
+        if self._cull_planes is not None and np.array_equal(planes, self._cull_planes):
+            return False
+        self._cull_planes = planes
+        # A frustum drawn at camera_scale reaches roughly that far from its center.
+        visible_ids = set(self._camera_index.in_frustum(planes, margin=2.0 * self.camera_scale).tolist())
+        if visible_ids == self._cull_visible_ids:
+            return False
+        self._cull_visible_ids = visible_ids
+        # Only cameras that left / entered the view change state: O(visible), not O(all cameras).
+        to_cull = self._cull_shown_ids - visible_ids
+        to_show = self._culled_ids & visible_ids
+        if not to_cull and not to_show:
+            return False
+        self._cull_shown_ids -= to_cull
+        self._cull_shown_ids |= to_show
+        self._culled_ids -= to_show
+        self._culled_ids |= to_cull
+        return self.scene_view.update_culled(
+            culled=self._camera_geometry_names(to_cull),
+            unculled=self._camera_geometry_names(to_show),
+        )
+
+    def _invalidate_culling(self, added_ids=()):
+        # Re-evaluated on the next tick (camera set changed, view did not).
+        # New cameras start out shown; the next evaluation culls them if needed.
+        self._cull_shown_ids.update(added_ids)
+        self._cull_planes = None
+        self._cull_visible_ids = None
+
+    @tracing.traced("camera.select_nearest")
+    def on_select_nearest_camera_clicked(self):
+        position = self.scene_view.get_camera_position()
+        if position is None or len(self._camera_index) == 0:
+            return
+        nearest = self._camera_index.nearest(position, k=1)
+        if len(nearest) > 0:
+            self.settings_panel.select_camera_item(int(nearest[0]))
+
     def _is_camera_geometry_name(self, name: str) -> bool:
         return name.startswith("camera_frustum_") or name.startswith("camera_image_")
 
+    @tracing.traced("camera.set_all_visible")
     def _set_all_cameras_visible(self, visible: bool):
-        for name in self.settings_panel.list_visibility_names():
-            if not self._is_camera_geometry_name(name):
-                continue
-            self.scene_view.set_geometry_visible(name, visible)
+        names = [n for n in self.settings_panel.list_visibility_names() if self._is_camera_geometry_name(n)]
+        self.scene_view.set_geometries_visible(names, visible)
+
+    def _show_frustum(self, frustum_name: str, geometry, flush: bool = True):
+        if self.batch_frustums:
+            self.scene_view.add_line_batch_member(CAMERA_FRUSTUM_BATCH, frustum_name, geometry, flush=flush)
+        else:
+            self.scene_view.update_geometry(geometry, name=frustum_name)
+
+    def _atlas_page_for(self, image_name: str) -> str:
+        page_name = self.scene_view.get_batch_name(image_name)
+        if page_name is not None and page_name.startswith(CAMERA_IMAGE_ATLAS_PREFIX):
+            return page_name
+        k = 0
+        while True:
+            page_name = f"{CAMERA_IMAGE_ATLAS_PREFIX}{k}"
+            page = self.scene_view.get_batch(page_name)
+            if page is None:
+                self.scene_view.register_batch(page_name, TexturedQuadAtlas())
+                return page_name
+            if page.has_free_slot():
+                return page_name
+            k += 1
+
+    def _show_image_plane(self, image_name: str, plane, flush: bool = True):
+        if self.atlas_images:
+            corners = np.asarray(plane.vertices)[:4]
+            image = np.asarray(plane.textures[0])
+            page_name = self._atlas_page_for(image_name)
+            self.scene_view.add_batch_member(page_name, image_name, corners, image, flush=flush)
+        else:
+            self.scene_view.update_geometry(plane, name=image_name)
+
+    def _show_camera_geometries(self, idx: int, geometries: list, flush: bool = True):
+        frustum_name = f"camera_frustum_{idx}"
+        image_name = f"camera_image_{idx}"
+        if len(geometries) > 0:
+            self._show_frustum(frustum_name, geometries[0], flush=flush)
+            self._register_geometry_toggle(frustum_name, f"Camera {idx} Frustum")
+        if len(geometries) > 1:
+            self._show_image_plane(image_name, geometries[1], flush=flush)
+            self._register_geometry_toggle(image_name, f"Camera {idx} Image")
 
     def on_show_all_cameras_clicked(self):
         self._set_all_cameras_visible(True)
@@ -54,6 +236,7 @@ class CameraController:
     def on_hide_all_cameras_clicked(self):
         self._set_all_cameras_visible(False)
 
+    @tracing.traced("camera.add_from_files")
     def on_update_cameras_clicked(self):
         # Add from files (view required, capture optional)
         if not (self.selected_view_path and os.path.exists(self.selected_view_path)):
@@ -67,24 +250,21 @@ class CameraController:
         extrinsic = to_o3d_extrinsic_from_c2w(model_matrix)
         intrinsic = create_o3d_intrinsic(size=(width, height))
 
-        img_array = None
+        self._camera_instance_counter += 1
+        idx = self._camera_instance_counter
+
+        thumbnail = None
         if self.selected_image_path and os.path.exists(self.selected_image_path):
-            img_o3d = o3d.io.read_image(self.selected_image_path)
-            img_array = np.asarray(img_o3d)
+            thumbnail = self._image_cache.put(idx, image_path=self.selected_image_path)
 
         geometries = create_camera_geometry(
             intrinsic=intrinsic,
             extrinsic=extrinsic,
-            img=img_array,
+            img=thumbnail,
             scale=self.camera_scale,
             O3DVisualizer=False,
         )
 
-        self._camera_instance_counter += 1
-        idx = self._camera_instance_counter
-        frustum_name = f"camera_frustum_{idx}"
-        image_name = f"camera_image_{idx}"
-
         self.settings_panel.upsert_camera_item(idx)
         self._camera_records[idx] = make_camera_record(
             source="files",
@@ -96,13 +276,10 @@ class CameraController:
             image_path=self.selected_image_path if (self.selected_image_path and os.path.exists(self.selected_image_path)) else None,
             image_array=None,
         )
+        self._camera_index.upsert(idx, model_matrix)
+        self._invalidate_culling([idx])
 
-        if len(geometries) > 0:
-            self.scene_view.update_geometry(geometries[0], name=frustum_name)
-            self._register_geometry_toggle(frustum_name, f"Camera {idx} Frustum")
-        if len(geometries) > 1:
-            self.scene_view.update_geometry(geometries[1], name=image_name)
-            self._register_geometry_toggle(image_name, f"Camera {idx} Image")
+        self._show_camera_geometries(idx, geometries)
 
     def on_add_camera_from_scene_clicked(self):
         params = self.scene_view.get_view_state()
@@ -112,22 +289,23 @@ class CameraController:
 
         extrinsic = to_o3d_extrinsic_from_c2w(model_matrix)
         intrinsic = create_o3d_intrinsic(size=(width, height))
+        started = time.perf_counter()
 
         def on_image(image):
             img_array = np.asarray(image)
+            self._camera_instance_counter += 1
+            idx = self._camera_instance_counter
+
+            # Full capture goes to the budgeted cache; the plane only shows the thumbnail.
+            thumbnail = self._image_cache.put(idx, image_array=img_array)
             geometries = create_camera_geometry(
                 intrinsic=intrinsic,
                 extrinsic=extrinsic,
-                img=img_array,
+                img=thumbnail,
                 scale=self.camera_scale,
                 O3DVisualizer=False,
             )
 
-            self._camera_instance_counter += 1
-            idx = self._camera_instance_counter
-            frustum_name = f"camera_frustum_{idx}"
-            image_name = f"camera_image_{idx}"
-
             self.settings_panel.upsert_camera_item(idx)
             self._camera_records[idx] = make_camera_record(
                 source="scene",
@@ -137,15 +315,14 @@ class CameraController:
                 extrinsic=extrinsic,
                 intrinsic=intrinsic,
                 image_path=None,
-                image_array=img_array,
+                image_array=None,
             )
+            self._camera_index.upsert(idx, model_matrix)
+            self._invalidate_culling([idx])
 
-            if len(geometries) > 0:
-                self.scene_view.update_geometry(geometries[0], name=frustum_name)
-                self._register_geometry_toggle(frustum_name, f"Camera {idx} Frustum")
-            if len(geometries) > 1:
-                self.scene_view.update_geometry(geometries[1], name=image_name)
-                self._register_geometry_toggle(image_name, f"Camera {idx} Image")
+            self._show_camera_geometries(idx, geometries)
+            # Spans click -> capture -> geometry shown (capture is asynchronous).
+            tracing.record("camera.add_from_scene", started)
 
         self.scene_view.capture_image(on_image)
 
@@ -168,17 +345,21 @@ class CameraController:
         for name in self.settings_panel.list_visibility_names():
             if name.startswith("camera_image_") and self.scene_view.has_geometry(name):
                 camera_image_visibility[name] = self.scene_view.is_geometry_visible(name)
-                self.scene_view.set_geometry_visible(name, False)
+                self.scene_view.set_geometry_visible(name, False, flush=False)
+        self.scene_view.flush_dirty_batches()
 
         idx_list = list(indices)
         pos = {"i": 0}
         app = gui.Application.instance
+        started = time.perf_counter()
 
         def render_next():
             if pos["i"] >= len(idx_list):
                 self.scene_view.apply_view_state(original_view)
                 for name, was_visible in camera_image_visibility.items():
-                    self.scene_view.set_geometry_visible(name, was_visible)
+                    self.scene_view.set_geometry_visible(name, was_visible, flush=False)
+                self.scene_view.flush_dirty_batches()
+                tracing.record("camera.rerender_images", started, cameras=len(idx_list))
                 return
 
             idx = idx_list[pos["i"]]
@@ -209,14 +390,18 @@ class CameraController:
             self.scene_view.apply_view_state(params)
             self.window.post_redraw()
 
+            capture_started = time.perf_counter()
+
             def on_image(image):
+                tracing.record("camera.rerender_capture", capture_started, camera=idx)
                 img_array = np.asarray(image)
                 if img_array.size == 0:
                     render_next()
                     return
 
-                rec["image_array"] = img_array
+                rec["image_array"] = None
                 rec["image_path"] = None
+                thumbnail = self._image_cache.put(idx, image_array=img_array)
 
                 intrinsic = o3d.camera.PinholeCameraIntrinsic(
                     capture_w, capture_h, float(fx), float(fy), float(cx), float(cy)
@@ -226,19 +411,12 @@ class CameraController:
                 geometries = create_camera_geometry(
                     intrinsic=intrinsic,
                     extrinsic=extrinsic,
-                    img=img_array,
+                    img=thumbnail,
                     scale=self.camera_scale,
                     O3DVisualizer=False,
                 )
 
-                frustum_name = f"camera_frustum_{idx}"
-                image_name = f"camera_image_{idx}"
-                if len(geometries) > 0:
-                    self.scene_view.update_geometry(geometries[0], name=frustum_name)
-                    self._register_geometry_toggle(frustum_name, f"Camera {idx} Frustum")
-                if len(geometries) > 1:
-                    self.scene_view.update_geometry(geometries[1], name=image_name)
-                    self._register_geometry_toggle(image_name, f"Camera {idx} Image")
+                self._show_camera_geometries(idx, geometries)
 
                 render_next()
 
@@ -246,6 +424,7 @@ class CameraController:
 
         render_next()
 
+    @tracing.traced("camera.delete")
     def _delete_camera_index(self, idx: int):
         frustum_name = f"camera_frustum_{idx}"
         image_name = f"camera_image_{idx}"
@@ -260,6 +439,10 @@ class CameraController:
 
         self.settings_panel.remove_camera_item(idx)
         self._camera_records.pop(idx, None)
+        self._camera_index.remove(idx)
+        self._cull_shown_ids.discard(idx)
+        self._culled_ids.discard(idx)
+        self._image_cache.remove(idx)
 
     def on_delete_selected_camera_clicked(self):
         idx = self.settings_panel.get_selected_camera_index()
@@ -270,11 +453,57 @@ class CameraController:
     def on_delete_camera_requested(self, idx: int):
         self._delete_camera_index(idx)
 
+    @tracing.traced("camera.inspect_image")
+    def on_inspect_selected_camera_clicked(self):
+        idx = self.settings_panel.get_selected_camera_index()
+        if idx is None:
+            return
+        # Goes through the LRU: re-inspecting a camera doesn't decode the file again.
+        image = self._image_cache.get_full(idx)
+        if image is None:
+            self.settings_panel.set_task_progress(f"Camera {idx} has no image", 0.0)
+            return
+        height, width = image.shape[:2]
+        scale = min(1.0, 1280 / width, 800 / height)
+        window = gui.Application.instance.create_window(
+            f"Camera {idx} ({width}x{height})", max(1, int(width * scale)), max(1, int(height * scale))
+        )
+        image_widget = gui.ImageWidget(o3d.geometry.Image(np.ascontiguousarray(image)))
+        window.add_child(image_widget)
+        window.set_on_layout(lambda ctx: setattr(image_widget, "frame", window.content_rect))
+
     def on_export_camera_set_clicked(self):
         indices = self.settings_panel.list_camera_indices()
         if not indices:
             return
-        export_camera_set(indices=indices, camera_records=self._camera_records)
+        format_version = self.settings_panel.camera_set_format_combo.selected_index + 1
+        image_encoding = self.settings_panel.get_image_encoding()
+        # Snapshot records so deletes during export don't race the worker.
+        records = {idx: dict(self._camera_records[idx]) for idx in indices if idx in self._camera_records}
+        app = gui.Application.instance
+
+        def post_progress(text: str, fraction: float):
+            app.post_to_main_thread(self.window, lambda: self.settings_panel.set_task_progress(text, fraction))
+
+        def run():
+            try:
+                with tracing.span("camera.export_set", cameras=len(records), encoding=image_encoding):
+                    out_dir = export_camera_set(
+                        indices=indices,
+                        camera_records=records,
+                        format_version=format_version,
+                        image_encoding=image_encoding,
+                        # Bypass the LRU so exporting doesn't evict the working set.
+                        load_image=self._image_cache.read_full,
+                        progress=lambda done, total: post_progress(f"Exporting {done}/{total}", done / total),
+                    )
+            except Exception as e:
+                post_progress(f"Export failed: {e}", 0.0)
+                return
+            post_progress(f"Exported to {os.path.basename(out_dir)}", 1.0)
+
+        self.settings_panel.set_task_progress("Exporting...", 0.0)
+        threading.Thread(target=run, daemon=True).start()
 
     def on_import_camera_set_clicked(self):
         original_cwd = os.getcwd()
@@ -290,68 +519,7 @@ class CameraController:
             self.window.close_dialog()
             if not path or not os.path.exists(path):
                 return
-            try:
-                payload, base_dir = load_camera_set(path)
-            except Exception:
-                return
-            cameras = payload.get("cameras", [])
-            if not isinstance(cameras, list):
-                return
-
-            for cam in cameras:
-                try:
-                    width = int(cam.get("width"))
-                    height = int(cam.get("height"))
-                except Exception:
-                    continue
-
-                model_matrix = np.array(cam.get("model_matrix") or cam.get("c2w"), dtype=np.float64)
-                extrinsic_list = cam.get("extrinsic")
-                extrinsic = np.array(extrinsic_list, dtype=np.float64) if extrinsic_list is not None else to_o3d_extrinsic_from_c2w(model_matrix)
-
-                intrinsic_dict = cam.get("intrinsic") or {}
-                fx = intrinsic_dict.get("fx")
-                fy = intrinsic_dict.get("fy")
-                cx = intrinsic_dict.get("cx")
-                cy = intrinsic_dict.get("cy")
-                if fx is None or fy is None or cx is None or cy is None:
-                    intrinsic = create_o3d_intrinsic(size=(width, height))
-                else:
-                    intrinsic = o3d.camera.PinholeCameraIntrinsic(width, height, float(fx), float(fy), float(cx), float(cy))
-
-                img_array, image_path = load_camera_image_array(base_dir, cam.get("image_file"))
-
-                geometries = create_camera_geometry(
-                    intrinsic=intrinsic,
-                    extrinsic=extrinsic,
-                    img=img_array,
-                    scale=self.camera_scale,
-                    O3DVisualizer=False,
-                )
-
-                self._camera_instance_counter += 1
-                idx = self._camera_instance_counter
-                frustum_name = f"camera_frustum_{idx}"
-                image_name = f"camera_image_{idx}"
-
-                self.settings_panel.upsert_camera_item(idx)
-                self._camera_records[idx] = make_camera_record(
-                    source="import",
-                    width=width,
-                    height=height,
-                    model_matrix=model_matrix,
-                    extrinsic=extrinsic,
-                    intrinsic=intrinsic,
-                    image_path=image_path if (image_path and os.path.exists(image_path)) else None,
-                    image_array=None,
-                )
-
-                if len(geometries) > 0:
-                    self.scene_view.update_geometry(geometries[0], name=frustum_name)
-                    self._register_geometry_toggle(frustum_name, f"Camera {idx} Frustum")
-                if len(geometries) > 1:
-                    self.scene_view.update_geometry(geometries[1], name=image_name)
-                    self._register_geometry_toggle(image_name, f"Camera {idx} Image")
+            self._start_import_camera_set(path)
 
         def on_cancel():
             os.chdir(original_cwd)
@@ -361,3 +529,142 @@ class CameraController:
         dlg.set_on_done(on_done)
         self.window.show_dialog(dlg)
 
+    def on_cancel_task_clicked(self):
+        if self._task_cancel is not None:
+            self._task_cancel.set()
+
+    def _start_import_camera_set(self, path: str):
+        """
+        Parse + decode on background threads; hand finished cameras to the GUI
+        thread in small batches so the first ones appear right away.
+        """
+        if self._task_cancel is not None:
+            self._task_cancel.set()
+        cancel = threading.Event()
+        self._task_cancel = cancel
+        camera_scale = self.camera_scale
+        thumbnail_max_side = self._image_cache.thumbnail_max_side
+        app = gui.Application.instance
+
+        @tracing.traced("camera.import_build")
+        def build_camera(arrays, base_dir, i):
+            width = int(arrays["width"][i])
+            height = int(arrays["height"][i])
+            if width <= 0 or height <= 0:
+                return None
+
+            model_matrix = np.array(arrays["c2w"][i], dtype=np.float64)
+            if not np.isfinite(model_matrix).all():
+                return None
+            extrinsic = np.array(arrays["extrinsic"][i], dtype=np.float64)
+
+            K = arrays["K"][i]
+            if K[2, 2] == 0:
+                intrinsic = create_o3d_intrinsic(size=(width, height))
+            else:
+                intrinsic = o3d.camera.PinholeCameraIntrinsic(
+                    width, height, float(K[0, 0]), float(K[1, 1]), float(K[0, 2]), float(K[1, 2])
+                )
+
+            img_array, image_path = load_camera_image_array(base_dir, arrays["image_file"][i])
+            # Only the thumbnail stays resident; the full image is re-read from disk on demand.
+            thumbnail = make_thumbnail(img_array, thumbnail_max_side) if img_array is not None else None
+
+            geometries = create_camera_geometry(
+                intrinsic=intrinsic,
+                extrinsic=extrinsic,
+                img=thumbnail,
+                scale=camera_scale,
+                O3DVisualizer=False,
+            )
+            record = make_camera_record(
+                source="import",
+                width=width,
+                height=height,
+                model_matrix=model_matrix,
+                extrinsic=extrinsic,
+                intrinsic=intrinsic,
+                image_path=image_path if (image_path and os.path.exists(image_path)) else None,
+                image_array=None,
+            )
+            return record, geometries, thumbnail
+
+        @tracing.traced("camera.import_apply_batch")
+        def apply_batch(batch, done, total, skipped):
+            # Runs on the GUI thread.
+            if cancel.is_set():
+                return
+            added_ids = []
+            for record, geometries, thumbnail in batch:
+                self._camera_instance_counter += 1
+                idx = self._camera_instance_counter
+                if thumbnail is not None and record["image_path"]:
+                    self._image_cache.put(idx, image_path=record["image_path"], thumbnail=thumbnail)
+                self.settings_panel.upsert_camera_item(idx)
+                self._camera_records[idx] = record
+                added_ids.append(idx)
+                self._show_camera_geometries(idx, geometries, flush=False)
+            if added_ids:
+                self._camera_index.upsert_many(added_ids, [self._camera_records[i]["model_matrix"] for i in added_ids])
+                self._invalidate_culling(added_ids)
+            # Batched frustums / atlas pages are uploaded once per batch.
+            self.scene_view.flush_dirty_batches()
+            text = f"Importing {done}/{total}"
+            if skipped:
+                text += f" ({skipped} skipped)"
+            self.settings_panel.set_task_progress(text, done / max(total, 1))
+
+        def post(fn):
+            app.post_to_main_thread(self.window, fn)
+
+        def run():
+            started = time.perf_counter()
+            try:
+                with tracing.span("camera.import_load_arrays"):
+                    arrays, base_dir = load_camera_set_arrays(path)
+            except Exception as e:
+                message = f"Import failed: {e}"
+                post(lambda: self.settings_panel.set_task_progress(message, 0.0))
+                return
+
+            total = len(arrays["ids"])
+            workers = min(8, os.cpu_count() or 1)
+            # Keep a bounded window of in-flight decodes so memory stays flat
+            # and results come back in file order.
+            window = deque()
+            batch = []
+            last_post = time.perf_counter()
+            next_i = 0
+            done = 0
+            # Cameras with a bad size or pose or that failed to build (bad intrinsics, unreadable image).
+            skipped = 0
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                while (next_i < total or window) and not cancel.is_set():
+                    while next_i < total and len(window) < 4 * workers:
+                        window.append(pool.submit(build_camera, arrays, base_dir, next_i))
+                        next_i += 1
+                    try:
+                        item = window.popleft().result()
+                    except Exception:
+                        item = None
+                    done += 1
+                    if item is not None:
+                        batch.append(item)
+                    else:
+                        skipped += 1
+                    now = time.perf_counter()
+                    if len(batch) >= IMPORT_BATCH_SIZE or now - last_post > 0.05 or done == total:
+                        post(lambda b=batch, d=done, k=skipped: apply_batch(b, d, total, k))
+                        batch = []
+                        last_post = now
+                for future in window:
+                    future.cancel()
+
+            tracing.record("camera.import_set", started, cameras=done, skipped=skipped, cancelled=cancel.is_set())
+            if cancel.is_set():
+                post(lambda: self.settings_panel.set_task_progress(f"Import cancelled ({done}/{total})", done / max(total, 1)))
+            elif total == 0:
+                post(lambda: self.settings_panel.set_task_progress("Nothing to import", 0.0))
+
+        self.settings_panel.set_task_progress("Importing...", 0.0)
+        threading.Thread(target=run, daemon=True).start()
@@ -1,35 +1,29 @@
 import os
 import glob
-import numpy as np
+import threading
+import time
 from datetime import datetime
+import numpy as np
 import open3d as o3d
 import open3d.visualization.gui as gui
 
 from ui.scene_view import SceneWidget
 from ui.panels import SettingsPanel
 from ui.camera_controller import CameraController
-from tools.camera_view_io import save_view_state, load_view_state
-from tools.screenshot import save_image
-from tools.ply_io import load_ply_geometry
-
-
-def generate_point_cloud_data(count: int = 1000, size: float = 1.0):
-    """Generate example point cloud data for demo purposes."""
-    points = np.random.uniform(-size/2, size/2, (count, 3))
-    colors = (points - points.min(axis=0)) / (points.max(axis=0) - points.min(axis=0) + 1e-8)
-    colors = np.clip(colors, 0, 1)
-    return points, colors
+from tools.camera_view_io import list_view_files, load_view_poses, save_view_state, load_view_state
+from tools.camera_path import interpolate_camera_path
+from tools.screenshot import ImageWriterQueue
+from tools.recording import FrameRecorder, turntable_poses
+from tools.mesh_edges import create_edge_lineset
+from tools.ply_io import PlyLoadCancelled, load_ply_geometry
+from tools.point_lod import build_lod_pyramid, point_count
+from tools.point_generators import generate_point_cloud
+from tools.pointcloud_octree import build_point_octree, load_point_octree
+from tools import tracing
 
 
-def create_point_cloud(points: np.ndarray, colors: np.ndarray) -> o3d.geometry.PointCloud:
-    pcd = o3d.geometry.PointCloud()
-    pcd.points = o3d.utility.Vector3dVector(points)
-    pcd.colors = o3d.utility.Vector3dVector(colors)
-    return pcd
-
-
-def create_coordinate_frame(size: float = 1.0) -> o3d.geometry.TriangleMesh:
-    return o3d.geometry.TriangleMesh.create_coordinate_frame(size=size)
+def create_coordinate_frame(size: float = 1.0) -> o3d.t.geometry.TriangleMesh:
+    return o3d.t.geometry.TriangleMesh.from_legacy(o3d.geometry.TriangleMesh.create_coordinate_frame(size=size))
 
 
 class MainWindow:
@@ -45,6 +39,23 @@ class MainWindow:
         self.point_count = 10000
         self.geometry_size = 1.0
         self._last_ply_geometry = None
+        # Edge overlays of the current PLY mesh, per edge mode (dropped on re-import).
+        self._ply_edges_cache: dict[str, o3d.t.geometry.LineSet] = {}
+        self._tracing_stats_refreshed = 0.0
+        # Screenshots are encoded/written off the GUI thread; full queue == dropped frame.
+        self._screenshot_writer = ImageWriterQueue(max_pending=32, workers=2)
+        self._screenshot_counter = 0
+        self._screenshot_status = None
+        # Precomputed playback path: poses, fps, loop flag and start time (None when idle).
+        self._playback: dict | None = None
+        # Running frame-sequence recording (None when idle).
+        self._recorder: FrameRecorder | None = None
+        self._recording_stop = False
+        self._recording_status_refreshed = 0.0
+        # Set by on_close: callbacks still queued on the main thread must not touch the writers.
+        self._closing = False
+        # Cancel flag of the running background PLY import (None when idle).
+        self._geometry_task_cancel: threading.Event | None = None
         self.camera = CameraController(
             window=self.window,
             scene_view=self.scene_view,
@@ -81,11 +92,12 @@ class MainWindow:
         # Initialize both geometries on startup:
         # - main point cloud (10k points by default)
         # - coordinate axes at origin
-        points, colors = generate_point_cloud_data(
+        pcd = generate_point_cloud(
             count=self.point_count,
             size=self.geometry_size,
+            distribution=self.settings_panel.get_point_distribution(),
+            seed=self.settings_panel.seed_edit.int_value,
         )
-        pcd = create_point_cloud(points, colors)
         self.scene_view.update_geometry(pcd, name="main_geometry")
         self._register_geometry_toggle("main_geometry", "Point Cloud")
 
@@ -113,27 +125,52 @@ class MainWindow:
 
     def _setup_callbacks(self):
         self.settings_panel.screenshot_button.set_on_clicked(self.on_save_screenshot)
+        self.settings_panel.burst_button.set_on_clicked(self.on_burst_screenshot)
         self.settings_panel.save_camera_button.set_on_clicked(self.on_save_camera)
         self.settings_panel.load_camera_button.set_on_clicked(self.on_load_camera)
+        self.settings_panel.play_path_button.set_on_clicked(self.on_play_path_clicked)
+        self.settings_panel.stop_path_button.set_on_clicked(self.on_stop_path_clicked)
+        self.settings_panel.record_button.set_on_clicked(self.on_record_clicked)
+        self.settings_panel.stop_recording_button.set_on_clicked(self.on_stop_recording_clicked)
         self.settings_panel.load_latest_camera_button.set_on_clicked(self.on_load_latest_camera)
         self.settings_panel.black_background_checkbox.set_on_checked(self.on_black_background_checked)
         self.settings_panel.import_ply_button.set_on_clicked(self.on_import_ply_clicked)
         self.settings_panel.ply_show_edges_checkbox.set_on_checked(self.on_ply_show_edges_checked)
+        self.settings_panel.ply_edge_mode_combo.set_on_selection_changed(self.on_ply_edge_mode_changed)
         self.settings_panel.generate_button.set_on_clicked(self.on_generate_clicked)
-        self.settings_panel.point_count_slider.set_on_value_changed(self.on_point_count_changed)
+        self.settings_panel.geometry_task_cancel_button.set_on_clicked(self.on_geometry_task_cancel_clicked)
+        self.settings_panel.build_octree_button.set_on_clicked(self.on_build_octree_clicked)
+        self.settings_panel.open_octree_button.set_on_clicked(self.on_open_octree_clicked)
+        self.settings_panel.stream_budget_mb_slider.set_on_value_changed(self.on_stream_budget_changed)
+        self.settings_panel.point_count_edit.set_on_value_changed(self.on_point_count_changed)
         self.settings_panel.size_slider.set_on_value_changed(self.on_size_changed)
         self.settings_panel.load_view_button.set_on_clicked(self.on_load_view)
         self.settings_panel.load_capture_button.set_on_clicked(self.on_load_capture)
         self.settings_panel.camera_scale_slider.set_on_value_changed(self.camera.on_camera_scale_changed)
+        self.settings_panel.batch_frustums_checkbox.set_on_checked(self.camera.on_batch_frustums_checked)
+        self.settings_panel.atlas_images_checkbox.set_on_checked(self.camera.on_atlas_images_checked)
+        self.settings_panel.cull_cameras_checkbox.set_on_checked(self.camera.on_cull_cameras_checked)
+        self.settings_panel.select_nearest_camera_button.set_on_clicked(self.camera.on_select_nearest_camera_clicked)
+        self.settings_panel.image_cache_mb_slider.set_on_value_changed(self.camera.on_image_cache_budget_changed)
         self.settings_panel.update_cameras_button.set_on_clicked(self.camera.on_update_cameras_clicked)
         self.settings_panel.add_camera_from_scene_button.set_on_clicked(self.camera.on_add_camera_from_scene_clicked)
         self.settings_panel.rerender_camera_images_button.set_on_clicked(self.camera.on_rerender_camera_images_clicked)
         self.settings_panel.delete_selected_camera_button.set_on_clicked(self.camera.on_delete_selected_camera_clicked)
         self.settings_panel.set_on_delete_camera_requested(self.camera.on_delete_camera_requested)
+        self.settings_panel.inspect_camera_image_button.set_on_clicked(self.camera.on_inspect_selected_camera_clicked)
         self.settings_panel.show_all_cameras_button.set_on_clicked(self.camera.on_show_all_cameras_clicked)
         self.settings_panel.hide_all_cameras_button.set_on_clicked(self.camera.on_hide_all_cameras_clicked)
         self.settings_panel.export_camera_set_button.set_on_clicked(self.camera.on_export_camera_set_clicked)
         self.settings_panel.import_camera_set_button.set_on_clicked(self.camera.on_import_camera_set_clicked)
+        self.settings_panel.task_cancel_button.set_on_clicked(self.camera.on_cancel_task_clicked)
+        self.settings_panel.tracing_checkbox.set_on_checked(self.on_tracing_checked)
+        self.settings_panel.tracing_reset_button.set_on_clicked(self.on_tracing_reset_clicked)
+        self.settings_panel.tracing_export_button.set_on_clicked(self.on_tracing_export_clicked)
+        self.scene_view.add_tick_handler(self._refresh_tracing_stats)
+        self.scene_view.add_tick_handler(self._refresh_screenshot_status)
+        self.scene_view.add_tick_handler(self._refresh_recording_status)
+        self.scene_view.add_tick_handler(self._advance_playback)
+        self.window.set_on_close(self.on_close)
 
 
     def _update_ui_from_state(self):
@@ -153,14 +190,43 @@ class MainWindow:
 
 
     def on_generate_clicked(self):
-        # Generate / update the point cloud only.
-        points, colors = generate_point_cloud_data(
-            count=self.point_count,
-            size=self.geometry_size,
-        )
-        geometry = create_point_cloud(points, colors)
-        self.scene_view.update_geometry(geometry, name="main_geometry")
-        self._register_geometry_toggle("main_geometry", "Point Cloud")
+        # Generate / update the point cloud only (off the GUI thread: 100M points take a while).
+        count = self.point_count
+        size = self.geometry_size
+        distribution = self.settings_panel.get_point_distribution()
+        seed = self.settings_panel.seed_edit.int_value
+        lod_point_threshold = self.scene_view.lod_point_threshold
+        app = gui.Application.instance
+
+        def post_progress(text: str, fraction: float):
+            app.post_to_main_thread(self.window, lambda: self.settings_panel.set_geometry_task_progress(text, fraction))
+
+        def on_generated(geometry, lod_levels):
+            self.scene_view.update_geometry(geometry, name="main_geometry", lod_levels=lod_levels)
+            self._register_geometry_toggle("main_geometry", "Point Cloud")
+            self.settings_panel.set_geometry_task_progress(f"Generated {count:,} points", 1.0)
+
+        def run():
+            try:
+                geometry = generate_point_cloud(
+                    count=count,
+                    size=size,
+                    distribution=distribution,
+                    seed=seed,
+                    progress=lambda done, total: post_progress(f"Generating {done:,}/{total:,}", 0.9 * done / total),
+                )
+                # Built here too: on the GUI thread a 100M-point pyramid would freeze the window.
+                lod_levels = None
+                if point_count(geometry) > lod_point_threshold:
+                    post_progress(f"Building LOD for {count:,} points", 0.9)
+                    lod_levels = build_lod_pyramid(geometry)
+            except Exception as e:
+                post_progress(f"Generation failed: {e}", 0.0)
+                return
+            app.post_to_main_thread(self.window, lambda: on_generated(geometry, lod_levels))
+
+        self.settings_panel.set_geometry_task_progress("Generating...", 0.0)
+        threading.Thread(target=run, daemon=True).start()
 
     def on_import_ply_clicked(self):
         original_cwd = os.getcwd()
@@ -175,20 +241,164 @@ class MainWindow:
             self.window.close_dialog()
             if not path or not os.path.exists(path):
                 return
+            self._import_ply_in_background(path)
 
-            geom = load_ply_geometry(path)
-            if geom is None:
+        def on_cancel():
+            os.chdir(original_cwd)
+            self.window.close_dialog()
+
+        dlg.set_on_cancel(on_cancel)
+        dlg.set_on_done(on_done)
+        self.window.show_dialog(dlg)
+
+
+    def on_geometry_task_cancel_clicked(self):
+        if self._geometry_task_cancel is not None:
+            self._geometry_task_cancel.set()
+
+    def _import_ply_in_background(self, path: str):
+        """
+        Load, build the LOD pyramid and (if shown) the edge overlay on a worker
+        thread; the scene is only touched once everything is ready.
+        """
+        if self._geometry_task_cancel is not None:
+            self._geometry_task_cancel.set()
+        cancel = threading.Event()
+        self._geometry_task_cancel = cancel
+        file_name = os.path.basename(path)
+        lod_point_threshold = self.scene_view.lod_point_threshold
+        edge_mode = self.settings_panel.get_edge_mode() if self.settings_panel.ply_show_edges_checkbox.checked else None
+        # Overall progress range of each load stage (the rest goes to LOD / edges).
+        stage_ranges = {"reading": (0.0, 0.8), "finishing": (0.8, 0.9)}
+        app = gui.Application.instance
+
+        def post_progress(text: str, fraction: float, finished: bool = False):
+            def apply():
+                # Once a newer import has started, the progress row belongs to it.
+                if self._geometry_task_cancel is not cancel:
+                    return
+                if finished:
+                    self._geometry_task_cancel = None
+                self.settings_panel.set_geometry_task_progress(text, fraction)
+
+            app.post_to_main_thread(self.window, apply)
+
+        def on_load_progress(stage: str, fraction: float):
+            lo, hi = stage_ranges[stage]
+            post_progress(f"Importing {file_name}: {stage}", lo + (hi - lo) * fraction)
+
+        def on_loaded(geom, lod_levels, edges_cache):
+            # Runs on the GUI thread.
+            if cancel.is_set():
+                # Cancelled after the worker finished: nothing else will end this task.
+                if self._geometry_task_cancel is cancel:
+                    self._geometry_task_cancel = None
+                    self.settings_panel.set_geometry_task_progress(f"Import of {file_name} cancelled", 0.0)
                 return
+            self._geometry_task_cancel = None
 
             # Keep a single "ply" geometry that gets replaced on re-import.
-            self.scene_view.update_geometry(geom, name="ply")
+            self.scene_view.update_geometry(geom, name="ply", lod_levels=lod_levels)
             self._register_geometry_toggle("ply", "PLY")
             self._last_ply_geometry = geom
+            self._ply_edges_cache = edges_cache
+            self.scene_view.remove_geometry("ply_edges")
 
             # If the PLY is a mesh, also show its edges as a LineSet overlay.
             # This makes the mesh silhouette/triangulation visible in the GUI.
             self._sync_ply_edges()
             self.scene_view.fit_camera_to_geometry(geom)
+            self.settings_panel.set_geometry_task_progress(f"Imported {file_name}", 1.0)
+
+        def run():
+            try:
+                geom = load_ply_geometry(path, tensor=True, progress=on_load_progress, cancel=cancel)
+                if geom is None:
+                    post_progress(f"{file_name} contains no points or faces", 0.0, finished=True)
+                    return
+                lod_levels = None
+                if isinstance(geom, o3d.t.geometry.PointCloud) and point_count(geom) > lod_point_threshold:
+                    post_progress(f"Importing {file_name}: LOD", 0.9)
+                    lod_levels = build_lod_pyramid(geom)
+                edges_cache = {}
+                if edge_mode is not None and isinstance(geom, o3d.t.geometry.TriangleMesh):
+                    post_progress(f"Importing {file_name}: edges", 0.95)
+                    edges_cache[edge_mode] = create_edge_lineset(geom, mode=edge_mode, color=(0.0, 0.0, 0.0))
+                if cancel.is_set():
+                    raise PlyLoadCancelled()
+            except PlyLoadCancelled:
+                post_progress(f"Import of {file_name} cancelled", 0.0, finished=True)
+                return
+            except Exception as e:
+                post_progress(f"Import of {file_name} failed: {e}", 0.0, finished=True)
+                return
+            app.post_to_main_thread(self.window, lambda: on_loaded(geom, lod_levels, edges_cache))
+
+        self.settings_panel.set_geometry_task_progress(f"Importing {file_name}...", 0.0)
+        threading.Thread(target=run, daemon=True).start()
+
+
+    def on_build_octree_clicked(self):
+        original_cwd = os.getcwd()
+        start_dir = os.path.abspath(os.path.join("samples")) if os.path.exists("samples") else os.getcwd()
+
+        dlg = gui.FileDialog(gui.FileDialog.OPEN, "Build out-of-core cloud from PLY", self.window.theme)
+        dlg.add_filter(".ply", "PLY files")
+        dlg.set_path(start_dir)
+
+        def on_done(path):
+            os.chdir(original_cwd)
+            self.window.close_dialog()
+            if not path or not os.path.exists(path):
+                return
+            stem = os.path.splitext(os.path.basename(path))[0]
+            out_dir = os.path.abspath(os.path.join("export", "octrees", stem))
+            self._build_octree_in_background(path, out_dir)
+
+        def on_cancel():
+            os.chdir(original_cwd)
+            self.window.close_dialog()
+
+        dlg.set_on_cancel(on_cancel)
+        dlg.set_on_done(on_done)
+        self.window.show_dialog(dlg)
+
+    def _build_octree_in_background(self, ply_path: str, out_dir: str):
+        app = gui.Application.instance
+
+        def post_progress(text: str, fraction: float):
+            app.post_to_main_thread(self.window, lambda: self.settings_panel.set_geometry_task_progress(text, fraction))
+
+        def run():
+            try:
+                manifest_path = build_point_octree(
+                    ply_path,
+                    out_dir,
+                    progress=lambda stage, fraction: post_progress(f"Octree: {stage}", fraction),
+                )
+            except Exception as e:
+                post_progress(f"Octree build failed: {e}", 0.0)
+                return
+            post_progress(f"Octree written to {out_dir}", 1.0)
+            app.post_to_main_thread(self.window, lambda: self._open_octree(manifest_path))
+
+        post_progress("Octree: bounds", 0.0)
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_open_octree_clicked(self):
+        original_cwd = os.getcwd()
+        octrees_dir = os.path.join("export", "octrees")
+
+        dlg = gui.FileDialog(gui.FileDialog.OPEN, "Open out-of-core cloud", self.window.theme)
+        dlg.add_filter(".json", "Octree manifest (octree.json)")
+        if os.path.exists(octrees_dir):
+            dlg.set_path(os.path.abspath(octrees_dir))
+
+        def on_done(path):
+            os.chdir(original_cwd)
+            self.window.close_dialog()
+            if path and os.path.exists(path):
+                self._open_octree(path)
 
         def on_cancel():
             os.chdir(original_cwd)
@@ -198,31 +408,56 @@ class MainWindow:
         dlg.set_on_done(on_done)
         self.window.show_dialog(dlg)
 
+    def _open_octree(self, manifest_path: str):
+        manifest = load_point_octree(manifest_path)
+        budget_bytes = self.settings_panel.stream_budget_mb_slider.int_value * 1024 * 1024
+        # Keep a single streamed cloud that gets replaced on re-open.
+        self.scene_view.add_streamed_point_cloud(manifest, "ooc_cloud", memory_budget_bytes=budget_bytes)
+        self._register_geometry_toggle("ooc_cloud", "Out-of-core cloud")
+        self.scene_view.fit_camera_to_geometry(self.scene_view.get_stream_bounds("ooc_cloud"))
+
+    def on_stream_budget_changed(self, value):
+        budget_bytes = self.settings_panel.stream_budget_mb_slider.int_value * 1024 * 1024
+        self.scene_view.set_stream_budget("ooc_cloud", budget_bytes)
 
     def on_ply_show_edges_checked(self, is_checked: bool):
         self._sync_ply_edges()
 
+    def on_ply_edge_mode_changed(self, text: str, index: int):
+        self._sync_ply_edges()
+
 
     def _sync_ply_edges(self):
         """
-        Create/remove the mesh edge overlay based on the checkbox.
+        Show/hide the mesh edge overlay based on the checkbox.
+        Overlays are built once per mesh and edge mode, then only toggled.
         """
         show_edges = bool(self.settings_panel.ply_show_edges_checkbox.checked)
         geom = self.scene_view.get_geometry("ply") or self._last_ply_geometry
 
-        if show_edges and isinstance(geom, o3d.geometry.TriangleMesh):
-            edges = o3d.geometry.LineSet.create_from_triangle_mesh(geom)
-            edges.paint_uniform_color([0.0, 0.0, 0.0])
-            self.scene_view.update_geometry(edges, name="ply_edges")
-            # Edges are controlled by the dedicated checkbox (not the Visibility tree).
-            self.settings_panel.remove_geometry_toggle("ply_edges")
-        else:
+        if not isinstance(geom, (o3d.geometry.TriangleMesh, o3d.t.geometry.TriangleMesh)):
             self.scene_view.remove_geometry("ply_edges")
             self.settings_panel.remove_geometry_toggle("ply_edges")
+            return
+
+        if not show_edges:
+            self.scene_view.set_geometry_visible("ply_edges", False)
+            return
+
+        mode = self.settings_panel.get_edge_mode()
+        edges = self._ply_edges_cache.get(mode)
+        if edges is None:
+            edges = create_edge_lineset(geom, mode=mode, color=(0.0, 0.0, 0.0))
+            self._ply_edges_cache[mode] = edges
+        if self.scene_view.get_geometry("ply_edges") is not edges:
+            self.scene_view.update_geometry(edges, name="ply_edges")
+        self.scene_view.set_geometry_visible("ply_edges", True)
+        # Edges are controlled by the dedicated checkbox (not the Visibility tree).
+        self.settings_panel.remove_geometry_toggle("ply_edges")
 
 
     def on_point_count_changed(self, value):
-        self.point_count = self.settings_panel.point_count_slider.int_value
+        self.point_count = self.settings_panel.point_count_edit.int_value
 
 
     def on_size_changed(self, value: float):
@@ -230,15 +465,221 @@ class MainWindow:
 
 
     def on_save_screenshot(self):
-        path = self._make_screenshot_path()
-        abs_path = os.path.abspath(path)
-        os.makedirs(os.path.dirname(abs_path), exist_ok=True)
-        
+        encoding = self.settings_panel.get_screenshot_encoding()
+        self.scene_view.capture_image(lambda image: self._queue_screenshot(image, encoding))
+
+    def on_burst_screenshot(self):
+        # One capture per rendered frame: each callback queues its frame and
+        # schedules the next capture, so the UI keeps handling input in between.
+        encoding = self.settings_panel.get_screenshot_encoding()
+        remaining = {"n": self.settings_panel.burst_count_edit.int_value}
+        app = gui.Application.instance
+
         def on_image(image):
-            save_image(abs_path, image)
-        
+            # Closing: the writer queue is gone, drop the rest of the burst.
+            if self._closing:
+                return
+            self._queue_screenshot(image, encoding)
+            remaining["n"] -= 1
+            if remaining["n"] > 0:
+                self.window.post_redraw()
+                app.post_to_main_thread(self.window, lambda: self.scene_view.capture_image(on_image))
+
         self.scene_view.capture_image(on_image)
 
+    def _queue_screenshot(self, image, encoding: str):
+        if self._closing:
+            return
+        self._screenshot_writer.submit(os.path.abspath(self._make_screenshot_stem()), image, encoding)
+
+    def _refresh_screenshot_status(self) -> bool:
+        # Tick handler; only touches the label when the writer counts change.
+        stats = self._screenshot_writer.stats()
+        if stats == self._screenshot_status:
+            return False
+        self._screenshot_status = stats
+        text = f"{stats['written']} written, {stats['pending']} pending"
+        if stats["dropped"]:
+            text += f", {stats['dropped']} dropped"
+        if stats["failed"]:
+            text += f", {stats['failed']} failed"
+        self.settings_panel.screenshot_status_label.text = text
+        return False
+
+    def _build_camera_path(self) -> np.ndarray | None:
+        """Playback path from the panel settings: (M,4,4) poses, or None with fewer than 2 keys."""
+        if self.settings_panel.get_playback_source() == "views":
+            keys = load_view_poses(list_view_files(os.path.abspath(os.path.join("export", "views"))))
+        else:
+            _, keys = self.camera.get_camera_poses()
+        if len(keys) < 2:
+            return None
+        frames_per_key = round(
+            self.settings_panel.playback_seconds_edit.double_value * self.settings_panel.playback_fps_edit.int_value
+        )
+        return interpolate_camera_path(keys, frames_per_key, loop=self.settings_panel.playback_loop_checkbox.checked)
+
+    def on_play_path_clicked(self):
+        poses = self._build_camera_path()
+        if poses is None:
+            self.settings_panel.set_playback_status("Need at least 2 keys")
+            return
+        self._playback = {
+            "poses": poses,
+            "fps": float(self.settings_panel.playback_fps_edit.int_value),
+            "loop": self.settings_panel.playback_loop_checkbox.checked,
+            "start": time.monotonic(),
+            "frame": -1,
+            # Keep the orbit pivot at roughly the scene distance once playback ends.
+            "pivot": float(np.linalg.norm(self.scene_view.get_scene_center() - poses[0][:3, 3])) or 1.0,
+        }
+        self.settings_panel.set_playback_status(f"Playing {len(poses)} frames")
+
+    def on_stop_path_clicked(self):
+        if self._playback is not None:
+            self._playback = None
+            self.settings_panel.set_playback_status("Stopped")
+
+    def _advance_playback(self) -> bool:
+        # Tick handler; the frame index follows wall time, so playback keeps its
+        # rate when ticks are late (frames are skipped, never slowed down).
+        playback = self._playback
+        if playback is None:
+            return False
+        poses = playback["poses"]
+        frame = int((time.monotonic() - playback["start"]) * playback["fps"])
+        if frame >= len(poses):
+            if playback["loop"]:
+                frame %= len(poses)
+            else:
+                frame = len(poses) - 1
+                self._playback = None
+                self.settings_panel.set_playback_status(f"Played {len(poses)} frames")
+        if frame == playback["frame"]:
+            return False
+        playback["frame"] = frame
+        self.scene_view.set_camera_pose(poses[frame], playback["pivot"])
+        return True
+
+    def on_record_clicked(self):
+        if self._recorder is not None:
+            return
+        # The recorder drives the camera itself.
+        self.on_stop_path_clicked()
+        original_view = self.scene_view.get_view_state()
+        width = int(original_view.get("width", 0))
+        height = int(original_view.get("height", 0))
+        if width <= 0 or height <= 0:
+            return
+
+        source = self.settings_panel.get_recording_source()
+        if source == "cameras":
+            _, poses = self.camera.get_camera_poses()
+            if len(poses) == 0:
+                self.settings_panel.set_recording_status("No camera records to record")
+                return
+        elif source == "path":
+            poses = self._build_camera_path()
+            if poses is None:
+                self.settings_panel.set_recording_status("Playback path needs at least 2 keys")
+                return
+        else:
+            # Orbit about the current view's up axis, starting from the current eye.
+            c2w = np.asarray(original_view["model_matrix"], dtype=np.float64)
+            poses = turntable_poses(
+                self.scene_view.get_scene_center(),
+                c2w[:3, 3],
+                self.settings_panel.recording_frames_edit.int_value,
+                up=c2w[:3, 1],
+            )
+
+        recorder = FrameRecorder(
+            os.path.abspath(self._make_recording_dir()),
+            poses,
+            encoding=self.settings_panel.get_screenshot_encoding(),
+            target_fps=self.settings_panel.recording_fps_edit.int_value,
+        )
+        self._recorder = recorder
+        self._recording_stop = False
+        # Full-detail LOD for every frame; scripted moves must not read as camera motion.
+        self.scene_view.set_capture_mode(True)
+        app = gui.Application.instance
+
+        def record_next():
+            if self._closing:
+                return
+            if self._recording_stop or recorder.done():
+                self._finish_recording(original_view)
+                return
+            self.scene_view.apply_view_state(
+                {"model_matrix": recorder.next_pose().tolist(), "width": width, "height": height}
+            )
+            self.window.post_redraw()
+            app.post_to_main_thread(self.window, lambda: self.scene_view.capture_image(on_image))
+
+        def on_image(image):
+            if self._closing:
+                return
+            # Never blocks: a frame the writers have no room for is dropped and counted.
+            recorder.add_frame(image)
+            record_next()
+
+        record_next()
+
+    def on_stop_recording_clicked(self):
+        self._recording_stop = True
+
+    def _finish_recording(self, original_view: dict):
+        recorder = self._recorder
+        self.scene_view.apply_view_state(original_view)
+        self.scene_view.set_capture_mode(False)
+        self.window.post_redraw()
+        self.settings_panel.set_recording_status(f"Writing {recorder.writer.pending()} pending frame(s)...")
+        app = gui.Application.instance
+
+        def on_done(report: dict):
+            self._recorder = None
+            text = (
+                f"{report['written']}/{report['frames']} frames, {report['capture_fps']:.1f} fps, "
+                f"{len(report['dropped'])} dropped, {len(report['late'])} late"
+            )
+            if report["failed"]:
+                text += f", {report['failed']} failed"
+            self.settings_panel.set_recording_status(text)
+
+        def run():
+            # The final flush can take a while with slow encoders; keep it off the GUI thread.
+            report = recorder.finish()
+            app.post_to_main_thread(self.window, lambda: on_done(report))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _refresh_recording_status(self) -> bool:
+        # Tick handler; live counts while recording, at most four times a second.
+        recorder = self._recorder
+        if recorder is None or recorder.done() or self._recording_stop:
+            return False
+        now = time.monotonic()
+        if now - self._recording_status_refreshed < 0.25:
+            return False
+        self._recording_status_refreshed = now
+        self.settings_panel.set_recording_status(recorder.status())
+        return False
+
+    def on_close(self) -> bool:
+        # Stop everything that submits frames first; capture callbacks already
+        # queued on the main thread check _closing and do nothing.
+        self._closing = True
+        self._playback = None
+        self._recording_stop = True
+        # Let queued screenshots and recording frames reach the disk before the window goes away.
+        if self._recorder is not None:
+            self._recorder.writer.close(timeout=10.0)
+        self._screenshot_writer.flush(timeout=10.0)
+        self._screenshot_writer.close(timeout=1.0)
+        self.camera.close()
+        return True
+
 
     def on_save_camera(self):
         path = self._make_camera_path()
@@ -287,9 +728,46 @@ class MainWindow:
         self.scene_view.apply_view_state(params)
 
 
-    def _make_screenshot_path(self):
+    def on_tracing_checked(self, is_checked: bool):
+        tracing.tracer.set_enabled(is_checked)
+        self._tracing_stats_refreshed = 0.0
+
+    def on_tracing_reset_clicked(self):
+        tracing.tracer.clear()
+        self.settings_panel.set_tracing_stats("")
+
+    def on_tracing_export_clicked(self):
+        path = os.path.abspath(self._make_trace_path())
+        tracing.tracer.export_chrome_trace(path)
+        self.settings_panel.set_tracing_stats(f"Trace written to {os.path.basename(path)}")
+
+    def _refresh_tracing_stats(self) -> bool:
+        # Tick handler; the stats text is rebuilt at most once a second.
+        if not tracing.tracer.enabled:
+            return False
+        now = time.monotonic()
+        if now - self._tracing_stats_refreshed < 1.0:
+            return False
+        self._tracing_stats_refreshed = now
+        self.settings_panel.set_tracing_stats(tracing.tracer.format_stats())
+        return False
+
+
+    def _make_screenshot_stem(self):
+        # Millisecond timestamp + running counter: burst frames never collide.
+        self._screenshot_counter += 1
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")[:-3]
+        return os.path.join("export", "screenshots", f"screenshot_{ts}_{self._screenshot_counter:04d}")
+
+
+    def _make_recording_dir(self):
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        return os.path.join("export", "recordings", ts)
+
+
+    def _make_trace_path(self):
         ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        return os.path.join("export", "screenshots", f"screenshot_{ts}.png")
+        return os.path.join("export", "traces", f"trace_{ts}.json")
 
 
     def _make_camera_path(self):
@@ -1,6 +1,26 @@
 import open3d.visualization.gui as gui
 import os
 
+from tools.mesh_edges import EDGE_MODES
+from tools.point_generators import POINT_DISTRIBUTIONS
+from tools.screenshot import IMAGE_ENCODINGS
+
+
+# Combobox labels; the combos list the keys in the order of the tools constants.
+IMAGE_ENCODING_LABELS = {"png_small": "PNG (small)", "png_fast": "PNG (fast)", "jpeg": "JPEG", "npy": "Raw .npy"}
+POINT_DISTRIBUTION_LABELS = {
+    "uniform": "Uniform cube",
+    "sphere": "Sphere surface",
+    "blobs": "Gaussian blobs",
+    "grid": "Grid",
+}
+EDGE_MODE_LABELS = {"all": "All", "boundary": "Boundary", "feature": "Feature (30°)"}
+IMAGE_ENCODING_KEYS = tuple(IMAGE_ENCODINGS)
+# Combobox order of the recording camera paths.
+RECORDING_SOURCE_KEYS = ("cameras", "turntable", "path")
+# Combobox order of the playback key pose sources.
+PLAYBACK_SOURCE_KEYS = ("views", "cameras")
+
 
 class SettingsPanel:
     def __init__(self, window):
@@ -25,7 +45,25 @@ class SettingsPanel:
         screenshot_row.add_child(screenshot_label)
         self.screenshot_button = _style_button(gui.Button("Save"))
         screenshot_row.add_child(self.screenshot_button)
+        self.screenshot_encoding_combo = gui.Combobox()
+        for key in IMAGE_ENCODING_KEYS:
+            self.screenshot_encoding_combo.add_item(IMAGE_ENCODING_LABELS[key])
+        self.screenshot_encoding_combo.selected_index = IMAGE_ENCODING_KEYS.index("png_fast")
+        screenshot_row.add_child(self.screenshot_encoding_combo)
         view_group.add_child(screenshot_row)
+
+        burst_row = gui.Horiz(0.25 * em)
+        self.burst_button = _style_button(gui.Button("Burst"))
+        burst_row.add_child(self.burst_button)
+        self.burst_count_edit = gui.NumberEdit(gui.NumberEdit.INT)
+        self.burst_count_edit.set_limits(2, 1000)
+        self.burst_count_edit.int_value = 10
+        burst_row.add_child(self.burst_count_edit)
+        burst_row.add_child(gui.Label("frames"))
+        view_group.add_child(burst_row)
+        # Background writer status (pending / written / dropped).
+        self.screenshot_status_label = gui.Label("")
+        view_group.add_child(self.screenshot_status_label)
         
         camera_label = gui.Label('Camera View')
         view_group.add_child(camera_label)
@@ -42,6 +80,91 @@ class SettingsPanel:
         self.widget.add_fixed(separation_height)
         self.widget.add_fixed(10)
 
+        ######################### Playback group #########################
+        playback_group = gui.CollapsableVert("Playback", 0.25 * em, gui.Margins(em, 0, 0, 0))
+        # Smooth path through saved views or camera records, precomputed once and
+        # stepped from the scene tick at a fixed rate.
+        playback_source_row = gui.Horiz(0.25 * em)
+        playback_source_row.add_child(gui.Label("Keys"))
+        self.playback_source_combo = gui.Combobox()
+        for label in ("Saved views", "Camera records"):
+            self.playback_source_combo.add_item(label)
+        self.playback_source_combo.selected_index = 0
+        playback_source_row.add_child(self.playback_source_combo)
+        playback_group.add_child(playback_source_row)
+
+        seconds_row = gui.Horiz(0.25 * em)
+        seconds_row.add_child(gui.Label("Seconds per key"))
+        self.playback_seconds_edit = gui.NumberEdit(gui.NumberEdit.DOUBLE)
+        self.playback_seconds_edit.set_limits(0.05, 60.0)
+        self.playback_seconds_edit.double_value = 1.0
+        seconds_row.add_child(self.playback_seconds_edit)
+        playback_group.add_child(seconds_row)
+
+        playback_fps_row = gui.Horiz(0.25 * em)
+        playback_fps_row.add_child(gui.Label("Path fps"))
+        self.playback_fps_edit = gui.NumberEdit(gui.NumberEdit.INT)
+        self.playback_fps_edit.set_limits(1, 240)
+        self.playback_fps_edit.int_value = 60
+        playback_fps_row.add_child(self.playback_fps_edit)
+        playback_group.add_child(playback_fps_row)
+
+        self.playback_loop_checkbox = gui.Checkbox("Loop")
+        self.playback_loop_checkbox.checked = False
+        playback_group.add_child(self.playback_loop_checkbox)
+
+        playback_row = gui.Horiz(0.25 * em)
+        self.play_path_button = _style_button(gui.Button("Play"))
+        playback_row.add_child(self.play_path_button)
+        self.stop_path_button = _style_button(gui.Button("Stop"))
+        playback_row.add_child(self.stop_path_button)
+        playback_group.add_child(playback_row)
+        self.playback_status_label = gui.Label("")
+        playback_group.add_child(self.playback_status_label)
+        self.widget.add_child(playback_group)
+        self.widget.add_fixed(10)
+
+        ######################### Recording group #########################
+        recording_group = gui.CollapsableVert("Recording", 0.25 * em, gui.Margins(em, 0, 0, 0))
+        # Frame sequence along the camera records, a turntable orbit of the current view
+        # or the playback path; frames use the screenshot format.
+        source_row = gui.Horiz(0.25 * em)
+        source_row.add_child(gui.Label("Path"))
+        self.recording_source_combo = gui.Combobox()
+        for label in ("Camera records", "Turntable", "Playback path"):
+            self.recording_source_combo.add_item(label)
+        self.recording_source_combo.selected_index = 1
+        source_row.add_child(self.recording_source_combo)
+        recording_group.add_child(source_row)
+
+        frames_row = gui.Horiz(0.25 * em)
+        frames_row.add_child(gui.Label("Turntable frames"))
+        self.recording_frames_edit = gui.NumberEdit(gui.NumberEdit.INT)
+        self.recording_frames_edit.set_limits(2, 10000)
+        self.recording_frames_edit.int_value = 120
+        frames_row.add_child(self.recording_frames_edit)
+        recording_group.add_child(frames_row)
+
+        fps_row = gui.Horiz(0.25 * em)
+        fps_row.add_child(gui.Label("Target fps"))
+        self.recording_fps_edit = gui.NumberEdit(gui.NumberEdit.INT)
+        self.recording_fps_edit.set_limits(1, 240)
+        self.recording_fps_edit.int_value = 30
+        fps_row.add_child(self.recording_fps_edit)
+        recording_group.add_child(fps_row)
+
+        recording_row = gui.Horiz(0.25 * em)
+        self.record_button = _style_button(gui.Button("Record"))
+        recording_row.add_child(self.record_button)
+        self.stop_recording_button = _style_button(gui.Button("Stop"))
+        recording_row.add_child(self.stop_recording_button)
+        recording_group.add_child(recording_row)
+        # Frame / fps / pending / dropped / late counts while recording, summary afterwards.
+        self.recording_status_label = gui.Label("")
+        recording_group.add_child(self.recording_status_label)
+        self.widget.add_child(recording_group)
+        self.widget.add_fixed(10)
+
         ######################### Scene group #########################
         scene_group = gui.CollapsableVert("Scene", 0.25 * em, gui.Margins(em, 0, 0, 0))
         self.black_background_checkbox = gui.Checkbox("Black background")
@@ -62,18 +185,48 @@ class SettingsPanel:
         self.ply_show_edges_checkbox.checked = True
         ply_row.add_child(self.ply_show_edges_checkbox)
         geometry_group.add_child(ply_row)
+        geometry_group.add_fixed(6)
+
+        edge_mode_row = gui.Horiz(0.25 * em)
+        edge_mode_row.add_child(gui.Label("Edges"))
+        self.ply_edge_mode_combo = gui.Combobox()
+        for key in EDGE_MODES:
+            self.ply_edge_mode_combo.add_item(EDGE_MODE_LABELS[key])
+        self.ply_edge_mode_combo.selected_index = 0
+        edge_mode_row.add_child(self.ply_edge_mode_combo)
+        geometry_group.add_child(edge_mode_row)
         geometry_group.add_fixed(10)
 
         point_count_row = gui.Horiz(0.25 * em)
         point_count_label = gui.Label("Point Count")
         point_count_row.add_child(point_count_label)
-        self.point_count_slider = gui.Slider(gui.Slider.INT)
-        self.point_count_slider.set_limits(100, 10000)
-        self.point_count_slider.int_value = 10000
-        point_count_row.add_child(self.point_count_slider)
+        # Typed rather than a slider: the useful range spans 100 .. 100M points.
+        self.point_count_edit = gui.NumberEdit(gui.NumberEdit.INT)
+        self.point_count_edit.set_limits(100, 100_000_000)
+        self.point_count_edit.int_value = 10000
+        point_count_row.add_child(self.point_count_edit)
         geometry_group.add_child(point_count_row)
         geometry_group.add_fixed(10)
 
+        distribution_row = gui.Horiz(0.25 * em)
+        distribution_row.add_child(gui.Label("Distribution"))
+        self.distribution_combo = gui.Combobox()
+        for key in POINT_DISTRIBUTIONS:
+            self.distribution_combo.add_item(POINT_DISTRIBUTION_LABELS[key])
+        self.distribution_combo.selected_index = 0
+        distribution_row.add_child(self.distribution_combo)
+        geometry_group.add_child(distribution_row)
+        geometry_group.add_fixed(6)
+
+        seed_row = gui.Horiz(0.25 * em)
+        seed_row.add_child(gui.Label("Seed"))
+        self.seed_edit = gui.NumberEdit(gui.NumberEdit.INT)
+        self.seed_edit.set_limits(0, 2**31 - 1)
+        self.seed_edit.int_value = 0
+        seed_row.add_child(self.seed_edit)
+        geometry_group.add_child(seed_row)
+        geometry_group.add_fixed(10)
+
         size_row = gui.Horiz(0.25 * em)
         size_label = gui.Label("Point Cloud Size")
         size_row.add_child(size_label)
@@ -86,6 +239,38 @@ class SettingsPanel:
 
         self.generate_button = _style_button(gui.Button("Update Point Cloud"))
         geometry_group.add_child(self.generate_button)
+        geometry_group.add_fixed(10)
+
+        # Out-of-core clouds: split a large PLY into octree chunks, then stream them.
+        ooc_row = gui.Horiz(0.25 * em)
+        ooc_row.add_child(gui.Label("Out-of-core"))
+        self.build_octree_button = _style_button(gui.Button("Build"))
+        ooc_row.add_child(self.build_octree_button)
+        self.open_octree_button = _style_button(gui.Button("Open"))
+        ooc_row.add_child(self.open_octree_button)
+        geometry_group.add_child(ooc_row)
+        geometry_group.add_fixed(6)
+
+        stream_budget_row = gui.Horiz(0.25 * em)
+        stream_budget_row.add_child(gui.Label("Stream MB"))
+        self.stream_budget_mb_slider = gui.Slider(gui.Slider.INT)
+        self.stream_budget_mb_slider.set_limits(128, 16384)
+        self.stream_budget_mb_slider.int_value = 1024
+        stream_budget_row.add_child(self.stream_budget_mb_slider)
+        geometry_group.add_child(stream_budget_row)
+        geometry_group.add_fixed(6)
+
+        # Progress of background geometry tasks (PLY import, point generation, octree build);
+        # Cancel stops a running PLY import.
+        self.geometry_task_label = gui.Label("")
+        geometry_group.add_child(self.geometry_task_label)
+        geometry_task_row = gui.Horiz(0.25 * em)
+        self.geometry_task_progress = gui.ProgressBar()
+        self.geometry_task_progress.value = 0.0
+        geometry_task_row.add_child(self.geometry_task_progress)
+        self.geometry_task_cancel_button = _style_button(gui.Button("Cancel"))
+        geometry_task_row.add_child(self.geometry_task_cancel_button)
+        geometry_group.add_child(geometry_task_row)
 
         self.widget.add_child(geometry_group)
         self.widget.add_fixed(separation_height)
@@ -101,6 +286,29 @@ class SettingsPanel:
         self.camera_scale_slider.double_value = 1.0
         camera_scale_row.add_child(self.camera_scale_slider)
         cameras_group.add_child(camera_scale_row)
+        cameras_group.add_fixed(6)
+
+        # One packed LineSet for all frustums (scales to thousands of cameras).
+        self.batch_frustums_checkbox = gui.Checkbox("Batch frustums")
+        self.batch_frustums_checkbox.checked = False
+        cameras_group.add_child(self.batch_frustums_checkbox)
+        # Downscaled image planes packed into shared atlas textures.
+        self.atlas_images_checkbox = gui.Checkbox("Image atlas")
+        self.atlas_images_checkbox.checked = False
+        cameras_group.add_child(self.atlas_images_checkbox)
+        # Hide camera geometry whose center is outside the view frustum.
+        self.cull_cameras_checkbox = gui.Checkbox("Cull cameras outside view")
+        self.cull_cameras_checkbox.checked = False
+        cameras_group.add_child(self.cull_cameras_checkbox)
+        cameras_group.add_fixed(6)
+
+        image_cache_row = gui.Horiz(0.25 * em)
+        image_cache_row.add_child(gui.Label("Image cache (MB)"))
+        self.image_cache_mb_slider = gui.Slider(gui.Slider.INT)
+        self.image_cache_mb_slider.set_limits(64, 8192)
+        self.image_cache_mb_slider.int_value = 512
+        image_cache_row.add_child(self.image_cache_mb_slider)
+        cameras_group.add_child(image_cache_row)
         cameras_group.add_fixed(10)
 
         self.add_camera_from_scene_button = _style_button(gui.Button("Add from scene"))
@@ -148,12 +356,54 @@ class SettingsPanel:
         cameras_group.add_child(self.delete_selected_camera_button)
         cameras_group.add_fixed(6)
 
+        # Opens the full-resolution image (the scene only shows thumbnails).
+        self.inspect_camera_image_button = _style_button(gui.Button("Inspect selected camera image"))
+        cameras_group.add_child(self.inspect_camera_image_button)
+        cameras_group.add_fixed(6)
+
+        self.select_nearest_camera_button = _style_button(gui.Button("Select nearest camera"))
+        cameras_group.add_child(self.select_nearest_camera_button)
+        cameras_group.add_fixed(6)
+
+        format_row = gui.Horiz(0.25 * em)
+        format_row.add_child(gui.Label("Set format"))
+        self.camera_set_format_combo = gui.Combobox()
+        # Index + 1 == cameras.json "version".
+        self.camera_set_format_combo.add_item("JSON (v1)")
+        self.camera_set_format_combo.add_item("Arrays (v2)")
+        self.camera_set_format_combo.selected_index = 0
+        format_row.add_child(self.camera_set_format_combo)
+        cameras_group.add_child(format_row)
+        cameras_group.add_fixed(6)
+
+        encoding_row = gui.Horiz(0.25 * em)
+        encoding_row.add_child(gui.Label("Images"))
+        self.image_encoding_combo = gui.Combobox()
+        for key in IMAGE_ENCODING_KEYS:
+            self.image_encoding_combo.add_item(IMAGE_ENCODING_LABELS[key])
+        self.image_encoding_combo.selected_index = IMAGE_ENCODING_KEYS.index("png_fast")
+        encoding_row.add_child(self.image_encoding_combo)
+        cameras_group.add_child(encoding_row)
+        cameras_group.add_fixed(6)
+
         export_row = gui.Horiz(0.25 * em)
         self.export_camera_set_button = _style_button(gui.Button("Export camera set"))
         export_row.add_child(self.export_camera_set_button)
         self.import_camera_set_button = _style_button(gui.Button("Import camera set"))
         export_row.add_child(self.import_camera_set_button)
         cameras_group.add_child(export_row)
+        cameras_group.add_fixed(6)
+
+        # Progress of background camera tasks (export/import).
+        self.task_label = gui.Label("")
+        cameras_group.add_child(self.task_label)
+        task_row = gui.Horiz(0.25 * em)
+        self.task_progress = gui.ProgressBar()
+        self.task_progress.value = 0.0
+        task_row.add_child(self.task_progress)
+        self.task_cancel_button = _style_button(gui.Button("Cancel"))
+        task_row.add_child(self.task_cancel_button)
+        cameras_group.add_child(task_row)
 
         self.widget.add_child(cameras_group)
         self.widget.add_fixed(separation_height)
@@ -178,6 +428,26 @@ class SettingsPanel:
         self.widget.add_child(visibility_group)
         self.widget.add_fixed(10)
 
+        ######################### Tracing group #########################
+        tracing_group = gui.CollapsableVert("Tracing", 0.25 * em, gui.Margins(em, 0, 0, 0))
+        # Off by default: spans around scene/camera operations (tools.tracing).
+        self.tracing_checkbox = gui.Checkbox("Record spans")
+        self.tracing_checkbox.checked = False
+        tracing_group.add_child(self.tracing_checkbox)
+        tracing_group.add_fixed(6)
+        # Rolling stats (mean / p95 / max over recent spans), refreshed from the scene tick.
+        self.tracing_stats_label = gui.Label("")
+        tracing_group.add_child(self.tracing_stats_label)
+        tracing_group.add_fixed(6)
+        tracing_row = gui.Horiz(0.25 * em)
+        self.tracing_reset_button = _style_button(gui.Button("Reset"))
+        tracing_row.add_child(self.tracing_reset_button)
+        self.tracing_export_button = _style_button(gui.Button("Export trace"))
+        tracing_row.add_child(self.tracing_export_button)
+        tracing_group.add_child(tracing_row)
+        self.widget.add_child(tracing_group)
+        self.widget.add_fixed(10)
+
         self._visibility_tree_items: dict[str, object] = {}
         self._visibility_tree_cells: dict[str, object] = {}
         self._visibility_tree_item_to_name: dict[object, str] = {}
@@ -217,6 +487,41 @@ class SettingsPanel:
         else:
             self.selected_capture_file_edit.text_value = ""
 
+    def get_image_encoding(self) -> str:
+        return IMAGE_ENCODING_KEYS[self.image_encoding_combo.selected_index]
+
+    def get_screenshot_encoding(self) -> str:
+        return IMAGE_ENCODING_KEYS[self.screenshot_encoding_combo.selected_index]
+
+    def get_recording_source(self) -> str:
+        return RECORDING_SOURCE_KEYS[self.recording_source_combo.selected_index]
+
+    def get_playback_source(self) -> str:
+        return PLAYBACK_SOURCE_KEYS[self.playback_source_combo.selected_index]
+
+    def set_playback_status(self, text: str):
+        self.playback_status_label.text = text
+
+    def set_recording_status(self, text: str):
+        self.recording_status_label.text = text
+
+    def get_point_distribution(self) -> str:
+        return POINT_DISTRIBUTIONS[self.distribution_combo.selected_index]
+
+    def get_edge_mode(self) -> str:
+        return EDGE_MODES[self.ply_edge_mode_combo.selected_index]
+
+    def set_task_progress(self, text: str, fraction: float):
+        self.task_label.text = text
+        self.task_progress.value = min(max(float(fraction), 0.0), 1.0)
+
+    def set_geometry_task_progress(self, text: str, fraction: float):
+        self.geometry_task_label.text = text
+        self.geometry_task_progress.value = min(max(float(fraction), 0.0), 1.0)
+
+    def set_tracing_stats(self, text: str):
+        self.tracing_stats_label.text = text
+
     def set_on_delete_geometry_requested(self, callback):
         """callback(name: str) -> None"""
         self._on_delete_geometry_requested = callback
@@ -276,6 +581,17 @@ class SettingsPanel:
         if self._selected_camera_index == idx:
             self._selected_camera_index = None
 
+    def select_camera_item(self, idx: int):
+        item = self._camera_tree_items.get(idx)
+        if item is None:
+            return
+        self._selected_camera_index = idx
+        # Not every Open3D build exposes a settable selection.
+        try:
+            self.cameras_tree_view.selected_item = item
+        except Exception:
+            pass
+
     def list_camera_indices(self) -> list[int]:
         return sorted(self._camera_tree_items.keys())
 
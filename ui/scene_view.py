@@ -1,9 +1,324 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import open3d as o3d
 import open3d.visualization.gui as gui
 import open3d.visualization.rendering as rendering
 
-from tools.camera_math import to_o3d_extrinsic_from_c2w, create_camera_intrinsic_from_size
+from tools.camera_math import to_o3d_extrinsic_from_c2w, create_camera_intrinsic_from_size, frustum_planes
+from tools.point_lod import bounds_center_extent, build_lod_pyramid, point_count, select_lod_level
+from tools.pointcloud_octree import BYTES_PER_POINT, load_chunk_point_cloud, select_chunks
+from tools.tracing import traced
+
+
+class LineSetBatch:
+    """
+    Packs many small LineSets into a single LineSet so the renderer sees one draw
+    geometry instead of thousands. Each member owns a contiguous point/line range
+    in the packed buffers; visibility, color and deletion edit those buffers.
+    Deleted ranges are only masked out; `compact()` (run by `to_geometry`, i.e.
+    once per flush) drops them all in one pass.
+    """
+
+    def __init__(self):
+        self._points = np.zeros((0, 3), dtype=np.float64)
+        self._lines = np.zeros((0, 2), dtype=np.int32)
+        self._colors = np.zeros((0, 3), dtype=np.float64)
+        self._line_visible = np.zeros(0, dtype=bool)
+        # False for ranges of removed members, until the next compact().
+        self._point_alive = np.zeros(0, dtype=bool)
+        self._line_alive = np.zeros(0, dtype=bool)
+        self._has_dead = False
+        # Bumped on every edit; lets the owner skip re-uploading an unchanged batch.
+        self.version = 0
+        # name -> [point_start, point_count, line_start, line_count] (insertion order == buffer order)
+        self._ranges: dict[str, list[int]] = {}
+        self._visible: dict[str, bool] = {}
+        # View-culled members: not drawn, but keep their visibility flag.
+        self._culled: set[str] = set()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ranges
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def names(self) -> list[str]:
+        return list(self._ranges.keys())
+
+    def get_line_range(self, name: str) -> tuple[int, int] | None:
+        r = self._ranges.get(name)
+        if r is None:
+            return None
+        return r[2], r[3]
+
+    def upsert(self, name: str, lineset: o3d.geometry.LineSet):
+        points = np.asarray(lineset.points, dtype=np.float64)
+        lines = np.asarray(lineset.lines, dtype=np.int32)
+        if lineset.has_colors():
+            colors = np.asarray(lineset.colors, dtype=np.float64)
+        else:
+            colors = np.zeros((len(lines), 3), dtype=np.float64)
+
+        r = self._ranges.get(name)
+        if r is not None and r[1] == len(points) and r[3] == len(lines):
+            # Same layout (e.g. rerender/rescale): overwrite the range in place.
+            p0, pn, l0, ln = r
+            self._points[p0:p0 + pn] = points
+            self._lines[l0:l0 + ln] = lines + p0
+            self._colors[l0:l0 + ln] = colors
+            self.version += 1
+            return
+
+        was_visible = self._visible.get(name, True)
+        if r is not None:
+            self.remove(name)
+
+        p0 = len(self._points)
+        l0 = len(self._lines)
+        self._points = np.concatenate([self._points, points])
+        self._lines = np.concatenate([self._lines, lines + p0])
+        self._colors = np.concatenate([self._colors, colors])
+        shown = was_visible and name not in self._culled
+        self._line_visible = np.concatenate([self._line_visible, np.full(len(lines), shown)])
+        self._point_alive = np.concatenate([self._point_alive, np.ones(len(points), dtype=bool)])
+        self._line_alive = np.concatenate([self._line_alive, np.ones(len(lines), dtype=bool)])
+        self._ranges[name] = [p0, len(points), l0, len(lines)]
+        self._visible[name] = was_visible
+        self.version += 1
+
+    def remove(self, name: str):
+        r = self._ranges.pop(name, None)
+        self._visible.pop(name, None)
+        self._culled.discard(name)
+        if r is None:
+            return
+        p0, pn, l0, ln = r
+        self._point_alive[p0:p0 + pn] = False
+        self._line_alive[l0:l0 + ln] = False
+        self._line_visible[l0:l0 + ln] = False
+        self._has_dead = True
+        self.version += 1
+
+    def compact(self):
+        """Drop the ranges of removed members and shift the others down."""
+        if not self._has_dead:
+            return
+        # kept_before[i]: surviving entries before index i, i.e. the new index of a surviving i.
+        points_before = np.concatenate([[0], np.cumsum(self._point_alive)])
+        lines_before = np.concatenate([[0], np.cumsum(self._line_alive)])
+        line_keep = self._line_alive
+        self._points = self._points[self._point_alive]
+        self._lines = points_before[self._lines[line_keep]].astype(np.int32)
+        self._colors = self._colors[line_keep]
+        self._line_visible = self._line_visible[line_keep]
+        self._point_alive = np.ones(len(self._points), dtype=bool)
+        self._line_alive = np.ones(len(self._lines), dtype=bool)
+        self._has_dead = False
+        for r in self._ranges.values():
+            r[0] = int(points_before[r[0]])
+            r[2] = int(lines_before[r[2]])
+
+    def is_visible(self, name: str) -> bool:
+        return self._visible.get(name, False)
+
+    def set_visible(self, name: str, visible: bool):
+        r = self._ranges.get(name)
+        if r is None:
+            return
+        self._visible[name] = bool(visible)
+        self._line_visible[r[2]:r[2] + r[3]] = bool(visible) and name not in self._culled
+        self.version += 1
+
+    def set_culled(self, name: str, culled: bool):
+        r = self._ranges.get(name)
+        if r is None:
+            return
+        if culled:
+            self._culled.add(name)
+        else:
+            self._culled.discard(name)
+        self._line_visible[r[2]:r[2] + r[3]] = self._visible[name] and not culled
+        self.version += 1
+
+    def set_color(self, name: str, color):
+        r = self._ranges.get(name)
+        if r is None:
+            return
+        self._colors[r[2]:r[2] + r[3]] = np.asarray(color, dtype=np.float64)[:3]
+        self.version += 1
+
+    def get_member(self, name: str) -> o3d.geometry.LineSet | None:
+        r = self._ranges.get(name)
+        if r is None:
+            return None
+        p0, pn, l0, ln = r
+        lineset = o3d.geometry.LineSet()
+        lineset.points = o3d.utility.Vector3dVector(self._points[p0:p0 + pn])
+        lineset.lines = o3d.utility.Vector2iVector(self._lines[l0:l0 + ln] - p0)
+        lineset.colors = o3d.utility.Vector3dVector(self._colors[l0:l0 + ln])
+        return lineset
+
+    def has_shown_members(self) -> bool:
+        return bool(self._line_visible.any())
+
+    def to_geometry(self) -> o3d.geometry.LineSet:
+        self.compact()
+        # Hidden members keep their points; only their lines are dropped.
+        mask = self._line_visible
+        lineset = o3d.geometry.LineSet()
+        lineset.points = o3d.utility.Vector3dVector(self._points)
+        lineset.lines = o3d.utility.Vector2iVector(self._lines[mask])
+        lineset.colors = o3d.utility.Vector3dVector(self._colors[mask])
+        return lineset
+
+
+def fit_image_to_tile(img: np.ndarray, tile_size: tuple[int, int]) -> np.ndarray:
+    """Nearest-neighbour resize to (tile_w, tile_h) as uint8 RGB."""
+    img = np.asarray(img)
+    if img.ndim == 2:
+        img = np.repeat(img[:, :, None], 3, axis=2)
+    img = img[:, :, :3]
+    if img.dtype != np.uint8:
+        scale = 255.0 if img.dtype.kind == "f" else 255.0 / np.iinfo(img.dtype).max
+        img = np.clip(img * scale, 0, 255).astype(np.uint8)
+    tile_w, tile_h = tile_size
+    if img.shape[0] == tile_h and img.shape[1] == tile_w:
+        return img
+    ys = (np.arange(tile_h) * img.shape[0]) // tile_h
+    xs = (np.arange(tile_w) * img.shape[1]) // tile_w
+    return img[ys[:, None], xs[None, :]]
+
+
+class TexturedQuadAtlas:
+    """
+    One shared texture page holding downscaled images in a grid of tiles.
+    All member quads are drawn as a single TriangleMesh whose UVs address the
+    member's tile, so N image planes cost one mesh, one material, one texture.
+    """
+
+    # Per-corner UVs inside a tile. Same V flip as camera_viz.create_camera_geometry.
+    _CORNER_UVS = np.array([[0, 1], [1, 1], [1, 0], [0, 0]], dtype=np.float64)
+
+    def __init__(self, page_size: int = 2048, tile_size: tuple[int, int] = (256, 160)):
+        self.page_size = int(page_size)
+        self.tile_size = (int(tile_size[0]), int(tile_size[1]))
+        self._cols = self.page_size // self.tile_size[0]
+        rows = self.page_size // self.tile_size[1]
+        self._page = np.zeros((self.page_size, self.page_size, 3), dtype=np.uint8)
+        self._free_slots = list(range(self._cols * rows))[::-1]
+        self._slots: dict[str, int] = {}
+        self._corners: dict[str, np.ndarray] = {}
+        self._visible: dict[str, bool] = {}
+        self._culled: set[str] = set()
+        # Page texture handed to the scene; replaced only when a tile changes, so
+        # flushes that only show/hide/cull members reuse the uploaded texture.
+        self._texture: o3d.geometry.Image | None = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def names(self) -> list[str]:
+        return list(self._slots.keys())
+
+    def has_free_slot(self) -> bool:
+        return len(self._free_slots) > 0
+
+    def _tile_origin(self, slot: int) -> tuple[int, int]:
+        return (slot % self._cols) * self.tile_size[0], (slot // self._cols) * self.tile_size[1]
+
+    def _tile_uvs(self, slot: int) -> np.ndarray:
+        x0, y0 = self._tile_origin(slot)
+        tw, th = self.tile_size
+        # Inset by half a texel so bilinear sampling doesn't bleed into neighbours.
+        u = (x0 + 0.5 + self._CORNER_UVS[:, 0] * (tw - 1)) / self.page_size
+        v = (y0 + 0.5 + self._CORNER_UVS[:, 1] * (th - 1)) / self.page_size
+        return np.stack([u, v], axis=1)
+
+    def upsert(self, name: str, corners: np.ndarray, image: np.ndarray):
+        """corners: (4,3) plane corners in camera_viz order; image: any size."""
+        slot = self._slots.get(name)
+        if slot is None:
+            if not self._free_slots:
+                raise ValueError("Atlas page is full")
+            slot = self._free_slots.pop()
+            self._slots[name] = slot
+            self._visible[name] = True
+        x0, y0 = self._tile_origin(slot)
+        tw, th = self.tile_size
+        self._page[y0:y0 + th, x0:x0 + tw] = fit_image_to_tile(image, self.tile_size)
+        self._texture = None
+        self._corners[name] = np.asarray(corners, dtype=np.float64).reshape(4, 3)
+
+    def remove(self, name: str):
+        slot = self._slots.pop(name, None)
+        self._corners.pop(name, None)
+        self._visible.pop(name, None)
+        self._culled.discard(name)
+        if slot is not None:
+            self._free_slots.append(slot)
+
+    def is_visible(self, name: str) -> bool:
+        return self._visible.get(name, False)
+
+    def set_visible(self, name: str, visible: bool):
+        if name in self._slots:
+            self._visible[name] = bool(visible)
+
+    def set_culled(self, name: str, culled: bool):
+        if name not in self._slots:
+            return
+        if culled:
+            self._culled.add(name)
+        else:
+            self._culled.discard(name)
+
+    @property
+    def texture(self) -> o3d.geometry.Image:
+        """The page as an Image; the same object until a tile is written."""
+        if self._texture is None:
+            self._texture = o3d.geometry.Image(np.ascontiguousarray(self._page))
+        return self._texture
+
+    def has_shown_members(self) -> bool:
+        return any(self._visible.get(n, True) and n not in self._culled for n in self._slots)
+
+    def _build_mesh(self, names: list[str], texture: o3d.geometry.Image, uvs_of) -> o3d.geometry.TriangleMesh:
+        count = len(names)
+        mesh = o3d.geometry.TriangleMesh()
+        vertices = np.zeros((4 * count, 3), dtype=np.float64)
+        uvs = np.zeros((count, 4, 2), dtype=np.float64)
+        for k, name in enumerate(names):
+            vertices[4 * k:4 * k + 4] = self._corners[name]
+            uvs[k] = uvs_of(name)
+        base = 4 * np.arange(count, dtype=np.int32)[:, None]
+        triangles = np.concatenate([base + [0, 1, 2], base + [0, 2, 3]], axis=1).reshape(-1, 3)
+        # triangle_uvs are per triangle-vertex, in triangle order.
+        tri_uvs = uvs[:, [0, 1, 2, 0, 2, 3]].reshape(-1, 2)
+        mesh.vertices = o3d.utility.Vector3dVector(vertices)
+        mesh.triangles = o3d.utility.Vector3iVector(triangles)
+        mesh.triangle_uvs = o3d.utility.Vector2dVector(tri_uvs)
+        mesh.triangle_material_ids = o3d.utility.IntVector(np.zeros(len(triangles), dtype=np.int32))
+        mesh.textures = [texture]
+        mesh.compute_vertex_normals()
+        return mesh
+
+    def get_member(self, name: str) -> o3d.geometry.TriangleMesh | None:
+        slot = self._slots.get(name)
+        if slot is None:
+            return None
+        x0, y0 = self._tile_origin(slot)
+        tw, th = self.tile_size
+        tile = o3d.geometry.Image(np.ascontiguousarray(self._page[y0:y0 + th, x0:x0 + tw]))
+        return self._build_mesh([name], tile, lambda _: self._CORNER_UVS)
+
+    def to_geometry(self) -> o3d.geometry.TriangleMesh:
+        names = [n for n in self._slots if self._visible.get(n, True) and n not in self._culled]
+        return self._build_mesh(names, self.texture, lambda n: self._tile_uvs(self._slots[n]))
 
 
 class SceneWidget:
@@ -16,7 +331,60 @@ class SceneWidget:
         # Registry so UI can hide/show geometries without losing the geometry objects.
         self._geometries: dict[str, o3d.geometry.Geometry] = {}
         self._materials: dict[str, rendering.MaterialRecord] = {}
+        # Shared materials: key -> [MaterialRecord, texture owner (kept alive), ref count].
+        # Geometries with equal shader/point size/line width/color/texture share one record.
+        self._material_cache: dict[tuple, list] = {}
+        self._material_key_of: dict[str, tuple] = {}
         self._visible: dict[str, bool] = {}
+        # Batched layers: many logical geometries ("members") drawn as one scene object.
+        # Batch objects: LineSetBatch / TexturedQuadAtlas
+        # (upsert/remove/set_visible/set_culled/has_shown_members/to_geometry).
+        self._batches: dict[str, object] = {}
+        self._batch_of_member: dict[str, str] = {}
+        # Batches edited with flush=False, uploaded by flush_dirty_batches().
+        self._dirty_batches: set[str] = set()
+        # Batch `version` last uploaded to the scene (batches that have one).
+        self._batch_versions: dict[str, int] = {}
+        # Names hidden by view culling (see set_culled); independent of visibility.
+        self._culled: set[str] = set()
+        # Point clouds currently in the scene (outside LOD): name -> (count, has_colors, has_normals).
+        # A same-signature update of a tensor upload re-fills its GPU buffers in place (see update_geometry).
+        self._scene_signature: dict[str, tuple[int, bool, bool]] = {}
+        self._scene_tensor: set[str] = set()
+        # Their axis-aligned bounds at upload: Scene.update_geometry doesn't refresh
+        # the scene's bounding box, so only updates that stay inside it go in place.
+        self._scene_bounds: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        # Names that received a same-layout update: their legacy clouds are uploaded as
+        # tensor clouds from then on (converting costs a full copy, so only when it pays off).
+        self._in_place_names: set[str] = set()
+        # Open3DScene keeps a downsampled "fast" copy of larger clouds that in-place
+        # updates wouldn't refresh; those always take the rebuild path.
+        self.in_place_max_points = 6_000_000
+        # Level-of-detail pyramids for large point clouds: name -> [finest, ..., coarsest].
+        # The registry keeps the full-resolution geometry; the scene shows one level.
+        self._lod: dict[str, list[o3d.geometry.PointCloud]] = {}
+        self._lod_level: dict[str, int] = {}
+        self._lod_bounds: dict[str, tuple[np.ndarray, float]] = {}
+        # Every level of a shown pyramid is its own scene object f"{name}__lod{k}", uploaded
+        # once; switching levels only toggles which one is shown. name -> scene names.
+        self._lod_scene_names: dict[str, list[str]] = {}
+        self.lod_point_threshold = 2_000_000
+        self.lod_point_budget = 4_000_000
+        # Out-of-core clouds streamed from an octree manifest (tools.pointcloud_octree):
+        # name -> {"manifest", "budget_points", "visible", "loaded", "pending", "failed",
+        # "wanted" (sets of chunk indices), "dirty": bool}.
+        # Resident chunks are ordinary named geometries f"{name}_chunk_{i}". Chunks are
+        # read on a worker pool and added on the GUI thread (post_to_main_thread).
+        self._streams: dict[str, dict] = {}
+        self.stream_chunk_loads_in_flight = 2
+        self._stream_pool: ThreadPoolExecutor | None = None
+        # Camera motion tracking, polled from the window tick event.
+        self.camera_settle_seconds = 0.3
+        self._last_camera_matrix: np.ndarray | None = None
+        self._last_camera_change = 0.0
+        # Frame capture (recording): finest LOD level, camera never counts as moving.
+        self._capture_mode = False
+        self._tick_handlers: list = []
 
 
     def init(self, fov_deg=60):
@@ -34,6 +402,8 @@ class SceneWidget:
         )
         center = (self._bbox_origin + self._bbox_size / 2).tolist()
         self.widget.setup_camera(fov_deg, bbox, center)
+        if hasattr(w, "set_on_tick_event"):
+            w.set_on_tick_event(self._on_tick)
 
     def set_background_color(self, rgba: list[float]):
         """
@@ -58,18 +428,37 @@ class SceneWidget:
             except Exception:
                 pass
 
-    def _make_material(self, geometry) -> rendering.MaterialRecord:
-        material = rendering.MaterialRecord()
+    def _material_spec(self, geometry, texture_owner=None) -> tuple[tuple, np.ndarray | None]:
+        """
+        (key, texture) describing the material `geometry` needs. The texture
+        part of the key is the id of the object that owns the texture:
+        `texture_owner` if given, else the geometry (Open3D may hand out a fresh
+        buffer on every access, so buffer addresses are no identity); the cache
+        keeps that object alive so the id can't be reused.
+        """
+        shader = ""
+        point_size = 0.0
+        line_width = 0.0
+        base_color = (1.0, 1.0, 1.0, 1.0)
+        texture = None
         # Make default visuals "just work" for typical template geometries.
         # - Point clouds should show per-point colors without relying on lighting.
         # - Colored meshes (e.g., coordinate frame) should also render with colors.
-        if isinstance(geometry, o3d.geometry.PointCloud):
-            material.shader = "defaultUnlit"
-            material.point_size = 3.0
-        elif isinstance(geometry, o3d.geometry.LineSet):
+        if isinstance(geometry, (o3d.geometry.PointCloud, o3d.t.geometry.PointCloud)):
+            shader = "defaultUnlit"
+            point_size = 3.0
+        elif isinstance(geometry, (o3d.geometry.LineSet, o3d.t.geometry.LineSet)):
             # Camera frustums etc.
-            material.shader = "unlitLine"
-            material.line_width = 2.0
+            shader = "unlitLine"
+            line_width = 2.0
+        elif isinstance(geometry, o3d.t.geometry.TriangleMesh):
+            # Tensor meshes carry their texture in the mesh material (see camera_viz).
+            has_uvs = geometry.triangle.contains("texture_uvs")
+            if has_uvs and geometry.has_valid_material() and "albedo" in geometry.material.texture_maps:
+                shader = "defaultUnlit"
+                texture = geometry.material.texture_maps["albedo"].as_tensor().numpy()
+            elif geometry.vertex.contains("colors"):
+                shader = "defaultUnlit"
         elif isinstance(geometry, o3d.geometry.TriangleMesh):
             # If this mesh has a texture + UVs (e.g. camera image plane), we must
             # explicitly set the albedo texture for Open3DScene rendering.
@@ -77,80 +466,389 @@ class SceneWidget:
             has_textures = textures is not None and len(textures) > 0
             has_uvs = hasattr(geometry, "has_triangle_uvs") and geometry.has_triangle_uvs()
             if has_textures and has_uvs:
-                material.shader = "defaultUnlit"
-                material.base_color = [1.0, 1.0, 1.0, 1.0]
-                # NOTE: In some Open3D builds, mesh.textures[i] returns a non-owned
-                # pybind reference ("non-held"). MaterialRecord requires a held Image.
-                # Create a fresh, owned legacy Image copy.
-                tex0 = textures[0]
-                material.albedo_img = o3d.geometry.Image(np.asarray(tex0))
+                shader = "defaultUnlit"
+                texture = np.asarray(textures[0])
             elif geometry.has_vertex_colors():
-                material.shader = "defaultUnlit"
+                shader = "defaultUnlit"
+        texture_key = None
+        if texture is not None:
+            texture_key = id(texture_owner if texture_owner is not None else geometry)
+        return (shader, point_size, line_width, base_color, texture_key), texture
+
+    @traced("scene._make_material")
+    def _make_material(self, key: tuple, texture: np.ndarray | None) -> rendering.MaterialRecord:
+        shader, point_size, line_width, base_color, _ = key
+        material = rendering.MaterialRecord()
+        if shader:
+            material.shader = shader
+        if point_size:
+            material.point_size = point_size
+        if line_width:
+            material.line_width = line_width
+        if texture is not None:
+            material.base_color = list(base_color)
+            # NOTE: In some Open3D builds, mesh.textures[i] returns a non-owned
+            # pybind reference ("non-held"). MaterialRecord requires a held Image.
+            # Create a fresh, owned legacy Image copy (once per unique texture).
+            material.albedo_img = o3d.geometry.Image(np.ascontiguousarray(texture))
         return material
 
+    def _acquire_material(self, name: str, geometry, texture_owner=None):
+        key, texture = self._material_spec(geometry, texture_owner)
+        if self._material_key_of.get(name) == key:
+            return
+        self._release_material(name)
+        entry = self._material_cache.get(key)
+        if entry is None:
+            owner = texture_owner if texture_owner is not None else geometry
+            entry = [self._make_material(key, texture), owner if texture is not None else None, 0]
+            self._material_cache[key] = entry
+        entry[2] += 1
+        self._material_key_of[name] = key
+        self._materials[name] = entry[0]
+
+    def _release_material(self, name: str):
+        self._materials.pop(name, None)
+        key = self._material_key_of.pop(name, None)
+        if key is None:
+            return
+        entry = self._material_cache[key]
+        entry[2] -= 1
+        if entry[2] <= 0:
+            del self._material_cache[key]
+
+    # Scene access goes through these so a SceneWidget without init() (no window)
+    # still works as a plain geometry registry, e.g. for headless rendering.
+    def _scene_has(self, name: str) -> bool:
+        if name in self._lod_scene_names:
+            return True
+        return self.widget is not None and self.widget.scene.has_geometry(name)
+
+    def _scene_remove(self, name: str):
+        self._scene_signature.pop(name, None)
+        self._scene_tensor.discard(name)
+        self._scene_bounds.pop(name, None)
+        for level_name in self._lod_scene_names.pop(name, []):
+            self.widget.scene.remove_geometry(level_name)
+        if self.widget is not None and self.widget.scene.has_geometry(name):
+            self.widget.scene.remove_geometry(name)
+
+    @staticmethod
+    def _point_cloud_signature(geometry) -> tuple[int, bool, bool] | None:
+        if isinstance(geometry, o3d.geometry.PointCloud):
+            return len(geometry.points), geometry.has_colors(), geometry.has_normals()
+        if isinstance(geometry, o3d.t.geometry.PointCloud):
+            point = geometry.point
+            return point.positions.shape[0], point.contains("colors"), point.contains("normals")
+        return None
+
+    @staticmethod
+    def _point_cloud_bounds(geometry) -> tuple[np.ndarray, np.ndarray] | None:
+        if isinstance(geometry, o3d.geometry.PointCloud):
+            positions = np.asarray(geometry.points)
+        else:
+            positions = geometry.point.positions.numpy()
+        if positions.shape[0] == 0:
+            return None
+        return positions.min(axis=0), positions.max(axis=0)
+
+    def _display_geometry(self, name: str):
+        levels = self._lod.get(name)
+        if levels:
+            return levels[self._lod_level.get(name, len(levels) - 1)]
+        return self._geometries.get(name)
+
     def _add_to_scene(self, name: str):
-        geometry = self._geometries.get(name)
+        geometry = self._display_geometry(name)
         material = self._materials.get(name)
-        if geometry is None or material is None:
+        if geometry is None or material is None or self.widget is None or name in self._culled:
+            return
+        levels = self._lod.get(name)
+        if levels:
+            level_names = [f"{name}__lod{k}" for k in range(len(levels))]
+            shown = self._lod_level.get(name, len(levels) - 1)
+            for k, (level_name, level) in enumerate(zip(level_names, levels)):
+                self.widget.scene.add_geometry(level_name, level, material)
+                self.widget.scene.show_geometry(level_name, k == shown)
+            self._lod_scene_names[name] = level_names
             return
+        if name in self._in_place_names and isinstance(geometry, o3d.geometry.PointCloud):
+            # Upload as a tensor cloud so the next same-size updates can go in place.
+            geometry = o3d.t.geometry.PointCloud.from_legacy(geometry)
         self.widget.scene.add_geometry(name, geometry, material)
+        signature = self._point_cloud_signature(geometry)
+        if signature is not None and name not in self._lod:
+            self._scene_signature[name] = signature
+            self._scene_bounds[name] = self._point_cloud_bounds(geometry)
+            if isinstance(geometry, o3d.t.geometry.PointCloud):
+                self._scene_tensor.add(name)
+
+    def _update_in_place(self, name: str, geometry) -> bool:
+        """
+        Refill the GPU buffers of point cloud `name` from `geometry` when it has
+        the same point count and attributes as what's in the scene (positions,
+        colors and normals may differ) and stays inside the uploaded bounds.
+        Returns False when a rebuild is needed.
+        """
+        signature = self._point_cloud_signature(geometry)
+        if signature is None or signature != self._scene_signature.get(name) or not self._scene_has(name):
+            return False
+        if signature[0] > min(self.lod_point_threshold, self.in_place_max_points):
+            # Needs a fresh LOD pyramid / the scene's fast copy would go stale.
+            return False
+        bounds = self._point_cloud_bounds(geometry)
+        uploaded = self._scene_bounds.get(name)
+        if bounds is None or uploaded is None or np.any(bounds[0] < uploaded[0]) or np.any(bounds[1] > uploaded[1]):
+            # Camera reset and picking use the scene's bounding box: re-add to grow it.
+            return False
+        self._in_place_names.add(name)
+        if name not in self._scene_tensor:
+            # Uploaded as legacy: this update rebuilds it as a tensor cloud, later ones go in place.
+            return False
+        if isinstance(geometry, o3d.geometry.PointCloud):
+            tensor_geometry = o3d.t.geometry.PointCloud.from_legacy(geometry)
+        else:
+            tensor_geometry = geometry
+        flags = rendering.Scene.UPDATE_POINTS_FLAG
+        if signature[1]:
+            flags |= rendering.Scene.UPDATE_COLORS_FLAG
+        if signature[2]:
+            flags |= rendering.Scene.UPDATE_NORMALS_FLAG
+        self.widget.scene.scene.update_geometry(name, tensor_geometry, flags)
+        self._geometries[name] = geometry
+        return True
 
 
-    def add_geometry(self, geometry, name: str = None):
+    @traced("scene.add_geometry")
+    def add_geometry(self, geometry, name: str = None, lod_levels: list | None = None):
         if name is None:
             name = self._geometry_name
         self._geometries[name] = geometry
-        self._materials[name] = self._make_material(geometry)
+        self._acquire_material(name, geometry)
+        self._set_lod(name, geometry, lod_levels)
         if name not in self._visible:
             self._visible[name] = True
         if self._visible.get(name, True):
             self._add_to_scene(name)
 
 
-    def update_geometry(self, geometry, name: str = None):
+    @traced("scene.update_geometry")
+    def update_geometry(self, geometry, name: str = None, lod_levels: list | None = None, texture_owner=None):
+        """
+        Replace `name`'s geometry, keeping its visibility. `texture_owner`
+        stands for the content of a textured mesh's texture (a new object
+        whenever it changes); updates with the same owner keep the material
+        and don't re-upload the texture.
+        """
         if name is None:
             name = self._geometry_name
+        # Same layout: keep the scene object + material, only re-upload the vertex data.
+        if lod_levels is None and name not in self._lod and self._update_in_place(name, geometry):
+            return
         # Preserve visibility state: updating should not force hidden geometries to show.
         is_visible = self._visible.get(name, True)
         self._geometries[name] = geometry
-        self._materials[name] = self._make_material(geometry)
+        self._acquire_material(name, geometry, texture_owner)
+        self._set_lod(name, geometry, lod_levels)
         self._visible[name] = is_visible
-        if self.widget.scene.has_geometry(name):
-            self.widget.scene.remove_geometry(name)
+        self._scene_remove(name)
         if is_visible:
             self._add_to_scene(name)
 
 
-    def remove_geometry(self, name: str = None):
+    @traced("scene.remove_geometry")
+    def remove_geometry(self, name: str = None, flush: bool = True):
         if name is None:
             name = self._geometry_name
-        if self.widget.scene.has_geometry(name):
-            self.widget.scene.remove_geometry(name)
+        if name in self._streams:
+            self._unload_stream_chunks(name)
+            self._streams.pop(name)
+            return
+        self._culled.discard(name)
+        if name in self._batch_of_member:
+            batch_name = self._batch_of_member.pop(name)
+            self._batches[batch_name].remove(name)
+            if flush:
+                self.flush_batch(batch_name)
+            else:
+                self._dirty_batches.add(batch_name)
+            return
+        self._scene_remove(name)
+        self._in_place_names.discard(name)
         self._geometries.pop(name, None)
-        self._materials.pop(name, None)
+        self._release_material(name)
         self._visible.pop(name, None)
+        self._set_lod(name, None)
 
     def has_geometry(self, name: str) -> bool:
-        return name in self._geometries
+        return name in self._geometries or name in self._batch_of_member or name in self._streams
 
     def get_geometry(self, name: str):
+        if name in self._batch_of_member:
+            return self._batches[self._batch_of_member[name]].get_member(name)
         return self._geometries.get(name)
 
     def is_geometry_visible(self, name: str) -> bool:
+        if name in self._streams:
+            return self._streams[name]["visible"]
+        if name in self._batch_of_member:
+            return self._batches[self._batch_of_member[name]].is_visible(name)
         return self._visible.get(name, False)
 
-    def set_geometry_visible(self, name: str, visible: bool):
+    def set_geometry_visible(self, name: str, visible: bool, flush: bool = True):
+        if name in self._streams:
+            stream = self._streams[name]
+            stream["visible"] = bool(visible)
+            stream["dirty"] = True
+            if not visible:
+                self._unload_stream_chunks(name)
+            return
+        if name in self._batch_of_member:
+            batch_name = self._batch_of_member[name]
+            self._batches[batch_name].set_visible(name, visible)
+            if flush:
+                self.flush_batch(batch_name)
+            else:
+                self._dirty_batches.add(batch_name)
+            return
         if name not in self._geometries:
             return
         prev = self._visible.get(name, False)
         self._visible[name] = bool(visible)
         if prev and not visible:
-            if self.widget.scene.has_geometry(name):
-                self.widget.scene.remove_geometry(name)
+            self._scene_remove(name)
         elif (not prev) and visible:
             # Only add if not already present (idempotent).
-            if not self.widget.scene.has_geometry(name):
+            if not self._scene_has(name):
+                self._add_to_scene(name)
+
+    def set_geometries_visible(self, names, visible: bool):
+        """Bulk visibility change; batched layers are re-uploaded once at the end."""
+        for name in names:
+            self.set_geometry_visible(name, visible, flush=False)
+        self.flush_dirty_batches()
+
+    # --- batched layers ---
+    def is_batch_member(self, name: str) -> bool:
+        return name in self._batch_of_member
+
+    def get_batch_name(self, name: str) -> str | None:
+        return self._batch_of_member.get(name)
+
+    def get_batch(self, batch_name: str):
+        return self._batches.get(batch_name)
+
+    def register_batch(self, batch_name: str, batch):
+        self._batches[batch_name] = batch
+
+    def add_batch_member(self, batch_name: str, name: str, *args, flush: bool = True):
+        """
+        Add/replace `name` inside the registered batch `batch_name` (args are
+        forwarded to batch.upsert). With flush=False the scene is not touched
+        until `flush_batch` is called, so callers adding many members pay for a
+        single upload.
+        """
+        # A name lives either in the registry or in a batch, never both.
+        if name in self._geometries:
+            self.remove_geometry(name)
+        previous = self._batch_of_member.get(name)
+        if previous is not None and previous != batch_name:
+            self._batches[previous].remove(name)
+            self.flush_batch(previous)
+        batch = self._batches[batch_name]
+        batch.upsert(name, *args)
+        self._batch_of_member[name] = batch_name
+        if name in self._culled:
+            batch.set_culled(name, True)
+        if flush:
+            self.flush_batch(batch_name)
+        else:
+            self._dirty_batches.add(batch_name)
+
+    def add_line_batch_member(self, batch_name: str, name: str, lineset: o3d.geometry.LineSet, flush: bool = True):
+        """Add/replace `name` inside the packed LineSet `batch_name` (created on demand)."""
+        if batch_name not in self._batches:
+            self.register_batch(batch_name, LineSetBatch())
+        self.add_batch_member(batch_name, name, lineset, flush=flush)
+
+    def set_batch_member_color(self, name: str, color, flush: bool = True):
+        batch_name = self._batch_of_member.get(name)
+        if batch_name is None:
+            return
+        batch = self._batches[batch_name]
+        if not hasattr(batch, "set_color"):
+            return
+        batch.set_color(name, color)
+        if flush:
+            self.flush_batch(batch_name)
+        else:
+            self._dirty_batches.add(batch_name)
+
+    def set_culled(self, names) -> bool:
+        """
+        Replace the set of view-culled names. Culled geometries (or batch
+        members) are not drawn but keep their visibility, so toggles made while
+        culled apply once they come back into view. Returns True if anything changed.
+        """
+        names = set(names)
+        return self.update_culled(culled=names - self._culled, unculled=self._culled - names)
+
+    def update_culled(self, culled=(), unculled=()) -> bool:
+        """
+        Incremental set_culled: cull `culled`, bring back `unculled`; cost is
+        proportional to the names passed. Returns True if anything changed.
+        """
+        changed = [(name, True) for name in culled if name not in self._culled]
+        changed += [(name, False) for name in unculled if name in self._culled]
+        for name, is_culled in changed:
+            if is_culled:
+                self._culled.add(name)
+            else:
+                self._culled.discard(name)
+            batch_name = self._batch_of_member.get(name)
+            if batch_name is not None:
+                self._batches[batch_name].set_culled(name, is_culled)
+                self._dirty_batches.add(batch_name)
+            elif is_culled:
+                self._scene_remove(name)
+            elif self._visible.get(name, False) and not self._scene_has(name):
                 self._add_to_scene(name)
+        self.flush_dirty_batches()
+        return len(changed) > 0
+
+    @traced("scene.flush_batch")
+    def flush_batch(self, batch_name: str):
+        """
+        Push a batch's packed buffers to the scene as one geometry (empty
+        batches are dropped; batches whose members are all hidden or culled
+        stay registered but leave the scene).
+        """
+        self._dirty_batches.discard(batch_name)
+        batch = self._batches.get(batch_name)
+        if batch is None:
+            return
+        if len(batch) == 0:
+            self._batches.pop(batch_name, None)
+            self._batch_versions.pop(batch_name, None)
+            self.remove_geometry(batch_name)
+            return
+        if not batch.has_shown_members():
+            self._batch_versions.pop(batch_name, None)
+            self.remove_geometry(batch_name)
+            return
+        # Open3DScene can only refill point clouds in place, so a changed batch is
+        # re-added; an unchanged one (e.g. a redundant flush) is left alone.
+        version = getattr(batch, "version", None)
+        if version is not None and self._batch_versions.get(batch_name) == version and self._scene_has(batch_name):
+            return
+        # Atlas pages keep their texture object until a tile changes.
+        self.update_geometry(batch.to_geometry(), name=batch_name, texture_owner=getattr(batch, "texture", None))
+        if version is not None:
+            self._batch_versions[batch_name] = version
+
+    def flush_dirty_batches(self):
+        for batch_name in list(self._dirty_batches):
+            self.flush_batch(batch_name)
 
     def iter_geometry_entries(self):
         """
@@ -166,6 +864,237 @@ class SceneWidget:
             )
 
 
+    # --- level of detail ---
+    def _set_lod(self, name: str, geometry, lod_levels: list | None = None):
+        """
+        Attach an LOD pyramid to `name`: the given levels, or one built here for
+        point clouds above `lod_point_threshold`. Pass geometry=None to drop it.
+        """
+        if (
+            lod_levels is None
+            and isinstance(geometry, (o3d.geometry.PointCloud, o3d.t.geometry.PointCloud))
+            and point_count(geometry) > self.lod_point_threshold
+        ):
+            lod_levels = build_lod_pyramid(geometry)
+        if geometry is None or lod_levels is None or len(lod_levels) < 2:
+            self._lod.pop(name, None)
+            self._lod_level.pop(name, None)
+            self._lod_bounds.pop(name, None)
+            return
+        self._lod[name] = lod_levels
+        center, extent = bounds_center_extent(lod_levels[-1])
+        self._lod_bounds[name] = (center, float(np.linalg.norm(extent)))
+        self._lod_level[name] = self._pick_lod_level(name)
+
+    def _pick_lod_level(self, name: str) -> int:
+        if self._capture_mode:
+            return 0
+        levels = self._lod[name]
+        center, extent = self._lod_bounds[name]
+        if self._last_camera_matrix is not None:
+            distance = float(np.linalg.norm(self._last_camera_matrix[:3, 3] - center))
+        else:
+            distance = extent
+        return select_lod_level(
+            [point_count(level) for level in levels],
+            camera_distance=distance,
+            extent=extent,
+            point_budget=self.lod_point_budget,
+            moving=self.is_camera_moving(),
+        )
+
+    def get_lod_level(self, name: str) -> int | None:
+        return self._lod_level.get(name)
+
+    def _update_lod_levels(self) -> bool:
+        changed = False
+        for name in list(self._lod.keys()):
+            level = self._pick_lod_level(name)
+            if level == self._lod_level.get(name):
+                continue
+            previous = self._lod_level.get(name)
+            self._lod_level[name] = level
+            level_names = self._lod_scene_names.get(name)
+            if level_names:
+                # All levels are resident: switch which one is drawn, upload nothing.
+                if previous is not None:
+                    self.widget.scene.show_geometry(level_names[previous], False)
+                self.widget.scene.show_geometry(level_names[level], True)
+                changed = True
+        return changed
+
+    # --- out-of-core streaming ---
+    def add_streamed_point_cloud(self, manifest: dict, name: str, memory_budget_bytes: int = 1 << 30):
+        """
+        Show an out-of-core cloud (see tools.pointcloud_octree.load_point_octree).
+        Chunks intersecting the view frustum are loaded nearest-first, up to
+        `memory_budget_bytes`, and unloaded once they leave the frustum.
+        """
+        if name in self._streams or name in self._geometries:
+            self.remove_geometry(name)
+        self._streams[name] = {
+            "manifest": manifest,
+            "budget_points": max(1, int(memory_budget_bytes) // BYTES_PER_POINT),
+            "visible": True,
+            "loaded": set(),
+            "pending": set(),
+            "failed": set(),
+            "wanted": set(),
+            "dirty": True,
+        }
+
+    def set_stream_budget(self, name: str, memory_budget_bytes: int):
+        stream = self._streams.get(name)
+        if stream is None:
+            return
+        stream["budget_points"] = max(1, int(memory_budget_bytes) // BYTES_PER_POINT)
+        stream["dirty"] = True
+
+    def get_stream_bounds(self, name: str) -> o3d.geometry.AxisAlignedBoundingBox | None:
+        stream = self._streams.get(name)
+        if stream is None:
+            return None
+        manifest = stream["manifest"]
+        return o3d.geometry.AxisAlignedBoundingBox(manifest["bounds_min"], manifest["bounds_max"])
+
+    def _unload_stream_chunks(self, name: str):
+        stream = self._streams[name]
+        for i in stream["loaded"]:
+            self.remove_geometry(f"{name}_chunk_{i}")
+        stream["loaded"] = set()
+        # Loads still in flight are dropped when they arrive.
+        stream["wanted"] = set()
+
+    def _load_stream_chunk(self, name: str, stream: dict, i: int):
+        # Worker thread: read the chunk, hand it to the GUI thread.
+        try:
+            geometry = load_chunk_point_cloud(stream["manifest"], i)
+        except Exception:
+            geometry = None
+        gui.Application.instance.post_to_main_thread(
+            self.window, lambda: self._on_stream_chunk_loaded(name, stream, i, geometry)
+        )
+
+    def _on_stream_chunk_loaded(self, name: str, stream: dict, i: int, geometry):
+        stream["pending"].discard(i)
+        # The stream may have been removed or replaced (same name) meanwhile.
+        if self._streams.get(name) is not stream:
+            return
+        # Room for the next load.
+        stream["dirty"] = True
+        if geometry is None:
+            stream["failed"].add(i)
+            return
+        if not stream["visible"] or i not in stream["wanted"]:
+            return
+        self.add_geometry(geometry, name=f"{name}_chunk_{i}")
+        stream["loaded"].add(i)
+        self.window.post_redraw()
+
+    def _update_streams(self, camera_changed: bool) -> bool:
+        if not self._streams or self._last_camera_matrix is None:
+            return False
+        planes = self.get_view_frustum_planes()
+        camera_position = self.get_camera_position()
+        changed = False
+        for name, stream in self._streams.items():
+            if not stream["visible"] or not (camera_changed or stream["dirty"]):
+                continue
+            wanted = select_chunks(stream["manifest"], planes, camera_position, stream["budget_points"])
+            stream["wanted"] = set(wanted)
+            # Unload first so the resident set never exceeds the budget.
+            for i in stream["loaded"] - stream["wanted"]:
+                self.remove_geometry(f"{name}_chunk_{i}")
+                changed = True
+            stream["loaded"] &= stream["wanted"]
+            # Request the nearest missing chunks, a few at a time; each finished
+            # load marks the stream dirty so the next tick requests more.
+            skip = stream["loaded"] | stream["pending"] | stream["failed"]
+            missing = [i for i in wanted if i not in skip]
+            room = max(self.stream_chunk_loads_in_flight - len(stream["pending"]), 0)
+            if missing[:room] and self._stream_pool is None:
+                self._stream_pool = ThreadPoolExecutor(max_workers=self.stream_chunk_loads_in_flight)
+            for i in missing[:room]:
+                stream["pending"].add(i)
+                self._stream_pool.submit(self._load_stream_chunk, name, stream, i)
+            stream["dirty"] = False
+        return changed
+
+    # --- tick / camera motion ---
+    def add_tick_handler(self, handler):
+        """handler() -> bool, called every window tick; return True to request a redraw."""
+        self._tick_handlers.append(handler)
+
+    def remove_tick_handler(self, handler):
+        if handler in self._tick_handlers:
+            self._tick_handlers.remove(handler)
+
+    def get_view_frustum_planes(self) -> np.ndarray | None:
+        """(6,4) planes of the current view frustum (see camera_math.frustum_planes)."""
+        if self.widget is None:
+            return None
+        camera = self.widget.scene.camera
+        return frustum_planes(np.asarray(camera.get_projection_matrix()) @ np.asarray(camera.get_view_matrix()))
+
+    def get_camera_position(self) -> np.ndarray | None:
+        if self.widget is None:
+            return None
+        return np.asarray(self.widget.scene.camera.get_model_matrix())[:3, 3].copy()
+
+    def set_camera_pose(self, c2w: np.ndarray, pivot_distance: float = 1.0):
+        """
+        Point the scene camera along a camera-to-world matrix (looks down -Z, +Y up)
+        without rebuilding the projection; cheaper than apply_view_state for playback.
+        The widget's center of rotation moves to the point `pivot_distance` ahead,
+        so mouse orbiting continues from the new pose.
+        """
+        c2w = np.asarray(c2w, dtype=np.float64)
+        eye = c2w[:3, 3]
+        center = eye - pivot_distance * c2w[:3, 2]
+        self.widget.scene.camera.look_at(center, eye, c2w[:3, 1])
+        # camera.look_at leaves the widget's pivot where it was (older Open3D has no setter).
+        if hasattr(self.widget, "center_of_rotation"):
+            self.widget.center_of_rotation = center.astype(np.float32)
+
+    def get_scene_center(self) -> np.ndarray:
+        """Center of everything in the scene (the configured bounding box when the scene is empty)."""
+        bbox = self.widget.scene.bounding_box
+        if bbox.is_empty():
+            return self._bbox_origin + 0.5 * self._bbox_size
+        return np.asarray(bbox.get_center(), dtype=np.float64)
+
+    def set_capture_mode(self, enabled: bool):
+        """
+        While enabled, LOD clouds stay at their finest level and scripted camera
+        moves don't mark the camera as moving, so every captured frame is full detail.
+        """
+        self._capture_mode = bool(enabled)
+        if not enabled:
+            # Start settled: don't let the capture's last move read as motion.
+            self._last_camera_change = 0.0
+        if self._update_lod_levels() and self.window is not None:
+            self.window.post_redraw()
+
+    def is_camera_moving(self) -> bool:
+        if self._capture_mode:
+            return False
+        return time.monotonic() - self._last_camera_change < self.camera_settle_seconds
+
+    def _on_tick(self):
+        if self.widget is None:
+            return False
+        matrix = np.asarray(self.widget.scene.camera.get_model_matrix())
+        camera_changed = self._last_camera_matrix is None or not np.array_equal(matrix, self._last_camera_matrix)
+        if camera_changed:
+            self._last_camera_matrix = matrix
+            self._last_camera_change = time.monotonic()
+        # Coarse LOD while the camera moves, refine once it has settled.
+        redraw = self._update_lod_levels()
+        redraw = self._update_streams(camera_changed) or redraw
+        for handler in list(self._tick_handlers):
+            redraw = bool(handler()) or redraw
+        return redraw
+
     def setup_camera(self, fov_deg: float, bbox: o3d.geometry.AxisAlignedBoundingBox, 
                     center: list):
         self.widget.setup_camera(fov_deg, bbox, center)
@@ -173,6 +1102,8 @@ class SceneWidget:
 
     def fit_camera_to_geometry(self, geometry, fov_deg=60):
         bbox = geometry.get_axis_aligned_bounding_box()
+        if isinstance(bbox, o3d.t.geometry.AxisAlignedBoundingBox):
+            bbox = bbox.to_legacy()
         center = bbox.get_center()
         self.widget.setup_camera(fov_deg, bbox, center.tolist())
 